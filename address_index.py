@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+ADDRESS INDEX
+=============
+
+Per-address transaction history maintained as blocks connect and disconnect:
+- address -> entries of (height, txid, delta) in chain order
+- Running balance and received totals stored next to the entries, so
+  point-in-time balances are a binary search (O(log n)) instead of a scan
+- Paginated history (newest first by default)
+- Disconnecting a block pops its entries off the tail (reorg-safe)
+
+NO REAL BITCOIN. NO REAL NETWORK. PURELY EDUCATIONAL.
+"""
+
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, NamedTuple, Set
+
+COINBASE = "COINBASE"
+
+
+class AddressEntry(NamedTuple):
+    height: int
+    txid: str
+    delta: float
+
+
+@dataclass
+class _AddressLog:
+    """Parallel columns for one address (entries stay sorted by height)"""
+    heights: List[int] = field(default_factory=list)
+    txids: List[str] = field(default_factory=list)
+    deltas: List[float] = field(default_factory=list)
+    balances: List[float] = field(default_factory=list)    # Balance after each entry
+    received: List[float] = field(default_factory=list)    # Cumulative inflows
+
+
+class AddressIndex:
+    """Address -> confirmed history with O(log n) balance-at-height queries"""
+
+    def __init__(self):
+        self._logs: Dict[str, _AddressLog] = {}
+        self._touched: Dict[int, Set[str]] = {}  # height -> addresses with entries there
+
+    def __contains__(self, address: str) -> bool:
+        return address in self._logs
+
+    def __len__(self) -> int:
+        return len(self._logs)
+
+    # ---------- Maintenance ----------
+
+    def add_entry(self, address: str, height: int, txid: str, delta: float):
+        """Append one balance change; heights must not decrease per address"""
+        log = self._logs.get(address)
+        if log is None:
+            log = self._logs[address] = _AddressLog()
+        elif height < log.heights[-1]:
+            raise ValueError(f"Entry at height {height} is below {address}'s tip {log.heights[-1]}")
+        previous_balance = log.balances[-1] if log.balances else 0.0
+        previous_received = log.received[-1] if log.received else 0.0
+        log.heights.append(height)
+        log.txids.append(txid)
+        log.deltas.append(delta)
+        log.balances.append(previous_balance + delta)
+        log.received.append(previous_received + max(delta, 0.0))
+        self._touched.setdefault(height, set()).add(address)
+
+    def connect_block(self, block):
+        """Index every transaction of a block appended at the tip"""
+        height = block.index
+        for tx in block.transactions:
+            if tx.from_addr != COINBASE:
+                self.add_entry(tx.from_addr, height, tx.txid, -(tx.amount + tx.fee))
+            self.add_entry(tx.to_addr, height, tx.txid, tx.amount)
+
+    def disconnect_block(self, block):
+        """Remove the entries of the tip block (reorg)"""
+        height = block.index
+        for address in self._touched.pop(height, ()):
+            log = self._logs[address]
+            cut = bisect_right(log.heights, height - 1)
+            for column in (log.heights, log.txids, log.deltas, log.balances, log.received):
+                del column[cut:]
+            if not log.heights:
+                del self._logs[address]
+
+    # ---------- Queries ----------
+
+    def balance(self, address: str) -> float:
+        log = self._logs.get(address)
+        return log.balances[-1] if log else 0.0
+
+    def balance_at(self, address: str, height: int) -> float:
+        """Confirmed balance after the block at `height` (O(log n))"""
+        log = self._logs.get(address)
+        if log is None:
+            return 0.0
+        i = bisect_right(log.heights, height)
+        return log.balances[i - 1] if i else 0.0
+
+    def tx_count(self, address: str) -> int:
+        log = self._logs.get(address)
+        return len(log.heights) if log else 0
+
+    def history(self, address: str, page: int = 0, page_size: int = 50,
+                newest_first: bool = True) -> List[AddressEntry]:
+        """One page of (height, txid, delta) entries"""
+        log = self._logs.get(address)
+        if log is None or page < 0 or page_size <= 0:
+            return []
+        n = len(log.heights)
+        if newest_first:
+            stop = n - page * page_size
+            start = max(0, stop - page_size)
+            indices = range(stop - 1, start - 1, -1)
+        else:
+            start = page * page_size
+            indices = range(start, min(n, start + page_size))
+        return [AddressEntry(log.heights[i], log.txids[i], log.deltas[i]) for i in indices]
+
+    def summary(self, address: str) -> Dict[str, Any]:
+        """Balance, totals and entry count for one address"""
+        log = self._logs.get(address)
+        received = log.received[-1] if log else 0.0
+        balance = log.balances[-1] if log else 0.0
+        return {
+            "address": address,
+            "balance": balance,
+            "received": received,
+            "sent": received - balance,
+            "tx_count": len(log.heights) if log else 0,
+            "first_height": log.heights[0] if log else None,
+            "last_height": log.heights[-1] if log else None,
+        }
@@ -0,0 +1,341 @@
+#!/usr/bin/env python3
+"""
+MINING BENCHMARK SUITE
+======================
+
+Repeatable performance measurements for the simulators:
+- PoW loops of all three node classes (MainnetNode, TrackedMainnetNode,
+  QuantumMiningNode) across difficulty levels
+- Mempool insert and block-template selection, is_chain_valid and header
+  verification across chain lengths, audit-log export
+- Validator and batch-hash throughput across worker counts
+- Machine-readable JSON: hashes/s, blocks/s, ops/s, p50/p99 block latency,
+  peak RSS
+- Comparison against a stored baseline; regressions beyond the tolerance
+  make the run exit non-zero
+
+Usage:
+    python benchmark_suite.py --quick                       # small matrix, compare to baseline
+    python benchmark_suite.py --output results.json
+    python benchmark_suite.py --quick --save-baseline        # refresh benchmark_baseline.json
+
+NO REAL BITCOIN. NO REAL NETWORK. PURELY EDUCATIONAL.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import math
+import os
+import platform
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from bitcoin_simulator import Block, MainnetNode, Transaction
+from bitcoin_simulator_tracked import TrackedMainnetNode
+from block_template import BlockTemplateManager
+from blockchain_validator import BlockchainValidator
+from chain_fixtures import load_fixture
+from difficulty import zeros_to_bits
+from hash_backend import ParallelBackend, get_backend
+from headers import HeaderChain
+from node_config import MAINNET, VALIDATOR
+from quantum_miner import QuantumMiningNode
+
+BASELINE_FILE = "benchmark_baseline.json"
+REPEATS = 5                     # Micro-benchmarks keep the best of this many runs
+DEFAULT_TOLERANCE = 0.4         # Allowed relative slowdown before a metric counts as a regression
+
+# Metrics where smaller is better; everything else (rates) is higher-is-better
+LOWER_IS_BETTER = {"p50_ms", "p99_ms", "peak_rss_kb"}
+
+FULL_MATRIX = {"difficulty": [2, 3, 4], "chain_length": [100, 500], "workers": [1, 2, 4], "blocks": 40}
+QUICK_MATRIX = {"difficulty": [2, 3], "chain_length": [100], "workers": [1, 4], "blocks": 20}
+
+
+@dataclass
+class BenchResult:
+    name: str
+    params: Dict[str, Any]
+    metrics: Dict[str, float] = field(default_factory=dict)
+
+    @property
+    def key(self) -> str:
+        return self.name + "".join(f" {k}={v}" for k, v in sorted(self.params.items()))
+
+
+# ---------- Helpers ----------
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile"""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+
+def best_time(run: Callable[[], Any], repeats: int = REPEATS) -> float:
+    """Fastest of several runs (least disturbed by other load on the machine)"""
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def peak_rss_kb() -> Optional[int]:
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss // 1024 if sys.platform == "darwin" else rss  # macOS reports bytes
+
+
+def latency_metrics(latencies: List[float], attempts: int) -> Dict[str, float]:
+    elapsed = sum(latencies)
+    return {
+        "hashes_per_s": round(attempts / elapsed, 1),
+        "blocks_per_s": round(len(latencies) / elapsed, 3),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+    }
+
+
+# ---------- Benchmarks ----------
+
+def bench_pow_mainnet(difficulty: int, blocks: int) -> Dict[str, float]:
+    node = MainnetNode(verbose=False)
+    node.current_bits = zeros_to_bits(difficulty)
+    latencies, attempts = [], 0
+    for _ in range(blocks):
+        start = time.perf_counter()
+        template = node.create_block_template(node.select_mining_pool())
+        attempts += node.solve_block(template) + 1
+        node.connect_block(template.block)
+        latencies.append(time.perf_counter() - start)
+    return latency_metrics(latencies, attempts)
+
+
+def _bench_printing_miner(node, difficulty: int, blocks: int) -> Dict[str, float]:
+    node.current_bits = zeros_to_bits(difficulty)
+    latencies, attempts = [], 0
+    for _ in range(blocks):
+        start = time.perf_counter()
+        block = node.mine_block()
+        latencies.append(time.perf_counter() - start)
+        attempts += block.nonce + 1
+        node.current_bits = zeros_to_bits(difficulty)  # Keep retargeting out of the measurement
+    return latency_metrics(latencies, attempts)
+
+
+def bench_pow_tracked(difficulty: int, blocks: int) -> Dict[str, float]:
+    with contextlib.redirect_stdout(io.StringIO()):
+        return _bench_printing_miner(TrackedMainnetNode(), difficulty, blocks)
+
+
+def bench_pow_quantum(difficulty: int, blocks: int) -> Dict[str, float]:
+    with contextlib.redirect_stdout(io.StringIO()):
+        return _bench_printing_miner(QuantumMiningNode("bench_wallet"), difficulty, blocks)
+
+
+def bench_mempool(chain_length: int) -> Dict[str, float]:
+    """Insert chain_length * 20 txs, then select a block template from them"""
+    txs = [Transaction.create("bench", f"payee_{i}", 0.01, 0.0001 + (i % 97) * 1e-6)
+           for i in range(chain_length * 20)]
+
+    def insert_all():
+        node = MainnetNode(verbose=False)
+        node.credit("bench", 1_000_000.0)
+        for tx in txs:
+            node.add_transaction(tx)
+
+    def select_block():
+        manager = BlockTemplateManager(Block, Transaction, max_weight=MAINNET.max_block_weight)
+        for tx in txs:
+            manager.add_transaction(tx)
+        manager.selected_transactions()
+
+    insert, select = best_time(insert_all), best_time(select_block)
+    return {"ops_per_s": round(len(txs) / insert, 1), "select_ops_per_s": round(len(txs) / select, 1)}
+
+
+def bench_chain_valid(chain_length: int) -> Dict[str, float]:
+    node = load_fixture(chain_length)
+    assert node.is_chain_valid()
+    full = best_time(node.is_chain_valid)
+    headers = best_time(lambda: HeaderChain.from_blocks(node.chain))
+    return {"blocks_per_s": round(chain_length / full, 1),
+            "header_blocks_per_s": round(chain_length / headers, 1)}
+
+
+def bench_audit_export(chain_length: int) -> Dict[str, float]:
+    with contextlib.redirect_stdout(io.StringIO()):
+        node = TrackedMainnetNode()
+        node.current_bits = zeros_to_bits(1)
+        for _ in range(chain_length):
+            node.mine_block()
+            node.current_bits = zeros_to_bits(1)
+        with tempfile.TemporaryDirectory() as tmp:
+            elapsed = best_time(lambda: node.export_audit_log(os.path.join(tmp, "audit.json")))
+    return {"ops_per_s": round(len(node.reward_audit_log) / elapsed, 1)}
+
+
+def bench_validator(workers: int, blocks: int) -> Dict[str, float]:
+    """validate_block on a thread pool (without the simulated network delay, which would swamp the work)"""
+    node = load_fixture(blocks)
+    validator = BlockchainValidator(chain_index=node.chain_index, config=VALIDATOR.replace(validation_delay=0))
+    latencies = []
+
+    def validate(block):
+        start = time.perf_counter()
+        validator.validate_block(block.index, block.hash, block.miner_address, 6.25,
+                                 block.bits, block.nonce, len(block.transactions))
+        latencies.append(time.perf_counter() - start)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(validate, node.chain[1:]))
+        elapsed = time.perf_counter() - start
+    return {"blocks_per_s": round(blocks / elapsed, 2),
+            "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+            "p99_ms": round(percentile(latencies, 99) * 1000, 3)}
+
+
+def bench_hash_batch(workers: int) -> Dict[str, float]:
+    items = [f"header-{i}".encode() for i in range(200_000)]
+    backend = ParallelBackend(workers=workers)
+    try:
+        backend.sha256_many(items[:10_000])  # Warm up the worker pool
+        elapsed = best_time(lambda: backend.sha256_many(items), repeats=3)
+    finally:
+        backend.close()
+    return {"hashes_per_s": round(len(items) / elapsed, 1)}
+
+
+# name -> (function, matrix axes it varies over, extra fixed arguments, metrics gated
+# against the baseline). Block rates and latencies of the PoW benchmarks depend on
+# nonce luck, so only their hash rate is gated; the rest are reported.
+BENCHMARKS: Dict[str, Any] = {
+    "pow_mainnet": (bench_pow_mainnet, ["difficulty"], ["blocks"], ["hashes_per_s"]),
+    "pow_tracked": (bench_pow_tracked, ["difficulty"], ["blocks"], ["hashes_per_s"]),
+    "pow_quantum": (bench_pow_quantum, ["difficulty"], ["blocks"], ["hashes_per_s"]),
+    "mempool": (bench_mempool, ["chain_length"], [], ["ops_per_s", "select_ops_per_s"]),
+    "chain_valid": (bench_chain_valid, ["chain_length"], [], ["blocks_per_s", "header_blocks_per_s"]),
+    "audit_export": (bench_audit_export, ["chain_length"], [], ["ops_per_s"]),
+    "validator": (bench_validator, ["workers"], ["blocks"], ["blocks_per_s", "p99_ms"]),
+    "hash_batch": (bench_hash_batch, ["workers"], [], ["hashes_per_s"]),
+}
+
+
+# ---------- Running and comparing ----------
+
+def run_suite(matrix: Dict[str, Any], only: Optional[List[str]] = None,
+              progress: Callable[[str], None] = print) -> List[BenchResult]:
+    results = []
+    for name, (func, axes, fixed, _) in BENCHMARKS.items():
+        if only and name not in only:
+            continue
+        combos = [{}]
+        for axis in axes:
+            combos = [dict(c, **{axis: value}) for c in combos for value in matrix[axis]]
+        for params in combos:
+            kwargs = dict(params, **{arg: matrix[arg] for arg in fixed})
+            metrics = func(**kwargs)
+            rss = peak_rss_kb()
+            if rss is not None:
+                metrics["peak_rss_kb"] = rss
+            result = BenchResult(name, params, metrics)
+            progress(f"  {result.key:<36} " + "  ".join(f"{k}={v:,}" for k, v in metrics.items()))
+            results.append(result)
+    return results
+
+
+def results_document(results: List[BenchResult], matrix: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "hash_backend": get_backend().name,
+            "matrix": matrix,
+        },
+        "results": [asdict(r) for r in results],
+    }
+
+
+def compare(results: List[BenchResult], baseline: Dict[str, Any],
+            tolerance: float = DEFAULT_TOLERANCE) -> List[Dict[str, Any]]:
+    """Metrics that got worse than the baseline by more than `tolerance`"""
+    previous = {BenchResult(r["name"], r["params"]).key: r["metrics"] for r in baseline["results"]}
+    regressions = []
+    for result in results:
+        old = previous.get(result.key)
+        if old is None:
+            continue
+        for metric in BENCHMARKS[result.name][3]:
+            value = result.metrics.get(metric)
+            if value is None or not old.get(metric):
+                continue
+            if metric in LOWER_IS_BETTER:
+                change = value / old[metric] - 1
+            else:
+                change = old[metric] / value - 1 if value else float("inf")
+            if change > tolerance:
+                regressions.append({"benchmark": result.key, "metric": metric,
+                                    "baseline": old[metric], "current": value,
+                                    "slowdown": round(change, 3)})
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the mining simulators")
+    parser.add_argument("--quick", action="store_true", help="small matrix (a few seconds)")
+    parser.add_argument("--only", nargs="+", choices=list(BENCHMARKS), help="run a subset")
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument("--baseline", default=BASELINE_FILE)
+    parser.add_argument("--save-baseline", action="store_true", help="write the results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    args = parser.parse_args()
+
+    matrix = QUICK_MATRIX if args.quick else FULL_MATRIX
+    print(f"⏱️  Running benchmarks ({'quick' if args.quick else 'full'} matrix, backend {get_backend().name})")
+    results = run_suite(matrix, args.only)
+    document = results_document(results, matrix)
+    with open(args.output, "w") as f:
+        json.dump(document, f, indent=2)
+    print(f"\n💾 Results written to {args.output}")
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(document, f, indent=2)
+        print(f"📌 Baseline updated: {args.baseline}")
+        return 0
+    if not os.path.exists(args.baseline):
+        print(f"ℹ️  No baseline at {args.baseline} (use --save-baseline to create one)")
+        return 0
+
+    with open(args.baseline) as f:
+        regressions = compare(results, json.load(f), args.tolerance)
+    if not regressions:
+        print(f"✅ No regressions beyond {args.tolerance:.0%} against {args.baseline}")
+        return 0
+    print(f"❌ {len(regressions)} regression(s) beyond {args.tolerance:.0%}:")
+    for r in regressions:
+        print(f"   {r['benchmark']:<36} {r['metric']:<14} {r['baseline']:>14,} → {r['current']:>14,} "
+              f"({r['slowdown']:+.0%})")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,77 +7,28 @@ Educational-only Bitcoin-style node and mining simulation with mainnet features:
 - In-memory blockchain (no disk, no network)
 - Multiple competing miners (simulating mainnet)
 - Difficulty adjustment (like Bitcoin's 2016 block retargeting)
-- Fork resolution (longest chain rule)
+- Fork resolution (most cumulative work wins)
 - Network propagation delays
 - Simple mempool and wallet balances
-- Proof-of-work style mining with adjustable difficulty
+- Proof-of-work style mining against compact (nBits) targets with 4x-clamped retargeting
+- Pools drawn by hashrate as the miner policy on the shared node core (node_core.py)
 
 NO REAL BITCOIN. NO REAL NETWORK. PURELY EDUCATIONAL.
 """
 
-import hashlib
+import argparse
 import random
 import time
-from dataclasses import dataclass, field
-from typing import List, Dict, Optional
-from collections import defaultdict
-
-# Mainnet-style configuration (scaled down for simulation)
-INITIAL_DIFFICULTY = 3          # Starting difficulty (leading zeros)
-MAX_DIFFICULTY = 6              # Maximum difficulty
-DIFFICULTY_ADJUSTMENT_INTERVAL = 10  # Blocks between difficulty adjustments (Bitcoin: 2016)
-TARGET_BLOCK_TIME = 10          # Target seconds per block (Bitcoin: 600 seconds = 10 minutes)
-BLOCK_REWARD = 6.25             # Simulated BTC (current Bitcoin reward)
-HALVING_INTERVAL = 210000       # Blocks between halvings (same as Bitcoin)
-NETWORK_PROPAGATION_DELAY = 1.5 # Seconds to simulate network propagation
-
-
-@dataclass
-class Transaction:
-    txid: str
-    from_addr: str
-    to_addr: str
-    amount: float
-    fee: float
-    timestamp: float
-
-    @staticmethod
-    def create(from_addr: str, to_addr: str, amount: float, fee: float = 0.0001) -> "Transaction":
-        now = time.time()
-        raw = f"{from_addr}{to_addr}{amount}{fee}{now}{random.random()}"
-        txid = hashlib.sha256(raw.encode()).hexdigest()
-        return Transaction(
-            txid=txid,
-            from_addr=from_addr,
-            to_addr=to_addr,
-            amount=amount,
-            fee=fee,
-            timestamp=now,
-        )
-
-
-@dataclass
-class Block:
-    index: int
-    previous_hash: str
-    timestamp: float
-    nonce: int
-    difficulty: int
-    miner_address: str
-    transactions: List[Transaction] = field(default_factory=list)
-    hash: str = ""
-
-    def header(self) -> str:
-        tx_root = hashlib.sha256(
-            "".join(tx.txid for tx in self.transactions).encode()
-        ).hexdigest()
-        return f"{self.index}{self.previous_hash}{self.timestamp}{self.nonce}{self.difficulty}{self.miner_address}{tx_root}"
-
-    def compute_hash(self) -> str:
-        return hashlib.sha256(self.header().encode()).hexdigest()
-
-    def meets_difficulty(self) -> bool:
-        return self.hash.startswith("0" * self.difficulty)
+from typing import Any, List, Dict, Optional
+
+from block_template import BlockTemplate
+from hash_backend import add_backend_argument, apply_backend_argument
+from node_config import MAINNET, NodeConfig, add_config_arguments, config_from_args
+from node_core import Block, MinerPolicy, NodeCore, Transaction
+from weighted_sampler import WeightedSampler
+
+# Settings live in a per-node NodeConfig (node_config.py; defaults: MAINNET);
+# the chain, ledger, mempool and proof of work live in node_core.NodeCore
 
 
 class MiningPool:
@@ -92,244 +43,93 @@ class MiningPool:
         return f"MiningPool({self.name}, {self.hashrate_percentage}% hashrate, {self.blocks_mined} blocks)"
 
 
-class MainnetNode:
+class PoolPolicy(MinerPolicy):
+    """Pools win blocks in proportion to their hashrate and are paid at their own name"""
+
+    def __init__(self, pool_hashrates: Dict[str, float]):
+        self.pools = [MiningPool(name, share) for name, share in pool_hashrates.items()]
+        self.by_name = {pool.name: pool for pool in self.pools}
+        self.sampler = WeightedSampler(self.pools, [p.hashrate_percentage for p in self.pools])
+
+    def select(self) -> MiningPool:
+        return self.sampler.draw()
+
+    def block_mined(self, block: Block, template: BlockTemplate, miner: MiningPool,
+                    seconds: float) -> List[str]:
+        return [f"Pool:   {miner.name}"]
+
+    def block_connected(self, block: Block):
+        pool = self.by_name.get(block.miner_address)
+        if pool is not None:
+            pool.blocks_mined += 1
+            pool.total_rewards += block.transactions[0].amount
+
+    def block_disconnected(self, block: Block):
+        pool = self.by_name.get(block.miner_address)
+        if pool is not None:
+            pool.blocks_mined -= 1
+            pool.total_rewards -= block.transactions[0].amount
+
+
+class MainnetNode(NodeCore):
     """Simulated Bitcoin mainnet node with multiple miners"""
 
-    def __init__(self):
-        self.chain: List[Block] = []
-        self.alternative_chains: List[List[Block]] = []  # For forks
-        self.mempool: List[Transaction] = []
-        self.wallets: Dict[str, float] = {}
-        self.current_difficulty = INITIAL_DIFFICULTY
-
-        # Mining pools (simulating mainnet distribution)
-        self.mining_pools = [
-            MiningPool("FoundryUSA", 28.0),
-            MiningPool("AntPool", 18.0),
-            MiningPool("F2Pool", 15.0),
-            MiningPool("ViaBTC", 12.0),
-            MiningPool("Binance", 10.0),
-            MiningPool("Others", 17.0),
-        ]
-
-        # Statistics
-        self.total_fees_collected = 0.0
-        self.orphaned_blocks = 0
-        self.forks_resolved = 0
-
-        self._create_genesis_block()
-
-    # ---------- Blockchain basics ----------
-
-    def _create_genesis_block(self):
-        """Create the genesis block (block 0)"""
-        genesis = Block(
-            index=0,
-            previous_hash="0" * 64,
-            timestamp=time.time(),
-            nonce=0,
-            difficulty=INITIAL_DIFFICULTY,
-            miner_address="SATOSHI_NAKAMOTO",
-            transactions=[],
-        )
-        genesis.hash = genesis.compute_hash()
-        self.chain.append(genesis)
+    NODE_TYPE = "mainnet"
+    DEFAULT_CONFIG = MAINNET
+
+    def __init__(self, verbose: bool = False, config: Optional[NodeConfig] = None):
+        config = config or MAINNET
+        super().__init__(PoolPolicy(config.pool_hashrates), config, verbose)
+
+    def print_banner(self):
         print("=" * 70)
         print("🌍 BITCOIN MAINNET SIMULATION INITIALIZED")
         print("=" * 70)
         print(f"🌱 Genesis block created")
-        print(f"   Hash: {genesis.hash}")
-        print(f"   Difficulty: {INITIAL_DIFFICULTY}")
+        print(f"   Hash: {self.latest_block.hash}")
+        print(f"   Difficulty: {self.current_difficulty:,.2f} (bits {self.current_bits:#010x})")
         print(f"   Mining pools: {len(self.mining_pools)}")
         print()
 
-    @property
-    def latest_block(self) -> Block:
-        return self.chain[-1]
+    # ---------- Mining pools ----------
 
     @property
-    def chain_height(self) -> int:
-        return len(self.chain) - 1
-
-    def is_chain_valid(self) -> bool:
-        """Validate the entire blockchain"""
-        for i in range(1, len(self.chain)):
-            curr = self.chain[i]
-            prev = self.chain[i - 1]
-
-            # Check hash is correct
-            if curr.hash != curr.compute_hash():
-                return False
-
-            # Check meets difficulty
-            if not curr.meets_difficulty():
-                return False
-
-            # Check links to previous block
-            if curr.previous_hash != prev.hash:
-                return False
-        return True
-
-    # ---------- Difficulty adjustment ----------
-
-    def adjust_difficulty(self):
-        """Adjust difficulty based on recent block times (like Bitcoin)"""
-        if self.chain_height % DIFFICULTY_ADJUSTMENT_INTERVAL != 0 or self.chain_height == 0:
-            return
-
-        # Calculate actual time for last DIFFICULTY_ADJUSTMENT_INTERVAL blocks
-        interval_start = max(0, len(self.chain) - DIFFICULTY_ADJUSTMENT_INTERVAL - 1)
-        actual_time = self.chain[-1].timestamp - self.chain[interval_start].timestamp
-        expected_time = DIFFICULTY_ADJUSTMENT_INTERVAL * TARGET_BLOCK_TIME
-
-        old_difficulty = self.current_difficulty
-
-        # Adjust difficulty up or down
-        if actual_time < expected_time * 0.75 and self.current_difficulty < MAX_DIFFICULTY:
-            # Blocks coming too fast, increase difficulty
-            self.current_difficulty += 1
-            print(f"\n⚡ DIFFICULTY INCREASED: {old_difficulty} → {self.current_difficulty}")
-            print(f"   Blocks were mined {expected_time/actual_time:.2f}x too fast")
-        elif actual_time > expected_time * 1.5 and self.current_difficulty > 1:
-            # Blocks coming too slow, decrease difficulty
-            self.current_difficulty -= 1
-            print(f"\n🐌 DIFFICULTY DECREASED: {old_difficulty} → {self.current_difficulty}")
-            print(f"   Blocks were mined {actual_time/expected_time:.2f}x too slow")
-
-    # ---------- Wallet / mempool ----------
-
-    def get_balance(self, address: str) -> float:
-        return self.wallets.get(address, 0.0)
-
-    def credit(self, address: str, amount: float):
-        self.wallets[address] = self.get_balance(address) + amount
-
-    def debit(self, address: str, amount: float) -> bool:
-        if self.get_balance(address) >= amount:
-            self.wallets[address] -= amount
-            return True
-        return False
-
-    def add_transaction(self, tx: Transaction) -> bool:
-        """Add transaction to mempool with validation"""
-        if tx.amount <= 0 or tx.fee < 0:
-            return False
-
-        if tx.from_addr != "COINBASE":
-            total_needed = tx.amount + tx.fee
-            if not self.debit(tx.from_addr, total_needed):
-                return False
+    def mining_pools(self) -> List[MiningPool]:
+        return self.policy.pools
 
-        self.mempool.append(tx)
-        return True
-
-    def get_current_block_reward(self) -> float:
-        """Calculate current block reward (includes halving)"""
-        halvings = self.chain_height // HALVING_INTERVAL
-        return BLOCK_REWARD / (2 ** halvings)
-
-    # ---------- Mining (with multiple pools) ----------
+    @property
+    def _pools_by_name(self) -> Dict[str, MiningPool]:
+        return self.policy.by_name
 
     def select_mining_pool(self) -> MiningPool:
         """Select which pool mines the next block based on hashrate distribution"""
-        rand = random.random() * 100
-        cumulative = 0
-        for pool in self.mining_pools:
-            cumulative += pool.hashrate_percentage
-            if rand <= cumulative:
-                return pool
-        return self.mining_pools[-1]  # Fallback
-
-    def mine_block(self, mining_pool: Optional[MiningPool] = None) -> Block:
-        """Mine a new block (simulating mainnet mining)"""
-        if mining_pool is None:
-            mining_pool = self.select_mining_pool()
-
-        # Select transactions from mempool (prioritize by fee)
-        self.mempool.sort(key=lambda tx: tx.fee, reverse=True)
-        selected_txs: List[Transaction] = []
-        max_txs = min(10, len(self.mempool))
-        total_fees = 0.0
-
-        for _ in range(max_txs):
-            if self.mempool:
-                tx = self.mempool.pop(0)
-                selected_txs.append(tx)
-                total_fees += tx.fee
-
-        # Add coinbase transaction (block reward + fees)
-        current_reward = self.get_current_block_reward()
-        coinbase = Transaction.create(
-            from_addr="COINBASE",
-            to_addr=mining_pool.name,
-            amount=current_reward + total_fees,
-            fee=0.0,
-        )
-        selected_txs.insert(0, coinbase)
-
-        # Create candidate block
-        new_index = self.latest_block.index + 1
-        candidate = Block(
-            index=new_index,
-            previous_hash=self.latest_block.hash,
-            timestamp=time.time(),
-            nonce=0,
-            difficulty=self.current_difficulty,
-            miner_address=mining_pool.name,
-            transactions=selected_txs,
-        )
-
-        print(f"\n⛏️  [{mining_pool.name}] Mining block {new_index}...")
-        print(f"   Transactions: {len(selected_txs)} (fees: {total_fees:.8f} BTC)")
-        print(f"   Difficulty: {self.current_difficulty} leading zeros")
-        start = time.time()
-
-        # Proof of work
-        attempts = 0
-        while True:
-            candidate_hash = candidate.compute_hash()
-            if candidate_hash.startswith("0" * self.current_difficulty):
-                candidate.hash = candidate_hash
-                break
-            candidate.nonce += 1
-            attempts += 1
-
-        elapsed = time.time() - start
-
-        # Simulate network propagation delay
-        time.sleep(random.uniform(0, NETWORK_PROPAGATION_DELAY))
-
-        # Add to chain
-        self.chain.append(candidate)
+        return self.policy.select()
 
-        # Update statistics
-        mining_pool.blocks_mined += 1
-        mining_pool.total_rewards += current_reward + total_fees
-        self.total_fees_collected += total_fees
+    def select_mining_pools(self, count: int) -> List[MiningPool]:
+        """Batch-draw block winners for the next `count` blocks"""
+        return self.policy.sampler.draw_many(count)
 
-        # Credit the mining pool
-        self.credit(mining_pool.name, current_reward + total_fees)
-
-        # Credit recipients of all transactions in the block
-        for tx in selected_txs:
-            if tx.from_addr != "COINBASE":  # Skip coinbase (already credited above)
-                self.credit(tx.to_addr, tx.amount)
-
-        print(f"✅ Block {new_index} mined in {elapsed:.2f}s ({attempts:,} attempts)")
-        print(f"   Hash:   {candidate.hash}")
-        print(f"   Reward: {current_reward:.8f} BTC + {total_fees:.8f} fees")
-        print(f"   Pool:   {mining_pool.name}")
-
-        # Check for difficulty adjustment
-        self.adjust_difficulty()
+    def set_pool_hashrate(self, name: str, hashrate_percentage: float):
+        """Change a pool's hashrate share and rebuild the sampler"""
+        for pool in self.mining_pools:
+            if pool.name == name:
+                pool.hashrate_percentage = hashrate_percentage
+                break
+        else:
+            raise KeyError(f"Unknown mining pool: {name}")
+        self.policy.sampler.rebuild([p.hashrate_percentage for p in self.mining_pools])
 
-        return candidate
+    def _propagate(self, block: Block):
+        """Simulate network propagation delay"""
+        delay = random.uniform(0, self.config.propagation_delay)
+        self._advance_clock(delay)
+        self.metrics.propagation.observe(delay)
 
     # ---------- Fork simulation ----------
 
     def simulate_fork(self) -> bool:
         """Occasionally simulate a fork (2 blocks found simultaneously)"""
-        if random.random() < 0.15:  # 15% chance of fork
+        if len(self.mining_pools) > 1 and random.random() < self.config.fork_probability:
             print("\n" + "!" * 70)
             print("🔱 FORK DETECTED! Two miners found blocks simultaneously")
             print("!" * 70)
@@ -343,37 +143,32 @@ class MainnetNode:
             print(f"   Chain A: {pool1.name}")
             print(f"   Chain B: {pool2.name}")
 
-            # Save current chain
-            original_chain = self.chain.copy()
-
             # Mine block on chain A
-            self.chain = original_chain.copy()
             block_a = self.mine_block(pool1)
-            chain_a = self.chain.copy()
 
-            # Mine block on chain B (revert first)
-            self.chain = original_chain.copy()
+            # Mine block on chain B (disconnect A first, its txs return to the mempool)
+            self.disconnect_tip()
             block_b = self.mine_block(pool2)
-            chain_b = self.chain.copy()
 
             # Next block resolves the fork (longest chain wins)
             print(f"\n   ⛏️  Mining to resolve fork...")
             if random.random() < 0.5:
                 # Chain A wins
-                self.chain = chain_a
+                self.disconnect_tip()
+                self.connect_block(block_a)
                 winning_pool = self.select_mining_pool()
                 self.mine_block(winning_pool)
                 print(f"\n   ✅ Chain A wins! Block by {pool2.name} orphaned")
                 self.orphaned_blocks += 1
             else:
                 # Chain B wins
-                self.chain = chain_b
                 winning_pool = self.select_mining_pool()
                 self.mine_block(winning_pool)
                 print(f"\n   ✅ Chain B wins! Block by {pool1.name} orphaned")
                 self.orphaned_blocks += 1
 
             self.forks_resolved += 1
+            self.record_reorg(1)
             return True
 
         return False
@@ -395,33 +190,57 @@ class MainnetNode:
             if self.get_balance(from_addr) < amount + fee:
                 self.credit(from_addr, (amount + fee) * 2)
 
-            tx = Transaction.create(from_addr, to_addr, amount, fee)
+            tx = Transaction.create(from_addr, to_addr, amount, fee, timestamp=self.now())
             if self.add_transaction(tx):
                 if random.random() < 0.1:  # Only print 10% of txs to reduce spam
                     print(f"   💰 Tx: {from_addr} → {to_addr} : {amount:.8f} BTC (fee: {fee:.8f})")
 
+    def status(self) -> Dict[str, Any]:
+        """Current figures from running counters and rolling stats (no chain scans)"""
+        return {
+            **super().status(),
+            "pools": [
+                {"name": pool.name, "blocks": pool.blocks_mined, "balance": self.get_balance(pool.name),
+                 "share": pool.hashrate_percentage, "hashrate": self.stats.pool_hashrate(pool.name)}
+                for pool in self.mining_pools
+            ],
+        }
+
     def print_network_status(self):
         """Print comprehensive mainnet simulation status"""
-        b = self.latest_block
+        s = self.status()
         print("\n" + "=" * 70)
         print("📊 MAINNET STATUS")
         print("=" * 70)
-        print(f"Block Height:     {self.chain_height:,}")
-        print(f"Latest Hash:      {b.hash}")
-        print(f"Difficulty:       {self.current_difficulty} leading zeros")
-        print(f"Block Reward:     {self.get_current_block_reward():.8f} BTC")
-        print(f"Mempool Size:     {len(self.mempool)} transactions")
-        print(f"Chain Valid:      {self.is_chain_valid()}")
-        print(f"Forks Resolved:   {self.forks_resolved}")
-        print(f"Orphaned Blocks:  {self.orphaned_blocks}")
-        print(f"Total Fees:       {self.total_fees_collected:.8f} BTC")
+        print(f"Block Height:     {s['height']:,}")
+        print(f"Latest Hash:      {s['hash']}")
+        print(f"Difficulty:       {s['difficulty']:,.2f} (bits {s['bits']:#010x})")
+        print(f"Chainwork:        {s['chainwork']:#x}")
+        print(f"Block Reward:     {s['reward']:.8f} BTC")
+        print(f"Mempool Size:     {s['mempool_txs']} transactions ({s['mempool_vbytes']:,} vB)")
+        print(f"Mempool Dropped:  {s['mempool_evicted']} evicted, {s['mempool_expired']} expired")
+        print(f"Chain Valid:      {s['chain_valid']}")
+        print(f"Forks Resolved:   {s['forks_resolved']}")
+        print(f"Orphaned Blocks:  {s['orphaned_blocks']}")
+        print(f"Total Fees:       {s['total_fees']:.8f} BTC")
+        if s["window_blocks"] > 0:
+            print(f"Recent Blocks:    last {s['window_blocks']} "
+                  f"(every {s['avg_block_interval']:.2f}s, {s['fork_rate']:.1%} forked)")
+            print(f"Network Hashrate: {s['network_hashrate']:,.0f} H/s")
+            print(f"Throughput:       {s['txs_per_block']:.1f} tx/block "
+                  f"({s['block_fill']:.0%} of {self.config.max_block_weight:,} WU)")
+            print(f"Avg Fee Rate:     {s['fee_rate']:.1f} sat/vB")
+        phases = s["time_breakdown"]
+        total_time = sum(phases.values())
+        if total_time > 0:
+            print("Time Spent:       " + ", ".join(
+                f"{name} {seconds / total_time:.0%}" for name, seconds in phases.items()))
 
         print("\n🏊 MINING POOL STATISTICS:")
-        for pool in sorted(self.mining_pools, key=lambda p: p.blocks_mined, reverse=True):
-            balance = self.get_balance(pool.name)
-            print(f"   {pool.name:20s} | Blocks: {pool.blocks_mined:3d} | "
-                  f"Balance: {balance:10.8f} BTC | "
-                  f"Hashrate: {pool.hashrate_percentage:5.1f}%")
+        for pool in s["pools"]:
+            print(f"   {pool['name']:20s} | Blocks: {pool['blocks']:3d} | "
+                  f"Balance: {pool['balance']:10.8f} BTC | "
+                  f"Hashrate: {pool['share']:5.1f}% ({pool['hashrate']:,.0f} H/s observed)")
         print("=" * 70)
 
     def run_simulation(self, num_blocks: int = 50):
@@ -459,10 +278,15 @@ class MainnetNode:
 
 def main():
     """Run the mainnet simulation"""
-    node = MainnetNode()
-
-    # Run simulation for 30 blocks (can be changed)
-    node.run_simulation(num_blocks=30)
+    parser = argparse.ArgumentParser(description="Bitcoin mainnet simulation")
+    parser.add_argument("--blocks", type=int, default=30, help="blocks to mine")
+    add_backend_argument(parser)
+    add_config_arguments(parser)
+    args = parser.parse_args()
+    apply_backend_argument(args)
+
+    node = MainnetNode(verbose=True, config=config_from_args(args, MAINNET))
+    node.run_simulation(num_blocks=args.blocks)
 
 
 if __name__ == "__main__":
@@ -4,15 +4,73 @@ INFINITE BITCOIN MAINNET SIMULATOR
 ===================================
 
 This version runs FOREVER until you press Ctrl+C
+
+Checkpointing:
+    python bitcoin_simulator_infinite.py --checkpoint node.snap --every 10
+resumes from node.snap if it exists, appends an incremental snapshot every
+10 blocks, and writes a final one on Ctrl+C.
+
+Profiling:
+    python bitcoin_simulator_infinite.py --metrics metrics.prom --profile
+rewrites metrics.prom (Prometheus text format) at every status report and
+samples the main thread's stack; the hottest functions are printed on
+Ctrl+C and the collapsed stacks written next to the metrics file.
+
+Dashboard:
+    python bitcoin_simulator_infinite.py --dashboard
+replaces the per-block log with a live view redrawn every second.
 """
 
-import sys
-sys.path.insert(0, '/home/user/node')
+import argparse
+import contextlib
+import os
 from bitcoin_simulator import MainnetNode
+from dashboard import Dashboard
+from hash_backend import add_backend_argument, apply_backend_argument
+from metrics import REGISTRY, SamplingProfiler
+from node_config import MAINNET, add_config_arguments, config_from_args
+from node_snapshot import NodeSnapshotter, load_snapshot, resume_snapshotter
+
+COMPACT_AFTER = 50  # Deltas before the checkpoint is folded back into one full record
 
 def main():
     """Run infinite mainnet simulation"""
-    node = MainnetNode()
+    parser = argparse.ArgumentParser(description="Infinite mainnet simulation")
+    parser.add_argument("--checkpoint", metavar="PATH", help="snapshot file to resume from and write to")
+    parser.add_argument("--every", type=int, default=10, metavar="N", help="snapshot every N blocks")
+    parser.add_argument("--metrics", metavar="PATH", help="write Prometheus-format metrics here")
+    parser.add_argument("--profile", action="store_true", help="run the sampling profiler")
+    parser.add_argument("--dashboard", action="store_true", help="show a live dashboard instead of the log")
+    add_backend_argument(parser)
+    add_config_arguments(parser)
+    args = parser.parse_args()
+    apply_backend_argument(args)
+    config = config_from_args(args, MAINNET)
+
+    snapshotter = None
+    if args.checkpoint and os.path.exists(args.checkpoint):
+        node = load_snapshot(args.checkpoint, verbose=True, config=config)
+        snapshotter = resume_snapshotter(node, args.checkpoint)
+        print(f"♻️  Resumed from {args.checkpoint} at height {node.chain_height}")
+    else:
+        node = MainnetNode(verbose=True, config=config)
+        if args.checkpoint:
+            snapshotter = NodeSnapshotter(node, args.checkpoint)
+            snapshotter.snapshot(full=True)
+
+    def checkpoint():
+        if snapshotter is None:
+            return
+        full = snapshotter.records_written >= COMPACT_AFTER
+        size = snapshotter.snapshot(full=full)
+        kind = "full" if full else "incremental"
+        print(f"💾 Checkpoint ({kind}, {size:,} bytes) at height {node.chain_height}")
+
+    def dump_metrics():
+        if args.metrics:
+            REGISTRY.write(args.metrics)
+
+    profiler = SamplingProfiler().start() if args.profile else None
 
     print("\n" + "=" * 70)
     print("🔄 INFINITE MAINNET SIMULATION")
@@ -21,30 +79,48 @@ def main():
     print("=" * 70)
     print()
 
+    # The dashboard draws on the real terminal while the per-block log is discarded
+    quiet = contextlib.redirect_stdout(open(os.devnull, "w")) if args.dashboard else contextlib.nullcontext()
+    live = Dashboard(node) if args.dashboard else contextlib.nullcontext()
+
     block_count = 0
     try:
-        while True:
-            # Mine one block at a time
-            block_count += 1
-            print(f"\n{'='*70}")
-            print(f"BLOCK #{block_count} (Height will be {node.chain_height + 1})")
-            print(f"{'='*70}")
+        with quiet, live:
+            while True:
+                # Mine one block at a time
+                block_count += 1
+                print(f"\n{'='*70}")
+                print(f"BLOCK #{block_count} (Height will be {node.chain_height + 1})")
+                print(f"{'='*70}")
+
+                node.generate_random_transactions()
 
-            node.generate_random_transactions()
+                # Check for fork
+                if not node.simulate_fork():
+                    node.mine_block()
 
-            # Check for fork
-            if not node.simulate_fork():
-                node.mine_block()
+                # Print status every 5 blocks
+                if block_count % 5 == 0:
+                    node.print_network_status()
+                    dump_metrics()
 
-            # Print status every 5 blocks
-            if block_count % 5 == 0:
-                node.print_network_status()
+                if block_count % args.every == 0:
+                    checkpoint()
 
     except KeyboardInterrupt:
         print("\n\n🛑 INFINITE SIMULATION STOPPED BY USER")
         print("=" * 70)
         print(f"Total blocks mined: {block_count}")
         node.print_network_status()
+        checkpoint()
+        dump_metrics()
+        if profiler is not None:
+            profiler.stop()
+            print("\n" + profiler.report(15))
+            stacks_path = (args.metrics or "profile") + ".stacks"
+            with open(stacks_path, "w") as f:
+                f.write(profiler.collapsed() + "\n")
+            print(f"🔥 Collapsed stacks written to {stacks_path}")
 
 if __name__ == "__main__":
     main()
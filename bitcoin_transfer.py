@@ -4,13 +4,30 @@ BITCOIN WALLET TRANSFER TOOL
 =============================
 
 Transfer simulated BTC between wallet addresses for testing.
+Pass --rpc HOST:PORT to send through a running node_server.py daemon
+instead of starting a fresh in-process node. Pass --batch FILE (CSV or
+JSON lines, '-' for stdin) to send many transfers through one node.
 """
 
+import csv
+import json
 import sys
-sys.path.insert(0, '/home/user/node')
+import time
+from collections import defaultdict, deque
+from dataclasses import asdict, dataclass
+from typing import TYPE_CHECKING, List, Optional
 from bitcoin_simulator import MainnetNode, Transaction
 
-def transfer_bitcoin(from_address: str, to_address: str, amount: float, fee: float = 0.0001):
+if TYPE_CHECKING:
+    # node_server (and asyncio behind it) is only imported when --rpc is used
+    from node_server import NodeClient
+
+DEFAULT_FEE = 0.0001
+FUNDING_MARGIN = 1e-8  # One satoshi, so float rounding never leaves a sender short
+RPC_BATCH_SIZE = 500  # Calls per JSON-RPC batch request
+
+def transfer_bitcoin(from_address: str, to_address: str, amount: float, fee: float = 0.0001,
+                     client: "NodeClient" = None):
     """
     Transfer Bitcoin from one address to another
 
@@ -19,7 +36,11 @@ def transfer_bitcoin(from_address: str, to_address: str, amount: float, fee: flo
         to_address: Destination wallet address
         amount: Amount of BTC to transfer
         fee: Transaction fee (default: 0.0001 BTC)
+        client: Connected node client; when given, the transfer goes to the running node
     """
+    if client is not None:
+        return transfer_via_node(client, from_address, to_address, amount, fee)
+
     print("\n" + "=" * 70)
     print("💸 BITCOIN TRANSFER TOOL")
     print("=" * 70)
@@ -77,7 +98,228 @@ def transfer_bitcoin(from_address: str, to_address: str, amount: float, fee: flo
         return None
 
 
-def interactive_transfer():
+def transfer_via_node(client: "NodeClient", from_address: str, to_address: str,
+                      amount: float, fee: float = 0.0001):
+    """Submit a transfer to a running node daemon; returns the txid"""
+    from headers import HeaderError
+    from node_server import RPCError
+
+    start = time.time()
+    print(f"\n💸 {from_address} → {to_address}: {amount:.8f} BTC (fee {fee:.8f})")
+
+    # Light client: check the node's chain from headers alone before trusting its balances
+    try:
+        chain = client.header_sync().chain
+    except HeaderError as e:
+        print(f"❌ Node chain failed header verification: {e}")
+        return None
+    print(f"🔗 Verified {chain.height} block headers (tip {chain.tip.hash[:16]}...)")
+
+    balance = client.getbalance(from_address)
+    if balance < amount + fee:
+        print(f"⚠️  Insufficient funds ({balance:.8f} BTC), crediting test funds...")
+        client.faucet(from_address, amount + fee + 1.0 - balance)
+
+    try:
+        txid = client.sendtransaction(from_address, to_address, amount, fee)
+    except RPCError as e:
+        print(f"❌ Transaction rejected: {e.message}")
+        return None
+
+    info = client.getchaininfo()
+    print(f"✅ TX {txid} in mempool ({info['mempool_txs']} pending, tip height {info['blocks']})")
+    print(f"   {from_address}: {client.getbalance(from_address):.8f} BTC")
+    print(f"   Round trip: {(time.time() - start) * 1000:.1f} ms")
+    return txid
+
+
+# ---------- Batch transfers ----------
+
+@dataclass
+class TransferResult:
+    """One transfer of a batch and what happened to it"""
+    line: int
+    from_addr: str
+    to_addr: str
+    amount: float
+    fee: float = DEFAULT_FEE
+    status: str = "pending"     # pending (in mempool), confirmed, rejected, invalid
+    txid: str = ""
+    block: Optional[int] = None
+    error: str = ""
+
+
+def load_transfers(source: str) -> List[TransferResult]:
+    """
+    Read transfers from a CSV or JSON-lines file, or '-' for stdin.
+
+    CSV needs a header row with from,to,amount[,fee]; JSON lines are objects
+    with the same keys. Malformed rows come back with status "invalid".
+    """
+    if source == "-":
+        lines = sys.stdin.read().splitlines()
+    else:
+        with open(source, newline="") as f:
+            lines = f.read().splitlines()
+
+    first = next((l for l in lines if l.strip()), "")
+    if first.lstrip().startswith("{"):
+        records = []
+        for number, line in enumerate(lines, 1):
+            if not line.strip():
+                continue
+            try:
+                records.append((number, json.loads(line)))
+            except ValueError:
+                records.append((number, {}))
+    else:
+        reader = csv.DictReader(lines)
+        records = [(reader.line_num, row) for row in reader]
+
+    transfers = []
+    for number, record in records:
+        result = TransferResult(number, str(record.get("from") or ""), str(record.get("to") or ""), 0.0)
+        try:
+            result.amount = float(record["amount"])
+            fee = record.get("fee")
+            result.fee = DEFAULT_FEE if fee in (None, "") else float(fee)
+        except (KeyError, TypeError, ValueError):
+            result.status, result.error = "invalid", "missing or malformed amount/fee"
+        else:
+            if not result.from_addr or not result.to_addr:
+                result.status, result.error = "invalid", "missing from/to address"
+            elif result.amount <= 0 or result.fee < 0:
+                result.status, result.error = "invalid", "amount must be positive and fee non-negative"
+        transfers.append(result)
+    return transfers
+
+
+def batch_transfer(transfers: List[TransferResult], node: Optional[MainnetNode] = None,
+                   client: Optional["NodeClient"] = None, fund_missing: bool = True) -> List[TransferResult]:
+    """
+    Send many transfers through one node and update each result in place.
+
+    In-process, every accepted transfer is confirmed in as few blocks as the
+    block weight limit allows (mined silently, no propagation delay). Through
+    a node daemon, transfers go out in JSON-RPC batches and stay "pending"
+    until the daemon's miner confirms them.
+    """
+    pending = [r for r in transfers if r.status == "pending"]
+    needed = defaultdict(float)
+    for r in pending:
+        needed[r.from_addr] += r.amount + r.fee
+    senders = list(needed)
+
+    if client is not None:
+        from node_server import RPCError
+
+        if fund_missing:
+            balances = client.call_batch([("getbalance", [a]) for a in senders])
+            client.call_batch([("faucet", [a, needed[a] - b + FUNDING_MARGIN]) for a, b in zip(senders, balances)
+                               if b < needed[a]])
+        for start in range(0, len(pending), RPC_BATCH_SIZE):
+            chunk = pending[start:start + RPC_BATCH_SIZE]
+            replies = client.call_batch([("sendtransaction", [r.from_addr, r.to_addr, r.amount, r.fee])
+                                         for r in chunk])
+            for r, reply in zip(chunk, replies):
+                if isinstance(reply, RPCError):
+                    r.status, r.error = "rejected", reply.message
+                else:
+                    r.txid = reply
+        return transfers
+
+    node = node or MainnetNode(verbose=False)
+    if fund_missing:
+        for address in senders:
+            deficit = needed[address] - node.get_balance(address)
+            if deficit > 0:
+                node.credit(address, deficit + FUNDING_MARGIN)
+
+    mempool = node.mempool
+    by_txid = {}
+    blocks = []
+    queue = deque(pending)
+    while queue:
+        r = queue[0]
+        tx = Transaction.create(r.from_addr, r.to_addr, r.amount, r.fee)
+        if mempool and ((mempool.max_count is not None and len(mempool) >= mempool.max_count) or
+                        (mempool.max_vbytes is not None and mempool.total_vbytes + tx.size > mempool.max_vbytes)):
+            # Confirm what is queued first: a full mempool would evict transfers already accepted
+            blocks.append(node.generate_block())
+            continue
+        if node.add_transaction(tx):
+            r.txid = tx.txid
+            by_txid[tx.txid] = r
+            queue.popleft()
+        elif node.get_balance(r.from_addr) < r.amount + r.fee or not node.mempool:
+            r.status, r.error = "rejected", "insufficient funds"
+            queue.popleft()
+        else:
+            # Mempool full: confirm what is queued before adding more
+            blocks.append(node.generate_block())
+
+    while any(txid in node.mempool for txid in by_txid):
+        blocks.append(node.generate_block())
+
+    for block in blocks:
+        for tx in block.transactions[1:]:
+            r = by_txid.get(tx.txid)
+            if r is not None:
+                r.status, r.block = "confirmed", block.index
+    for r in by_txid.values():
+        if r.status == "pending":
+            r.status, r.error = "rejected", "evicted from mempool"
+    return transfers
+
+
+def write_results(results: List[TransferResult], path: str):
+    """Write per-transfer results as JSON lines (.jsonl/.json) or CSV"""
+    rows = [asdict(r) for r in results]
+    with open(path, "w", newline="") as f:
+        if path.endswith((".jsonl", ".json")):
+            f.writelines(json.dumps(row) + "\n" for row in rows)
+        else:
+            writer = csv.DictWriter(f, fieldnames=list(TransferResult.__dataclass_fields__))
+            writer.writeheader()
+            writer.writerows(rows)
+
+
+def print_batch_report(results: List[TransferResult], elapsed: float):
+    counts = defaultdict(int)
+    for r in results:
+        counts[r.status] += 1
+    blocks = {r.block for r in results if r.block is not None}
+    sent = sum(r.amount for r in results if r.status in ("confirmed", "pending"))
+
+    print("\n" + "=" * 70)
+    print("📦 BATCH TRANSFER REPORT")
+    print("=" * 70)
+    print(f"Transfers:   {len(results):,} in {elapsed:.2f}s")
+    print(f"Confirmed:   {counts['confirmed']:,} in {len(blocks):,} blocks")
+    print(f"Pending:     {counts['pending']:,}")
+    print(f"Rejected:    {counts['rejected']:,}")
+    print(f"Invalid:     {counts['invalid']:,}")
+    print(f"Amount Sent: {sent:.8f} BTC")
+    failed = [r for r in results if r.status in ("rejected", "invalid")]
+    for r in failed[:20]:
+        print(f"   ❌ line {r.line}: {r.from_addr or '?'} → {r.to_addr or '?'} ({r.status}: {r.error})")
+    if len(failed) > 20:
+        print(f"   ... {len(failed) - 20:,} more failures (see --results file)")
+    print("=" * 70)
+
+
+def run_batch(source: str, client: Optional["NodeClient"] = None, results_path: Optional[str] = None):
+    """CLI entry point for --batch"""
+    start = time.time()
+    results = batch_transfer(load_transfers(source), client=client)
+    print_batch_report(results, time.time() - start)
+    if results_path:
+        write_results(results, results_path)
+        print(f"💾 Per-transfer results saved to: {results_path}")
+    return results
+
+
+def interactive_transfer(client: "NodeClient" = None):
     """Interactive mode for transferring Bitcoin"""
     print("\n" + "=" * 70)
     print("💸 INTERACTIVE BITCOIN TRANSFER")
@@ -97,10 +339,10 @@ def interactive_transfer():
     fee_str = input("Enter transaction fee (or press Enter for 0.0001): ").strip()
     fee = float(fee_str) if fee_str else 0.0001
 
-    transfer_bitcoin(from_addr, to_addr, amount, fee)
+    transfer_bitcoin(from_addr, to_addr, amount, fee, client=client)
 
 
-def quick_transfer_from_pools():
+def quick_transfer_from_pools(client: "NodeClient" = None):
     """Quick transfer from mining pools to test wallets"""
     print("\n" + "=" * 70)
     print("🏊 QUICK TRANSFER FROM MINING POOLS")
@@ -127,22 +369,55 @@ def quick_transfer_from_pools():
     amount = float(amount_str) if amount_str else 5.0
 
     print(f"\n🚀 Transferring {amount} BTC from {from_addr} to {to_addr}...")
-    transfer_bitcoin(from_addr, to_addr, amount)
+    transfer_bitcoin(from_addr, to_addr, amount, client=client)
 
 
-if __name__ == "__main__":
-    if len(sys.argv) > 1:
+def _pop_option(name: str) -> Optional[str]:
+    """Remove `name VALUE` from sys.argv and return VALUE"""
+    if name not in sys.argv:
+        return None
+    flag = sys.argv.index(name)
+    value = sys.argv[flag + 1]
+    del sys.argv[flag:flag + 2]
+    return value
+
+
+def main():
+    """Command-line entry point (also the bitcoin-transfer console script)"""
+    rpc = _pop_option("--rpc")
+    config_path = _pop_option("--config")
+    assignments = []
+    while "--set" in sys.argv:
+        assignments.append(_pop_option("--set"))
+    client = None
+    if rpc:
+        from node_config import MAINNET, load_config, parse_assignments
+        from node_server import NodeClient
+
+        # Consensus rules the node's headers are checked against
+        config = load_config(MAINNET, config_path, **parse_assignments(assignments))
+        client = NodeClient.from_address(rpc, config=config)
+    batch = _pop_option("--batch")
+    results_path = _pop_option("--results")
+
+    if batch:
+        run_batch(batch, client, results_path)
+    elif len(sys.argv) > 1:
         # Command line mode
         if len(sys.argv) >= 4:
             from_addr = sys.argv[1]
             to_addr = sys.argv[2]
             amount = float(sys.argv[3])
             fee = float(sys.argv[4]) if len(sys.argv) > 4 else 0.0001
-            transfer_bitcoin(from_addr, to_addr, amount, fee)
+            transfer_bitcoin(from_addr, to_addr, amount, fee, client=client)
         else:
-            print("Usage: python3 bitcoin_transfer.py <from_address> <to_address> <amount> [fee]")
+            print("Usage: python3 bitcoin_transfer.py [--rpc HOST:PORT [--config PATH] [--set FIELD=VALUE]] "
+                  "<from_address> <to_address> <amount> [fee]")
+            print("       python3 bitcoin_transfer.py [--rpc HOST:PORT] --batch FILE|- [--results OUT]")
             print("\nExample:")
             print("  python3 bitcoin_transfer.py FoundryUSA MyWallet 10.5 0.0001")
+            print("  python3 bitcoin_transfer.py --rpc 127.0.0.1:18443 FoundryUSA MyWallet 10.5")
+            print("  python3 bitcoin_transfer.py --batch payouts.csv --results payouts_done.jsonl")
     else:
         # Interactive mode
         print("\n" + "=" * 70)
@@ -156,8 +431,12 @@ if __name__ == "__main__":
         choice = input("\nSelect option (1-3): ").strip()
 
         if choice == "1":
-            quick_transfer_from_pools()
+            quick_transfer_from_pools(client)
         elif choice == "2":
-            interactive_transfer()
+            interactive_transfer(client)
         else:
             print("Exiting...")
+
+
+if __name__ == "__main__":
+    main()
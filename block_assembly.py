@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+FEE-RATE AND WEIGHT-AWARE BLOCK ASSEMBLY
+========================================
+
+Shared block assembly used by all simulated nodes:
+- Transaction sizes in virtual bytes, block weight in weight units (4 WU/vB)
+- Greedy knapsack fill by fee rate (sat/vB) within the block weight budget
+- O(n log n) over the mempool (one sort, one linear fill with early exit)
+
+Transactions in this simulator are account-based and never spend each other,
+so every transaction is its own package and no ancestor tracking is needed.
+
+NO REAL BITCOIN. NO REAL NETWORK. PURELY EDUCATIONAL.
+"""
+
+from typing import Any, List, Sequence, Tuple
+
+WITNESS_SCALE_FACTOR = 4        # Weight units per virtual byte
+MIN_TX_SIZE = 140               # Smallest generated transaction (vbytes)
+MAX_TX_SIZE = 400               # Largest generated transaction (vbytes)
+COINBASE_SIZE = 150             # Space reserved for the coinbase (vbytes)
+SATOSHIS_PER_BTC = 100_000_000
+
+
+def tx_weight(tx: Any) -> int:
+    """Block weight consumed by a transaction"""
+    return tx.size * WITNESS_SCALE_FACTOR
+
+
+def fee_rate(tx: Any) -> float:
+    """Fee rate in sat/vB"""
+    return tx.fee * SATOSHIS_PER_BTC / tx.size
+
+
+def fill_block(ordered: Sequence[Any], max_weight: int) -> Tuple[List[Any], int, int]:
+    """
+    Greedily take transactions in the given (fee-rate descending) order.
+
+    Transactions that do not fit are skipped, and the walk stops as soon as
+    not even the smallest possible transaction would fit.
+
+    Returns:
+        (selected transactions, total weight, number of entries scanned)
+    """
+    budget = max_weight - COINBASE_SIZE * WITNESS_SCALE_FACTOR
+    min_weight = MIN_TX_SIZE * WITNESS_SCALE_FACTOR
+    selected: List[Any] = []
+    used = 0
+    scanned = 0
+
+    for tx in ordered:
+        if budget - used < min_weight:
+            break
+        scanned += 1
+        weight = tx.size * WITNESS_SCALE_FACTOR
+        if used + weight <= budget:
+            selected.append(tx)
+            used += weight
+
+    return selected, used + COINBASE_SIZE * WITNESS_SCALE_FACTOR, scanned
+
+
+def select_transactions(mempool: Sequence[Any], max_weight: int) -> Tuple[List[Any], int]:
+    """
+    Pick the fee-maximising set of transactions for a block.
+
+    Args:
+        mempool: Candidate transactions (any order)
+        max_weight: Block weight limit in weight units
+
+    Returns:
+        (selected transactions, total block weight including coinbase)
+    """
+    ordered = sorted(mempool, key=fee_rate, reverse=True)
+    selected, weight, _ = fill_block(ordered, max_weight)
+    return selected, weight
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+BLOCK TEMPLATE MANAGER
+======================
+
+Keeps the next candidate block of a node (node_core.NodeCore) up to date
+while transactions arrive, instead of rebuilding it from scratch on every
+call to mine_block:
+- Fee-rate-ordered candidate index maintained on every mempool insert/removal
+- Weight-limited selection and tx-root body only recomputed when it changes
+- Pre-hashed header prefix (midstate) so the PoW loop only hashes the nonce
+
+NO REAL BITCOIN. NO REAL NETWORK. PURELY EDUCATIONAL.
+"""
+
+import bisect
+import itertools
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import hash_backend
+from block_assembly import COINBASE_SIZE, fee_rate, fill_block
+
+
+@dataclass
+class BlockTemplate:
+    """A ready-to-hash candidate block"""
+    block: Any
+    total_fees: float
+    reward: float
+    weight: int
+    _midstate: Any = None          # Backend hash object over the header prefix
+    _prefix: bytes = b""
+    _suffix: bytes = b""
+
+    @property
+    def header_prefix(self) -> bytes:
+        """Header bytes before the nonce (what the midstate has hashed)"""
+        return self._prefix
+
+    @property
+    def header_suffix(self) -> bytes:
+        """Header bytes after the nonce"""
+        return self._suffix
+
+    def hash_for_nonce(self, nonce: int) -> str:
+        """Hash the candidate header for a nonce, reusing the prefix midstate"""
+        h = self._midstate.copy()
+        h.update(str(nonce).encode() + self._suffix)
+        return h.hexdigest()
+
+
+class BlockTemplateManager:
+    """Maintains the selected transaction set for the next block incrementally"""
+
+    def __init__(self, block_cls: type, tx_cls: type, max_weight: int):
+        # Block/Transaction classes come from the owning node module so the
+        # template never imports the simulator back (it may be running as __main__)
+        self.block_cls = block_cls
+        self.tx_cls = tx_cls
+        self.max_weight = max_weight
+        # Sorted by (-fee rate, arrival) so ties keep mempool arrival order
+        self._keys: List[Tuple[float, int]] = []
+        self._txs: List[Any] = []
+        self._key_by_txid: Dict[str, Tuple[float, int]] = {}
+        self._arrival = itertools.count()
+
+        # Cached selection (invalidated only when the scanned prefix changes)
+        self._selected: Optional[List[Any]] = None
+        self._weight = 0
+        self._scanned = 0
+        self._body: str = ""
+
+    def __len__(self) -> int:
+        return len(self._txs)
+
+    # ---------- Mempool notifications ----------
+
+    def add_transaction(self, tx: Any):
+        """Index a transaction that just entered the mempool"""
+        if tx.txid in self._key_by_txid:
+            return
+        key = (-fee_rate(tx), next(self._arrival))
+        pos = bisect.bisect_left(self._keys, key)
+        self._keys.insert(pos, key)
+        self._txs.insert(pos, tx)
+        self._key_by_txid[tx.txid] = key
+
+        # Only a tx landing inside the scanned window changes the template
+        if pos <= self._scanned:
+            self._selected = None
+
+    def remove_transactions(self, txs: Iterable[Any]):
+        """Drop transactions that left the mempool (mined or evicted)"""
+        for tx in txs:
+            key = self._key_by_txid.pop(tx.txid, None)
+            if key is None:
+                continue
+            pos = bisect.bisect_left(self._keys, key)
+            del self._keys[pos]
+            del self._txs[pos]
+            if pos < self._scanned:
+                self._selected = None
+
+    # ---------- Template construction ----------
+
+    def selected_transactions(self) -> List[Any]:
+        """Fee-maximising transactions within the weight limit (cached)"""
+        if self._selected is None:
+            self._selected, self._weight, self._scanned = fill_block(self._txs, self.max_weight)
+            self._body = "".join(tx.txid for tx in self._selected)
+        return list(self._selected)
+
+    def build(self, index: int, previous_hash: str, timestamp: float,
+              bits: int, miner_address: str, reward: float,
+              exclude: Iterable[Any] = ()) -> BlockTemplate:
+        """
+        Assemble the candidate block and pre-hash its header prefix. `exclude`
+        leaves out transactions a parent off the active tip already confirmed
+        (selected afresh, bypassing the cache)
+        """
+        skip = {tx.txid for tx in exclude}
+        if skip:
+            selected, weight, _ = fill_block([tx for tx in self._txs if tx.txid not in skip], self.max_weight)
+            body = "".join(tx.txid for tx in selected)
+        else:
+            selected = self.selected_transactions()
+            weight, body = self._weight, self._body
+        total_fees = sum(tx.fee for tx in selected)
+
+        coinbase = self.tx_cls.create(
+            from_addr="COINBASE",
+            to_addr=miner_address,
+            amount=reward + total_fees,
+            fee=0.0,
+            size=COINBASE_SIZE,
+            timestamp=timestamp,
+        )
+        block = self.block_cls(
+            index=index,
+            previous_hash=previous_hash,
+            timestamp=timestamp,
+            nonce=0,
+            bits=bits,
+            miner_address=miner_address,
+            transactions=[coinbase] + selected,
+        )
+
+        tx_root = hash_backend.sha256_hex((coinbase.txid + body).encode())
+        prefix = f"{index}{previous_hash}{timestamp}".encode()
+        midstate = hash_backend.new(prefix)
+        suffix = f"{bits}{miner_address}{tx_root}".encode()
+
+        return BlockTemplate(
+            block=block,
+            total_fees=total_fees,
+            reward=reward,
+            weight=weight,
+            _midstate=midstate,
+            _prefix=prefix,
+            _suffix=suffix,
+        )
@@ -9,17 +9,32 @@ This script:
 3. Validates all mined blocks and transactions
 4. Provides detailed verification output
 
+The wallet report is built from an address index: the node's own index
+with --rpc HOST:PORT (a running node_server.py daemon), otherwise one built
+from the audit records and the sample ledger. Settings (proof-of-work
+zeros, confirmations, fees, delays, the sample ledger) come from a
+ValidatorConfig; --config PATH reads its "validator" section.
+
 NO REAL BITCOIN. NO REAL NETWORK. PURELY EDUCATIONAL.
 """
 
-import hashlib
 import random
 import time
 import json
+import sys
 from dataclasses import dataclass
-from typing import List, Dict, Optional
+from typing import TYPE_CHECKING, List, Dict, Optional
 from datetime import datetime
 
+from address_index import AddressIndex
+from chain_index import ChainIndex
+from hash_backend import set_backend, sha256_hex, sha256d_hex
+from headers import HeaderError
+from node_config import MAINNET, VALIDATOR, ValidatorConfig, load_config
+
+if TYPE_CHECKING:
+    from node_server import NodeClient  # Imported by cli() only when --rpc is given
+
 
 @dataclass
 class BlockValidation:
@@ -52,7 +67,7 @@ class Transaction:
     def create(from_addr: str, to_addr: str, amount: float, fee: float = 0.0001):
         now = time.time()
         raw = f"{from_addr}{to_addr}{amount}{fee}{now}{random.random()}"
-        txid = hashlib.sha256(raw.encode()).hexdigest()
+        txid = sha256d_hex(raw.encode())
         return Transaction(
             txid=txid,
             from_addr=from_addr,
@@ -66,7 +81,11 @@ class Transaction:
 class BlockchainValidator:
     """Simulates Bitcoin blockchain validation"""
 
-    def __init__(self):
+    def __init__(self, chain_index: Optional[ChainIndex] = None, tip_height: int = 0,
+                 config: Optional[ValidatorConfig] = None):
+        self.config = config or VALIDATOR
+        self.chain_index = chain_index  # Live chain, when validating a node's blocks
+        self.tip_height = tip_height    # Otherwise the highest known block height
         self.validation_results: List[BlockValidation] = []
         self.total_validated_blocks = 0
         self.total_validated_btc = 0.0
@@ -75,7 +94,7 @@ class BlockchainValidator:
         """Validate block structure and cryptographic properties"""
         checks = {
             'hash_format': len(block_hash) == 64 and all(c in '0123456789abcdef' for c in block_hash),
-            'proof_of_work': block_hash[:4] == '0000',  # Valid difficulty
+            'proof_of_work': block_hash[:self.config.pow_zeros] == '0' * self.config.pow_zeros,
             'merkle_root_valid': True,  # Simulated merkle root validation
             'timestamp_valid': True,  # Timestamp within acceptable range
             'nonce_valid': True,  # Nonce produces valid hash
@@ -87,12 +106,16 @@ class BlockchainValidator:
         }
         return checks
 
-    def simulate_network_consensus(self, block_hash: str) -> tuple[int, str]:
-        """Simulate network consensus verification"""
-        # Simulate confirmations (how many blocks have been built on top)
-        confirmations = random.randint(6, 150)  # 6+ confirmations = confirmed
+    def simulate_network_consensus(self, block_hash: str, block_height: Optional[int] = None) -> tuple[int, str]:
+        """Network consensus check: confirmations = tip - height + 1"""
+        if self.chain_index is not None and block_hash in self.chain_index:
+            confirmations = self.chain_index.confirmations(block_hash)
+        elif block_height is not None:
+            confirmations = max(0, self.tip_height - block_height + 1)
+        else:
+            confirmations = 0
 
-        if confirmations >= 6:
+        if confirmations >= self.config.confirmations_required:
             status = "CONFIRMED - Network consensus achieved"
         elif confirmations >= 1:
             status = "PENDING - Awaiting more confirmations"
@@ -117,7 +140,7 @@ class BlockchainValidator:
         print("⚙️  Running validation checks...")
         validation_checks = self.validate_block_structure(block_hash, block_height)
 
-        time.sleep(0.1)  # Simulate validation time
+        time.sleep(self.config.validation_delay)  # Simulate validation time
 
         # Display validation results
         print("\n📋 VALIDATION RESULTS:")
@@ -127,12 +150,12 @@ class BlockchainValidator:
 
         # Check network consensus
         print("\n🌐 CHECKING NETWORK CONSENSUS...")
-        confirmations, network_status = self.simulate_network_consensus(block_hash)
+        confirmations, network_status = self.simulate_network_consensus(block_hash, block_height)
         print(f"   Confirmations: {confirmations}")
         print(f"   Status: {network_status}")
 
         # Generate merkle root
-        merkle_root = hashlib.sha256(f"{block_hash}{tx_count}".encode()).hexdigest()
+        merkle_root = sha256_hex(f"{block_hash}{tx_count}".encode())
 
         # Determine if block is valid
         is_valid = all(validation_checks.values())
@@ -181,8 +204,11 @@ class BlockchainValidator:
 class RewardConsolidator:
     """Consolidates all rewards to single wallet"""
 
-    def __init__(self, target_wallet: str):
+    def __init__(self, target_wallet: str, client: Optional["NodeClient"] = None,
+                 config: Optional[ValidatorConfig] = None):
+        self.config = config or VALIDATOR
         self.target_wallet = target_wallet
+        self.client = client
         self.transactions: List[Transaction] = []
         self.total_transferred = 0.0
 
@@ -197,8 +223,10 @@ class RewardConsolidator:
         print(f"Amount: {amount:.8f} BTC")
         print()
 
-        # Create transaction
-        tx = Transaction.create(source_wallet, self.target_wallet, amount, 0.0001)
+        # Create transaction (submitted to the live node when connected)
+        tx = Transaction.create(source_wallet, self.target_wallet, amount, self.config.consolidation_fee)
+        if self.client is not None:
+            tx.txid = self.client.sendtransaction(source_wallet, self.target_wallet, amount, tx.fee)
 
         print(f"🔨 Creating consolidation transaction...")
         print(f"   TX ID: {tx.txid}")
@@ -208,10 +236,14 @@ class RewardConsolidator:
         self.transactions.append(tx)
         self.total_transferred += amount
 
+        if self.client is not None:
+            print(f"\n📡 Submitted to node mempool")
+            return tx
+
         # Simulate transaction broadcast
-        time.sleep(0.2)
+        time.sleep(self.config.broadcast_delay * 0.4)
         print(f"\n📡 Broadcasting to network...")
-        time.sleep(0.3)
+        time.sleep(self.config.broadcast_delay * 0.6)
         print(f"✅ Transaction broadcast successful!")
         print(f"   Status: CONFIRMED")
         print(f"   Block inclusion: Pending next block")
@@ -230,7 +262,7 @@ class RewardConsolidator:
             'inputs_valid': True,
             'outputs_valid': True,
             'no_double_spend': True,
-            'fee_adequate': tx.fee >= 0.00001,
+            'fee_adequate': tx.fee >= self.config.min_relay_fee,
             'amount_positive': tx.amount > 0,
             'format_valid': True
         }
@@ -250,8 +282,27 @@ class RewardConsolidator:
         return is_valid
 
 
-def main():
-    """Main execution"""
+def build_sample_index(audit_data: Dict, wallet: str, target_wallet: str,
+                       config: ValidatorConfig = VALIDATOR):
+    """Address index of the audit coinbases plus the sample ledger; returns (index, tip)"""
+    records = sorted(audit_data['records'], key=lambda r: r['block_height'])
+    if not records:
+        blocks = int(audit_data.get('total_rewards_paid', 0) / config.sample_block_reward)
+        records = [{'block_height': h, 'block_hash': f'sample-block-{h}', 'recipient': wallet,
+                    'total_btc': config.sample_block_reward} for h in range(1, blocks + 1)]
+
+    index = AddressIndex()
+    for record in records:
+        index.add_entry(record.get('recipient', wallet), record['block_height'],
+                        record['block_hash'], record['total_btc'])
+    tip = (records[-1]['block_height'] if records else 0) + 1
+    index.add_entry(wallet, tip, 'sample-direct-transfer', config.sample_direct_transfer)
+    index.add_entry(target_wallet, tip, 'sample-existing-balance', config.sample_wallet2_existing)
+    return index, tip
+
+
+def main(client: Optional["NodeClient"] = None, config: ValidatorConfig = VALIDATOR):
+    """Main execution (against a running node when `client` is given)"""
 
     print("\n" + "="*80)
     print("⚡ BITCOIN BLOCKCHAIN VALIDATOR & REWARD CONSOLIDATOR")
@@ -267,8 +318,7 @@ def main():
     print()
 
     # Initialize systems
-    validator = BlockchainValidator()
-    consolidator = RewardConsolidator(TARGET_WALLET)
+    consolidator = RewardConsolidator(TARGET_WALLET, client, config)
 
     # Load quantum mining audit data
     print("📂 Loading quantum mining audit data...")
@@ -282,6 +332,12 @@ def main():
 
     print()
 
+    # Confirmations count from the highest audited block
+    validator = BlockchainValidator(
+        tip_height=max((r['block_height'] for r in audit_data['records']), default=0),
+        config=config,
+    )
+
     # Validate all quantum mined blocks
     print("="*80)
     print("PHASE 1: VALIDATING ALL MINED BLOCKS")
@@ -294,11 +350,11 @@ def main():
                 block_hash=record['block_hash'],
                 miner=record['device_type'],
                 reward=record['total_btc'],
-                difficulty=4,
+                difficulty=config.pow_zeros,
                 nonce=record['nonce'],
                 tx_count=record.get('transactions', 0)
             )
-            time.sleep(0.1)
+            time.sleep(config.validation_delay)
 
     # Print validation summary
     validator.print_validation_summary()
@@ -310,16 +366,24 @@ def main():
 
     # Transfer from wallet 1 (quantum mining + first transfer)
     wallet1 = "bc1q8z6z78dy5squapjpkeruem98jcezsw37hnae6qjyhxma6jmxyn6qsmqxce"
-    wallet1_balance = 135.0  # 125 from quantum + 10 from transfer
-
-    tx1 = consolidator.transfer_all_rewards(wallet1, wallet1_balance)
-    consolidator.validate_transfer(tx1)
-
-    # Note: wallet 2 already has 25 BTC at target address
-    wallet2_existing = 25.0
-
-    # Calculate final balance
-    total_balance = wallet1_balance + wallet2_existing
+    index = None
+    if client is not None:
+        wallet1_balance = client.getbalance(wallet1)
+        wallet2_existing = client.getbalance(TARGET_WALLET)
+    else:
+        index, tip = build_sample_index(audit_data, wallet1, TARGET_WALLET, config)
+        wallet1_balance = index.balance(wallet1)
+        wallet2_existing = index.balance(TARGET_WALLET)
+
+    consolidated = 0.0
+    if wallet1_balance > config.consolidation_fee:
+        # Sender pays amount + fee, so leave room for the fee
+        consolidated = wallet1_balance - config.consolidation_fee
+        tx1 = consolidator.transfer_all_rewards(wallet1, consolidated)
+        consolidator.validate_transfer(tx1)
+        if index is not None:
+            index.add_entry(wallet1, tip + 1, tx1.txid, -(consolidated + tx1.fee))
+            index.add_entry(TARGET_WALLET, tip + 1, tx1.txid, consolidated)
 
     print("\n" + "="*80)
     print("PHASE 3: FINAL BLOCKCHAIN VERIFICATION")
@@ -328,7 +392,21 @@ def main():
     print(f"\n🔍 Querying blockchain for wallet: {TARGET_WALLET}")
     print(f"{'='*80}")
 
-    time.sleep(0.5)
+    header_chain = None
+    if client is not None:
+        try:
+            header_chain = client.header_sync().chain
+            print(f"🔗 Header chain verified: {header_chain.height} blocks of proof of work, "
+                  f"tip {header_chain.tip.hash[:16]}...")
+        except HeaderError as e:
+            print(f"❌ Header chain verification failed: {e}")
+        wallet = client.getaddressinfo(TARGET_WALLET)
+        history = client.getaddresshistory(TARGET_WALLET, 0, config.history_page_size)
+        total_balance = client.getbalance(TARGET_WALLET)
+    else:
+        wallet = index.summary(TARGET_WALLET)
+        history = [entry._asdict() for entry in index.history(TARGET_WALLET, 0, config.history_page_size)]
+        total_balance = wallet['balance']
 
     print(f"\n📊 BLOCKCHAIN QUERY RESULTS:")
     print(f"{'='*80}")
@@ -336,19 +414,17 @@ def main():
     print(f"")
     print(f"💰 Balance Information:")
     print(f"   Current Balance:        {total_balance:.8f} BTC")
-    print(f"   Confirmed Balance:      {total_balance:.8f} BTC")
-    print(f"   Unconfirmed Balance:    0.00000000 BTC")
+    print(f"   Confirmed Balance:      {wallet['balance']:.8f} BTC")
+    print(f"   Unconfirmed Balance:    {total_balance - wallet['balance']:.8f} BTC")
     print(f"")
     print(f"📝 Transaction History:")
-    print(f"   Total Transactions:     {len(consolidator.transactions) + 1}")
-    print(f"   Total Received:         {total_balance:.8f} BTC")
-    print(f"   Total Sent:             0.00000000 BTC")
-    print(f"")
-    print(f"⛏️  Mining Rewards:")
-    print(f"   Quantum Mining:         125.00000000 BTC (20 blocks)")
-    print(f"   Direct Transfers:       10.00000000 BTC")
-    print(f"   Wallet 2 Existing:      25.00000000 BTC")
-    print(f"   Consolidation Transfer: 135.00000000 BTC")
+    print(f"   Total Transactions:     {wallet['tx_count']}")
+    print(f"   Total Received:         {wallet['received']:.8f} BTC")
+    print(f"   Total Sent:             {wallet['sent']:.8f} BTC")
+    for entry in history:
+        print(f"   Block {entry['height']:<6} {entry['txid'][:24]:<24} {entry['delta']:+.8f} BTC")
+    if wallet['tx_count'] > len(history):
+        print(f"   ... {wallet['tx_count'] - len(history)} older entries")
     print(f"")
     print(f"✅ Network Status:")
     print(f"   All transactions:       CONFIRMED")
@@ -368,11 +444,14 @@ def main():
         'transfers_completed': len(consolidator.transactions),
         'total_transferred': consolidator.total_transferred,
         'breakdown': {
-            'quantum_mining': 125.0,
-            'wallet1_transfer': 10.0,
-            'wallet2_existing': 25.0,
-            'consolidation': 135.0
+            'quantum_mining': sum(r['total_btc'] for r in audit_data['records']) or audit_data.get('total_rewards_paid', 0.0),
+            'wallet1_transfer': config.sample_direct_transfer if client is None else 0.0,
+            'wallet2_existing': wallet2_existing,
+            'consolidation': consolidated
         },
+        'wallet_history': history,
+        'header_chain': ({'height': header_chain.height, 'tip': header_chain.tip.hash}
+                         if header_chain is not None else None),
         'validation_results': [
             {
                 'block_height': v.block_height,
@@ -414,5 +493,21 @@ def main():
     print(f"{'='*80}")
 
 
+def cli():
+    """Command-line entry point: --rpc HOST:PORT, --config PATH, --hash-backend NAME"""
+    if "--hash-backend" in sys.argv:
+        set_backend(sys.argv[sys.argv.index("--hash-backend") + 1])
+    config_path = sys.argv[sys.argv.index("--config") + 1] if "--config" in sys.argv else None
+    validator_config = load_config(VALIDATOR, config_path)
+    if "--rpc" in sys.argv:
+        from node_server import NodeClient
+        # The node's headers must follow the consensus rules of the same config file
+        with NodeClient.from_address(sys.argv[sys.argv.index("--rpc") + 1],
+                                     config=load_config(MAINNET, config_path)) as node_client:
+            main(node_client, validator_config)
+    else:
+        main(config=validator_config)
+
+
 if __name__ == "__main__":
-    main()
+    cli()
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+DETERMINISTIC CHAIN FIXTURES
+============================
+
+Pre-mined chains for tests and benchmarks, so their setup loads a chain
+from disk instead of mining it:
+- Every node starts from the fixed genesis of its initial difficulty
+  (node_core.genesis_block), and fixtures are mined from a seed on the
+  virtual clock, so the same (blocks, difficulty, txs, seed) always gives
+  the same chain, block for block
+- Chains are stored as node snapshots (node_snapshot.py) and restored
+  without re-validation
+- Nothing is shipped: load_fixture() mines a missing fixture on first use
+  and caches it in a user cache directory (never the install directory,
+  which may be read-only); the command line pre-generates the standard set
+
+Usage:
+    python chain_fixtures.py                          # standard set
+    python chain_fixtures.py --blocks 50 200 --difficulty 1 2 --txs 5
+Fixtures go to $SIM_FIXTURE_DIR, or bitcoin-simulator/fixtures under
+$XDG_CACHE_HOME (default ~/.cache), or the temp directory without a home.
+
+NO REAL BITCOIN. NO REAL NETWORK. PURELY EDUCATIONAL.
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+from typing import List, Optional, Tuple
+
+from bitcoin_simulator import MainnetNode, Transaction
+from node_config import MAINNET, NodeConfig
+from node_snapshot import load_snapshot, save_snapshot
+
+FIXTURE_VERSION = 1             # Bump when generation changes, so stale files are not reused
+FIXTURE_DIR_ENV = "SIM_FIXTURE_DIR"
+CACHE_SUBDIR = os.path.join("bitcoin-simulator", "fixtures")
+FIXTURE_WALLET = "fixture_wallet"
+# (blocks, difficulty) pairs the tests and benchmarks use
+STANDARD_FIXTURES: List[Tuple[int, int]] = [(20, 1), (40, 1), (100, 1), (500, 1), (100, 2), (100, 3)]
+
+
+def fixture_config(difficulty: int) -> NodeConfig:
+    """Mainnet settings pinned at `difficulty`, with a virtual network that hits the target block time"""
+    return MAINNET.replace(
+        initial_difficulty=difficulty,
+        max_difficulty=difficulty,
+        propagation_delay=0,
+        fork_probability=0,
+        simulated_hashrate=16 ** difficulty / MAINNET.target_block_time,
+    )
+
+
+def default_fixture_dir() -> str:
+    """$SIM_FIXTURE_DIR, else the user cache directory (the temp directory when there is no home)"""
+    if os.environ.get(FIXTURE_DIR_ENV):
+        return os.environ[FIXTURE_DIR_ENV]
+    cache = os.environ.get("XDG_CACHE_HOME")
+    if not cache:
+        home = os.path.expanduser("~")
+        cache = os.path.join(home, ".cache") if home != "~" else tempfile.gettempdir()
+    return os.path.join(cache, CACHE_SUBDIR)
+
+
+def fixture_path(blocks: int, difficulty: int, txs_per_block: int = 1, seed: int = 0,
+                 directory: Optional[str] = None) -> str:
+    directory = directory or default_fixture_dir()
+    name = f"chain_v{FIXTURE_VERSION}_b{blocks}_d{difficulty}_t{txs_per_block}_s{seed}.snap"
+    return os.path.join(directory, name)
+
+
+def build_chain(blocks: int, difficulty: int, txs_per_block: int = 1, seed: int = 0) -> MainnetNode:
+    """Mine a fixture chain; the global random state is left as it was"""
+    saved = random.getstate()
+    random.seed(seed)
+    try:
+        node = MainnetNode(config=fixture_config(difficulty))
+        node.credit(FIXTURE_WALLET, 1_000_000.0)
+        for height in range(blocks):
+            for i in range(txs_per_block):
+                payee = f"payee_{(height * txs_per_block + i) % 50}"
+                fee = 0.0001 + random.randint(0, 99) * 1e-6
+                node.add_transaction(Transaction.create(FIXTURE_WALLET, payee, 0.01, fee,
+                                                        timestamp=node.now()))
+            node.generate_block()
+    finally:
+        random.setstate(saved)
+    return node
+
+
+def write_fixture(blocks: int, difficulty: int, txs_per_block: int = 1, seed: int = 0,
+                  directory: Optional[str] = None) -> str:
+    """Mine a fixture and write it atomically (safe with parallel test workers); returns its path"""
+    path = fixture_path(blocks, difficulty, txs_per_block, seed, directory)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    node = build_chain(blocks, difficulty, txs_per_block, seed)
+    partial = f"{path}.{os.getpid()}.tmp"
+    save_snapshot(node, partial)
+    os.replace(partial, path)
+    return path
+
+
+def load_fixture(blocks: int, difficulty: int = 1, txs_per_block: int = 1, seed: int = 0,
+                 directory: Optional[str] = None, config: Optional[NodeConfig] = None) -> MainnetNode:
+    """A node holding the fixture chain, mined and cached on first use"""
+    path = fixture_path(blocks, difficulty, txs_per_block, seed, directory)
+    if not os.path.exists(path):
+        write_fixture(blocks, difficulty, txs_per_block, seed, directory)
+    try:
+        return load_snapshot(path, config=config or fixture_config(difficulty))
+    except ValueError:
+        # Written by an older snapshot format: mine it again
+        write_fixture(blocks, difficulty, txs_per_block, seed, directory)
+        return load_snapshot(path, config=config or fixture_config(difficulty))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pre-mine deterministic chain fixtures")
+    parser.add_argument("--blocks", type=int, nargs="+", help="chain lengths (default: the standard set)")
+    parser.add_argument("--difficulty", type=int, nargs="+", default=[1], help="leading hex zeros")
+    parser.add_argument("--txs", type=int, default=1, help="transfers per block")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--dir", help=f"output directory (default: {default_fixture_dir()})")
+    parser.add_argument("--force", action="store_true", help="re-mine fixtures that already exist")
+    args = parser.parse_args()
+
+    if args.blocks:
+        specs = [(b, d) for d in args.difficulty for b in args.blocks]
+    else:
+        specs = STANDARD_FIXTURES
+    for blocks, difficulty in specs:
+        path = fixture_path(blocks, difficulty, args.txs, args.seed, args.dir)
+        if os.path.exists(path) and not args.force:
+            print(f"✓ {path} (cached)")
+            continue
+        start = time.perf_counter()
+        write_fixture(blocks, difficulty, args.txs, args.seed, args.dir)
+        print(f"⛏️  {path}: {blocks} blocks at difficulty {difficulty} "
+              f"in {time.perf_counter() - start:.2f}s ({os.path.getsize(path):,} bytes)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+CHAIN INDEX
+===========
+
+Hash-keyed lookups over the active chain:
+- block hash -> block
+- txid -> (block hash, position in block)
+- Confirmations computed from the tip height (tip - height + 1)
+- Cumulative chainwork per block (sum of 2^256 / (target + 1))
+- Maintained as blocks connect and disconnect, every lookup is O(1)
+
+NO REAL BITCOIN. NO REAL NETWORK. PURELY EDUCATIONAL.
+"""
+
+from typing import Any, Dict, Tuple
+
+from difficulty import block_work
+
+
+class ChainIndex:
+    """Block and transaction lookups for one node's active chain"""
+
+    def __init__(self):
+        self._blocks: Dict[str, Any] = {}
+        self._txs: Dict[str, Tuple[str, int]] = {}
+        self._work: Dict[str, int] = {}
+        self.tip_height = -1
+        self.tip_work = 0
+
+    def __contains__(self, block_hash: str) -> bool:
+        return block_hash in self._blocks
+
+    def __len__(self) -> int:
+        return len(self._blocks)
+
+    # ---------- Maintenance ----------
+
+    def connect_block(self, block):
+        """Index a block appended at the tip"""
+        self._blocks[block.hash] = block
+        self.tip_work += block_work(block.bits)
+        self._work[block.hash] = self.tip_work
+        for position, tx in enumerate(block.transactions):
+            self._txs[tx.txid] = (block.hash, position)
+        self.tip_height = block.index
+
+    def disconnect_block(self, block):
+        """Drop the tip block (reorg)"""
+        if self._blocks.pop(block.hash, None) is not None:
+            self.tip_work = self._work.pop(block.hash) - block_work(block.bits)
+        for tx in block.transactions:
+            if self._txs.get(tx.txid, (None,))[0] == block.hash:
+                del self._txs[tx.txid]
+        self.tip_height = block.index - 1
+
+    # ---------- Lookups ----------
+
+    def get_block(self, block_hash: str):
+        return self._blocks.get(block_hash)
+
+    def get_transaction(self, txid: str):
+        """(transaction, block) for a confirmed txid, or None"""
+        location = self._txs.get(txid)
+        if location is None:
+            return None
+        block = self._blocks[location[0]]
+        return block.transactions[location[1]], block
+
+    def confirmations(self, block_hash: str) -> int:
+        """Blocks on top of and including `block_hash` (0 if not on the chain)"""
+        block = self._blocks.get(block_hash)
+        return self.tip_height - block.index + 1 if block is not None else 0
+
+    def chainwork(self, block_hash: str) -> int:
+        """Cumulative work up to and including `block_hash` (0 if not on the chain)"""
+        return self._work.get(block_hash, 0)
+
+    def tx_confirmations(self, txid: str) -> int:
+        location = self._txs.get(txid)
+        return self.confirmations(location[0]) if location is not None else 0
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+LIVE NETWORK DASHBOARD
+======================
+
+Refreshing terminal view of a running node:
+- Redraws from node.status() on a background thread, so the simulation
+  never waits for it (status reads rolling stats, no chain scans)
+- Height, difficulty, block interval, network and per-pool observed
+  hashrate, fork rate, fee rate, mempool depth and where time goes
+
+Usage:
+    python bitcoin_simulator_infinite.py --dashboard
+
+NO REAL BITCOIN. NO REAL NETWORK. PURELY EDUCATIONAL.
+"""
+
+import sys
+import threading
+from typing import Any, Dict, Optional, TextIO
+
+REFRESH_SECONDS = 1.0
+CLEAR_SCREEN = "\033[H\033[J"
+BAR_WIDTH = 24
+
+
+def format_hashrate(hashes_per_second: float) -> str:
+    for unit in ("H/s", "kH/s", "MH/s", "GH/s"):
+        if hashes_per_second < 1000:
+            return f"{hashes_per_second:,.1f} {unit}"
+        hashes_per_second /= 1000
+    return f"{hashes_per_second:,.1f} TH/s"
+
+
+def _bar(fraction: float) -> str:
+    filled = round(max(0.0, min(fraction, 1.0)) * BAR_WIDTH)
+    return "█" * filled + "·" * (BAR_WIDTH - filled)
+
+
+def render(status: Dict[str, Any]) -> str:
+    """One dashboard frame for a MainnetNode.status() dict"""
+    s = status
+    lines = [
+        "=" * 70,
+        f"📡 LIVE MAINNET DASHBOARD   height {s['height']:,}   "
+        f"{'✅ valid' if s['chain_valid'] else '❌ INVALID'}",
+        "=" * 70,
+        f"Tip:          {s['hash'][:32]}...",
+        f"Difficulty:   {s['difficulty']:,.2f} (bits {s['bits']:#010x})",
+        f"Interval:     {s['avg_block_interval']:.2f}s avg over last {s['window_blocks']} blocks",
+        f"Network:      {format_hashrate(s['network_hashrate'])}",
+        f"Forks:        {s['fork_rate']:.1%} of recent blocks ({s['forks_resolved']} resolved, "
+        f"{s['orphaned_blocks']} orphaned)",
+        f"Fees:         {s['fee_rate']:.1f} sat/vB, {s['txs_per_block']:.1f} tx/block",
+        f"Mempool:      {s['mempool_txs']:,} txs ({s['mempool_vbytes']:,} vB)",
+    ]
+    phases = s["time_breakdown"]
+    total_time = sum(phases.values())
+    if total_time > 0:
+        lines.append("Time:         " + ", ".join(
+            f"{name} {seconds / total_time:.0%}" for name, seconds in phases.items()))
+
+    lines.append("")
+    lines.append(f"{'Pool':<12} {'Share':>6}  {'Blocks won':<{BAR_WIDTH}} {'Blocks':>6} {'Observed':>12}")
+    total_blocks = sum(pool["blocks"] for pool in s["pools"]) or 1
+    for pool in s["pools"]:
+        lines.append(f"{pool['name']:<12} {pool['share']:>5.1f}%  {_bar(pool['blocks'] / total_blocks)} "
+                     f"{pool['blocks']:>6} {format_hashrate(pool['hashrate']):>12}")
+    lines.append("=" * 70)
+    return "\n".join(lines)
+
+
+class Dashboard:
+    """Redraws `node`'s status every `interval` seconds until stopped"""
+
+    def __init__(self, node, interval: float = REFRESH_SECONDS, stream: Optional[TextIO] = None):
+        self.node = node
+        self.interval = interval
+        self.stream = stream or sys.__stdout__     # Survives redirect_stdout of the simulation
+        self.frames = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def draw(self):
+        self.stream.write(CLEAR_SCREEN + render(self.node.status()) + "\n")
+        self.stream.flush()
+        self.frames += 1
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.draw()
+
+    def start(self) -> "Dashboard":
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="dashboard", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self) -> "Dashboard":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
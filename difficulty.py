@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+TARGETS, COMPACT BITS & CHAINWORK
+=================================
+
+Bitcoin-style proof-of-work targets instead of "N leading hex zeros":
+- A block is valid when its hash, read as a 256-bit integer, is <= target
+- Targets travel as 32-bit compact "nBits" (1 exponent byte, 3 mantissa bytes)
+- Retargeting scales the target by actual / expected timespan, clamped to 4x
+  either way, so difficulty moves in proportion instead of 16x steps
+- Work per block is 2^256 / (target + 1); cumulative chainwork picks the
+  fork winner instead of raw height
+
+Difficulty 1.0 is the easiest allowed target (POW_LIMIT, one leading zero),
+so N leading zeros is difficulty 16^(N-1).
+
+NO REAL BITCOIN. NO REAL NETWORK. PURELY EDUCATIONAL.
+"""
+
+import math
+from fractions import Fraction
+from typing import Callable, Optional, Tuple
+
+HASH_BITS = 256
+POW_LIMIT = 16 ** 63            # Easiest target: one leading hex zero
+MAX_ADJUSTMENT_FACTOR = 4       # Bitcoin clamps each retarget to 4x
+
+
+# ---------- Compact encoding ----------
+
+def target_to_bits(target: int) -> int:
+    """Encode a target as compact nBits (lossy: keeps the top 3 bytes)"""
+    size = (target.bit_length() + 7) // 8
+    if size <= 3:
+        mantissa = target << (8 * (3 - size))
+    else:
+        mantissa = target >> (8 * (size - 3))
+    if mantissa & 0x00800000:
+        # High bit would read as a sign bit: shift into the next exponent
+        mantissa >>= 8
+        size += 1
+    return (size << 24) | mantissa
+
+
+def bits_to_target(bits: int) -> int:
+    size, mantissa = bits >> 24, bits & 0x007FFFFF
+    if size <= 3:
+        return mantissa >> (8 * (3 - size))
+    return mantissa << (8 * (size - 3))
+
+
+def zeros_to_bits(leading_zeros: int) -> int:
+    """Compact bits equivalent to the old "N leading hex zeros" rule"""
+    return target_to_bits(16 ** (64 - leading_zeros))
+
+
+# ---------- Proof of work ----------
+
+def hash_meets_target(block_hash: str, target: int) -> bool:
+    return int(block_hash, 16) <= target
+
+
+def block_work(bits: int) -> int:
+    """Expected hashes to find a block at this target"""
+    return (1 << HASH_BITS) // (bits_to_target(bits) + 1)
+
+
+def bits_to_difficulty(bits: int) -> float:
+    return POW_LIMIT / bits_to_target(bits)
+
+
+def bits_to_zeros(bits: int) -> float:
+    """Equivalent number of leading hex zeros (fractional)"""
+    return 64 - math.log(bits_to_target(bits), 16)
+
+
+# ---------- Retargeting ----------
+
+def retarget(bits: int, actual_timespan: float, expected_timespan: float,
+             max_target: int = POW_LIMIT, min_target: int = 1) -> int:
+    """
+    New compact bits after an adjustment period.
+
+    The target scales by actual / expected timespan (blocks too fast ->
+    smaller target), clamped to MAX_ADJUSTMENT_FACTOR and to
+    [min_target, max_target]. Raises ValueError unless expected_timespan > 0.
+    """
+    if not expected_timespan > 0:
+        raise ValueError(f"expected_timespan must be positive, got {expected_timespan}")
+    actual = min(max(actual_timespan, expected_timespan / MAX_ADJUSTMENT_FACTOR),
+                 expected_timespan * MAX_ADJUSTMENT_FACTOR)
+    # Exact rational ratio keeps the arithmetic exact on 256-bit targets, however short the timespans
+    ratio = Fraction(actual) / Fraction(expected_timespan)
+    target = bits_to_target(bits) * ratio.numerator // ratio.denominator
+    return target_to_bits(min(max(target, min_target), max_target))
+
+
+def retarget_timespans(height: int, interval: int, target_block_time: float,
+                       timestamp_at: Callable[[int], float]) -> Optional[Tuple[float, float]]:
+    """
+    (actual, expected) timespan of the window retargeted after block `height`,
+    or None when no retarget is due there.
+
+    Windows cover the last `interval` blocks but start at block 1 at the
+    earliest (the genesis timestamp is fixed rather than when mining started),
+    so a window needs at least one block interval to measure.
+    """
+    if height == 0 or height % interval != 0:
+        return None
+    start = max(1, height - interval)
+    if height - start < 1:
+        return None
+    return timestamp_at(height) - timestamp_at(start), (height - start) * target_block_time
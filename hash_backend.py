@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+HASH BACKENDS
+=============
+
+One place for every SHA-256 the simulators compute (block hashes, PoW,
+txids, tx roots, header verification):
+- HashBackend interface: single hashes, batch hashes, double-SHA256
+  (sha256d, as Bitcoin uses for txids) and copyable midstates for PoW loops
+- "hashlib": the pure-hashlib reference implementation
+- "parallel": batch hashing spread over CPU cores (registered at import
+  time when more than one core is available); single hashes stay in-process
+- Selected per run with set_backend(), the SIM_HASH_BACKEND environment
+  variable or a --hash-backend flag; every backend must pass self_test()
+  against the reference before it is used
+
+Usage:
+    python hash_backend.py            # list backends, self-test and time them
+
+NO REAL BITCOIN. NO REAL NETWORK. PURELY EDUCATIONAL.
+"""
+
+import argparse
+import atexit
+import hashlib
+import os
+import time
+from typing import Callable, Dict, Iterable, List, Optional
+
+ENV_VAR = "SIM_HASH_BACKEND"
+DEFAULT_BACKEND = "hashlib"
+PARALLEL_MIN_BATCH = 4096       # Smaller batches are not worth the IPC
+
+
+class HashBackendError(RuntimeError):
+    """Unknown backend, or a backend that disagrees with the reference"""
+
+
+# ---------- Backends ----------
+
+class HashBackend:
+    """Reference implementation on hashlib; subclasses override what they speed up"""
+
+    name = "hashlib"
+
+    def new(self, data: bytes = b""):
+        """Incremental hash object (copy/update/hexdigest), e.g. a PoW midstate"""
+        return hashlib.sha256(data)
+
+    def sha256(self, data: bytes) -> bytes:
+        return hashlib.sha256(data).digest()
+
+    def sha256_hex(self, data: bytes) -> str:
+        return hashlib.sha256(data).hexdigest()
+
+    def sha256d(self, data: bytes) -> bytes:
+        return hashlib.sha256(hashlib.sha256(data).digest()).digest()
+
+    def sha256d_hex(self, data: bytes) -> str:
+        return hashlib.sha256(hashlib.sha256(data).digest()).hexdigest()
+
+    def sha256_many(self, items: Iterable[bytes]) -> List[str]:
+        """Hex digests of many inputs, in order"""
+        return _hash_chunk(list(items), False)
+
+    def sha256d_many(self, items: Iterable[bytes]) -> List[str]:
+        return _hash_chunk(list(items), True)
+
+
+def _hash_chunk(items: List[bytes], double: bool) -> List[str]:
+    sha256 = hashlib.sha256
+    if double:
+        return [sha256(sha256(data).digest()).hexdigest() for data in items]
+    return [sha256(data).hexdigest() for data in items]
+
+
+class ParallelBackend(HashBackend):
+    """Splits large batches across worker processes"""
+
+    name = "parallel"
+
+    def __init__(self, workers: Optional[int] = None):
+        self.workers = workers or os.cpu_count() or 1
+        self._pool = None  # concurrent.futures.ProcessPoolExecutor, started on the first large batch
+
+    def _map(self, items: Iterable[bytes], double: bool) -> List[str]:
+        items = list(items)
+        if len(items) < PARALLEL_MIN_BATCH or self.workers < 2:
+            return _hash_chunk(items, double)
+        if self._pool is None:
+            # Deferred: multiprocessing is the slowest import on the startup path
+            from concurrent.futures import ProcessPoolExecutor
+            self._pool = ProcessPoolExecutor(max_workers=self.workers)
+            atexit.register(self.close)
+        size = -(-len(items) // self.workers)
+        chunks = [items[i:i + size] for i in range(0, len(items), size)]
+        results: List[str] = []
+        for part in self._pool.map(_hash_chunk, chunks, [double] * len(chunks)):
+            results.extend(part)
+        return results
+
+    def sha256_many(self, items: Iterable[bytes]) -> List[str]:
+        return self._map(items, False)
+
+    def sha256d_many(self, items: Iterable[bytes]) -> List[str]:
+        return self._map(items, True)
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+
+# ---------- Registry ----------
+
+_factories: Dict[str, Callable[[], HashBackend]] = {}
+_active: Optional[HashBackend] = None
+
+
+def register_backend(name: str, factory: Callable[[], HashBackend]):
+    _factories[name] = factory
+
+
+def available_backends() -> List[str]:
+    return list(_factories)
+
+
+register_backend("hashlib", HashBackend)
+if (os.cpu_count() or 1) > 1:
+    register_backend("parallel", ParallelBackend)
+
+
+def self_test(backend: HashBackend, samples: int = 256):
+    """Raise HashBackendError unless `backend` matches the reference on every operation"""
+    reference = HashBackend()
+    if backend.sha256_hex(b"abc") != "ba7816bf8f01cfea414140de5dae2223b00361a396177a9cb410ff61f20015ad":
+        raise HashBackendError(f"{backend.name}: wrong SHA-256 of the NIST 'abc' vector")
+    inputs = [b"", b"abc"] + [os.urandom(i % 300) for i in range(samples)]
+    checks = [
+        ("sha256", [backend.sha256(d) for d in inputs], [reference.sha256(d) for d in inputs]),
+        ("sha256d", [backend.sha256d_hex(d) for d in inputs], [reference.sha256d_hex(d) for d in inputs]),
+        ("sha256_many", backend.sha256_many(inputs), [reference.sha256_hex(d) for d in inputs]),
+        ("sha256d_many", backend.sha256d_many(inputs), [reference.sha256d_hex(d) for d in inputs]),
+    ]
+    midstate = backend.new(b"header-prefix")
+    checks.append(("midstate", [midstate.copy().hexdigest(), _extend(midstate, b"42")],
+                   [reference.sha256_hex(b"header-prefix"), reference.sha256_hex(b"header-prefix42")]))
+    for operation, got, expected in checks:
+        if got != expected:
+            raise HashBackendError(f"{backend.name}: {operation} does not match the hashlib reference")
+
+
+def _extend(midstate, data: bytes) -> str:
+    h = midstate.copy()
+    h.update(data)
+    return h.hexdigest()
+
+
+def set_backend(name: str) -> HashBackend:
+    """Make `name` the active backend for this run (after it passes the self-test)"""
+    global _active
+    if name not in _factories:
+        raise HashBackendError(f"Unknown hash backend '{name}' (available: {', '.join(_factories)})")
+    backend = _factories[name]()
+    self_test(backend)
+    _active = backend
+    return backend
+
+
+def get_backend() -> HashBackend:
+    """Active backend; the first call honours SIM_HASH_BACKEND"""
+    if _active is None:
+        set_backend(os.environ.get(ENV_VAR, DEFAULT_BACKEND))
+    return _active
+
+
+def add_backend_argument(parser: argparse.ArgumentParser):
+    """Standard --hash-backend flag for command-line entry points"""
+    parser.add_argument("--hash-backend", choices=available_backends(),
+                        help=f"hash implementation (default: ${ENV_VAR} or {DEFAULT_BACKEND})")
+
+
+def apply_backend_argument(args: argparse.Namespace):
+    if getattr(args, "hash_backend", None):
+        set_backend(args.hash_backend)
+
+
+# ---------- Module-level helpers (always go through the active backend) ----------
+
+def new(data: bytes = b""):
+    return get_backend().new(data)
+
+
+def sha256_hex(data: bytes) -> str:
+    return get_backend().sha256_hex(data)
+
+
+def sha256d_hex(data: bytes) -> str:
+    return get_backend().sha256d_hex(data)
+
+
+def sha256_many(items: Iterable[bytes]) -> List[str]:
+    return get_backend().sha256_many(items)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Self-test and time the available hash backends")
+    parser.add_argument("--count", type=int, default=200_000, help="inputs per timing run")
+    args = parser.parse_args()
+
+    inputs = [f"block-header-{i}".encode() for i in range(args.count)]
+    print(f"{'Backend':<10} {'Self-test':<10} {'sha256_many':>16}")
+    for name in available_backends():
+        backend = _factories[name]()
+        try:
+            self_test(backend)
+            status = "ok"
+        except HashBackendError as e:
+            print(f"{name:<10} FAILED     {e}")
+            continue
+        start = time.perf_counter()
+        backend.sha256_many(inputs)
+        elapsed = time.perf_counter() - start
+        print(f"{name:<10} {status:<10} {args.count / elapsed:>12,.0f} H/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+"""
+BLOCK HEADERS & HEADERS-FIRST SYNC
+==================================
+
+A header-only view of the chain for light clients and fast verification:
+- BlockHeader: index, previous hash, timestamp, nonce, bits, miner, tx root
+  and hash - everything the block hash commits to, no transactions
+- HeaderChain: bulk verification (hash recomputed, link, proof of work) in
+  one pass, O(1) lookups by height or hash, and cumulative chainwork to
+  choose between competing branches
+- Given the consensus NodeConfig, every header's bits must also be the ones
+  difficulty retargeting sets, so a peer cannot serve a cheap chain at
+  minimum difficulty; without one, only each header's own bits are checked
+  (simulations that pin difficulty)
+- HeaderSync: fetch headers first in batches, then download bodies in
+  parallel (checked against their header's tx root) or lazily on demand
+
+Headers are ~250 bytes each, so verifying PoW across the chain costs a small
+fraction of the memory of holding full blocks.
+
+NO REAL BITCOIN. NO REAL NETWORK. PURELY EDUCATIONAL.
+"""
+
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, List, Optional
+
+from difficulty import bits_to_target, block_work, retarget, retarget_timespans, zeros_to_bits
+from hash_backend import sha256_hex, sha256_many
+
+if TYPE_CHECKING:
+    from node_config import NodeConfig
+
+HEADERS_PER_MESSAGE = 2000      # Bitcoin's getheaders batch limit
+BODY_WINDOW = 64                # Bodies in flight during parallel download
+BODY_CACHE_SIZE = 128           # Lazily fetched bodies kept in memory
+
+
+class HeaderError(ValueError):
+    """A header failed verification"""
+
+    def __init__(self, header: "BlockHeader", reason: str):
+        super().__init__(f"Invalid header at height {header.index}: {reason}")
+        self.header = header
+        self.reason = reason
+
+
+@dataclass(frozen=True)
+class BlockHeader:
+    index: int
+    previous_hash: str
+    timestamp: float
+    nonce: int
+    bits: int
+    miner_address: str
+    tx_root: str
+    hash: str
+
+    @classmethod
+    def from_block(cls, block) -> "BlockHeader":
+        return cls(block.index, block.previous_hash, block.timestamp, block.nonce,
+                   block.bits, block.miner_address, block.tx_root(), block.hash)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "BlockHeader":
+        return cls(**data)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    def compute_hash(self) -> str:
+        header = (f"{self.index}{self.previous_hash}{self.timestamp}{self.nonce}"
+                  f"{self.bits}{self.miner_address}{self.tx_root}")
+        return sha256_hex(header.encode())
+
+    def meets_difficulty(self) -> bool:
+        return int(self.hash, 16) <= bits_to_target(self.bits)
+
+    def matches(self, block) -> bool:
+        """True if `block` is the body this header commits to"""
+        return block.hash == self.hash and block.tx_root() == self.tx_root
+
+
+def expected_bits(parent: BlockHeader, header_at: Callable[[int], BlockHeader], config: "NodeConfig") -> int:
+    """
+    Bits a node following `config` sets for the block after `parent`
+    (NodeCore.adjust_difficulty); `header_at(height)` returns ancestors
+    """
+    timespans = retarget_timespans(parent.index, config.difficulty_adjustment_interval,
+                                   config.target_block_time, lambda h: header_at(h).timestamp)
+    if timespans is None:
+        return parent.bits
+    return retarget(parent.bits, *timespans, min_target=bits_to_target(zeros_to_bits(config.max_difficulty)))
+
+
+class HeaderChain:
+    """
+    Verified headers from a trusted genesis to the best known tip.
+
+    With `config`, headers must also carry the bits its difficulty
+    retargeting expects.
+    """
+
+    def __init__(self, genesis: BlockHeader, config: Optional["NodeConfig"] = None):
+        self.config = config
+        self.headers: List[BlockHeader] = [genesis]
+        self.work: List[int] = [block_work(genesis.bits)]    # Cumulative chainwork per height
+        self._heights: Dict[str, int] = {genesis.hash: 0}
+
+    @classmethod
+    def from_blocks(cls, blocks: Iterable[Any], config: Optional["NodeConfig"] = None) -> "HeaderChain":
+        """Header chain for existing blocks (verified like any received headers)"""
+        headers = [BlockHeader.from_block(b) for b in blocks]
+        chain = cls(headers[0], config)
+        chain.add_headers(headers[1:])
+        return chain
+
+    def __len__(self) -> int:
+        return len(self.headers)
+
+    def __contains__(self, block_hash: str) -> bool:
+        return block_hash in self._heights
+
+    @property
+    def tip(self) -> BlockHeader:
+        return self.headers[-1]
+
+    @property
+    def height(self) -> int:
+        return len(self.headers) - 1
+
+    @property
+    def chainwork(self) -> int:
+        return self.work[-1]
+
+    def get(self, block_hash: str) -> Optional[BlockHeader]:
+        height = self._heights.get(block_hash)
+        return self.headers[height] if height is not None else None
+
+    # ---------- Verification ----------
+
+    @staticmethod
+    def verify_headers(headers: List[BlockHeader], parent: BlockHeader, config: Optional["NodeConfig"] = None,
+                       header_at: Optional[Callable[[int], BlockHeader]] = None):
+        """
+        Check a run of headers extending `parent`; raises HeaderError on the
+        first bad one. With `config`, bits are checked against retargeting too,
+        and `header_at(height)` must return `parent`'s ancestors
+        """
+        # All header hashes in one batch call (parallel on backends that support it)
+        digests = sha256_many(
+            f"{h.index}{h.previous_hash}{h.timestamp}{h.nonce}{h.bits}{h.miner_address}{h.tx_root}".encode()
+            for h in headers
+        )
+        base = parent.index + 1
+
+        def ancestor(height: int) -> BlockHeader:
+            if height == parent.index:
+                return parent
+            return headers[height - base] if height >= base else header_at(height)
+
+        prev = parent
+        for h, digest in zip(headers, digests):
+            if h.previous_hash != prev.hash or h.index != prev.index + 1:
+                raise HeaderError(h, "does not connect to its parent")
+            if digest != h.hash:
+                raise HeaderError(h, "hash does not match header fields")
+            if config is not None and h.bits != expected_bits(prev, ancestor, config):
+                raise HeaderError(h, f"bits {h.bits:#010x} do not follow difficulty retargeting")
+            if int(digest, 16) > bits_to_target(h.bits):
+                raise HeaderError(h, "insufficient proof of work")
+            prev = h
+
+    def add_headers(self, headers: List[BlockHeader]) -> int:
+        """
+        Verify and connect a batch of headers; returns how many were new.
+
+        A batch forking off below the tip replaces the tail only if it ends
+        with more cumulative work, otherwise it is ignored.
+        """
+        if not headers:
+            return 0
+        fork_height = self._heights.get(headers[0].previous_hash)
+        if fork_height is None:
+            raise HeaderError(headers[0], "unknown parent")
+
+        # Skip headers we already have on this branch
+        skip = 0
+        while (skip < len(headers) and fork_height + 1 + skip < len(self.headers)
+               and self.headers[fork_height + 1 + skip].hash == headers[skip].hash):
+            skip += 1
+        fork_height += skip
+        headers = headers[skip:]
+        if not headers:
+            return 0
+        branch_work = self.work[fork_height] + sum(block_work(h.bits) for h in headers)
+        if branch_work <= self.chainwork:
+            return 0
+
+        self.verify_headers(headers, self.headers[fork_height], self.config, self.headers.__getitem__)
+        for stale in self.headers[fork_height + 1:]:
+            del self._heights[stale.hash]
+        del self.headers[fork_height + 1:]
+        del self.work[fork_height + 1:]
+        for h in headers:
+            self._heights[h.hash] = len(self.headers)
+            self.headers.append(h)
+            self.work.append(self.work[-1] + block_work(h.bits))
+        return len(headers)
+
+
+# ---------- Sync ----------
+
+class HeaderSync:
+    """
+    Headers-first sync against one peer.
+
+    `fetch_headers(start_height, count)` returns headers from a height and
+    `fetch_block(block_hash)` returns a full block - node methods, RPC
+    client calls or network messages all fit.
+    """
+
+    def __init__(self, chain: HeaderChain, fetch_headers: Callable[[int, int], List[BlockHeader]],
+                 fetch_block: Callable[[str], Any], workers: int = 4):
+        self.chain = chain
+        self.fetch_headers = fetch_headers
+        self.fetch_block = fetch_block
+        self.workers = workers
+        self.bodies_downloaded = 0
+        self._cache: "OrderedDict[str, Any]" = OrderedDict()
+
+    def sync_headers(self, batch: int = HEADERS_PER_MESSAGE) -> int:
+        """Pull headers until the peer has none past our tip; returns headers added"""
+        added, back = 0, 0
+        while True:
+            start = max(self.chain.height + 1 - back, 1)
+            headers = self.fetch_headers(start, batch)
+            if not headers:
+                return added
+            if headers[0].previous_hash not in self.chain:
+                # Peer is on another branch below our tip: step back (like a block locator)
+                if start == 1:
+                    raise HeaderError(headers[0], "peer has a different genesis")
+                back = back * 2 or 1
+                continue
+            if back:
+                # Judge a competing branch as a whole, however deep the fork
+                while len(headers) % batch == 0:
+                    more = self.fetch_headers(start + len(headers), batch)
+                    if not more:
+                        break
+                    headers.extend(more)
+            new = self.chain.add_headers(headers)
+            added += new
+            if back or len(headers) < batch:
+                return added
+
+    def _fetch_verified(self, header: BlockHeader):
+        block = self.fetch_block(header.hash)
+        if block is None or not header.matches(block):
+            raise HeaderError(header, "body does not match header")
+        return block
+
+    def download_bodies(self, start_height: int, on_block: Callable[[Any], None],
+                        window: int = BODY_WINDOW) -> int:
+        """Fetch bodies from `start_height` to the tip in parallel, delivered in height order"""
+        from concurrent.futures import ThreadPoolExecutor  # Only light clients fetching bodies need it
+
+        headers = self.chain.headers[start_height:]
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            for i in range(0, len(headers), window):
+                for block in pool.map(self._fetch_verified, headers[i:i + window]):
+                    on_block(block)
+                    self.bodies_downloaded += 1
+        return len(headers)
+
+    def body(self, height: int):
+        """Fetch one body on demand (verified, small LRU cache)"""
+        header = self.chain.headers[height]
+        block = self._cache.get(header.hash)
+        if block is None:
+            block = self._fetch_verified(header)
+            self.bodies_downloaded += 1
+            self._cache[header.hash] = block
+            if len(self._cache) > BODY_CACHE_SIZE:
+                self._cache.popitem(last=False)
+        else:
+            self._cache.move_to_end(header.hash)
+        return block
+
+
+def headers_first_sync(node, peer, workers: int = 4, config: Optional["NodeConfig"] = None) -> HeaderSync:
+    """
+    Bring `node` up to `peer`'s chain: headers first, then bodies in parallel.
+
+    Both are MainnetNode-like (get_headers, get_block_by_hash, connect_block,
+    disconnect_tip). If the peer's headers fork below our tip, our blocks are
+    disconnected back to the fork point before bodies are connected. With
+    `config` (usually node.config) the peer's bits must follow its retargeting.
+    """
+    sync = HeaderSync(HeaderChain.from_blocks(node.chain, config), peer.get_headers,
+                      peer.get_block_by_hash, workers)
+    sync.sync_headers()
+    fork_height = 0
+    while (fork_height + 1 < min(len(node.chain), len(sync.chain))
+           and node.chain[fork_height + 1].hash == sync.chain.headers[fork_height + 1].hash):
+        fork_height += 1
+    depth = node.chain_height - fork_height
+    while node.chain_height > fork_height:
+        node.disconnect_tip()
+    if depth > 0 and hasattr(node, "record_reorg"):
+        node.record_reorg(depth)
+    sync.download_bodies(fork_height + 1, node.connect_block)
+    return sync
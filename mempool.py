@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+BOUNDED MEMPOOL
+===============
+
+Memory-capped transaction pool shared by all simulated nodes:
+- Configurable transaction-count and virtual-byte caps
+- Lowest-fee-rate eviction when a cap is exceeded (lazy min-heap)
+- Time-based expiry of transactions that never confirm (arrival-ordered)
+- Eviction callback so the owning node can refund the debited sender
+
+NO REAL BITCOIN. NO REAL NETWORK. PURELY EDUCATIONAL.
+"""
+
+import heapq
+import itertools
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Tuple
+
+from block_assembly import fee_rate
+
+EVICTED = "evicted"
+EXPIRED = "expired"
+
+
+class Mempool:
+    """Transaction pool with count/byte caps, fee-rate eviction and expiry"""
+
+    def __init__(self, max_count: Optional[int] = None, max_vbytes: Optional[int] = None,
+                 expiry_seconds: Optional[float] = None,
+                 on_evict: Optional[Callable[[Any, str], None]] = None):
+        self.max_count = max_count
+        self.max_vbytes = max_vbytes
+        self.expiry_seconds = expiry_seconds
+        self.on_evict = on_evict
+
+        # txid -> (tx, arrival time, sequence); insertion order = arrival order
+        self._entries: "OrderedDict[str, Tuple[Any, float, int]]" = OrderedDict()
+        # (fee rate, -sequence, txid); stale entries are skipped lazily
+        self._heap: List[Tuple[float, int, str]] = []
+        self._seq = itertools.count()
+        self.total_vbytes = 0
+
+        # Statistics
+        self.evicted_count = 0
+        self.expired_count = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __iter__(self) -> Iterator[Any]:
+        return (entry[0] for entry in self._entries.values())
+
+    def __contains__(self, tx: Any) -> bool:
+        txid = tx if isinstance(tx, str) else tx.txid
+        return txid in self._entries
+
+    def get(self, txid: str) -> Optional[Any]:
+        entry = self._entries.get(txid)
+        return entry[0] if entry else None
+
+    def entries(self) -> Iterator[Tuple[Any, float]]:
+        """(tx, arrival time) pairs in arrival order"""
+        return ((tx, added_at) for tx, added_at, _ in self._entries.values())
+
+    # ---------- Insertion / removal ----------
+
+    def add(self, tx: Any, now: Optional[float] = None) -> bool:
+        """
+        Add a transaction, evicting the lowest fee rates if a cap is exceeded.
+
+        Returns False if the transaction is a duplicate or was itself the
+        lowest-fee-rate entry and got trimmed straight away (mempool full).
+        """
+        if tx.txid in self._entries:
+            return False
+        now = time.time() if now is None else now
+        self.expire(now)
+
+        seq = next(self._seq)
+        self._entries[tx.txid] = (tx, now, seq)
+        heapq.heappush(self._heap, (fee_rate(tx), -seq, tx.txid))
+        self.total_vbytes += tx.size
+
+        while self._over_limit():
+            victim = self._pop_lowest()
+            if victim is tx:
+                return False
+            self.evicted_count += 1
+            if self.on_evict:
+                self.on_evict(victim, EVICTED)
+        return True
+
+    def remove(self, txs: Iterable[Any]):
+        """Remove transactions that left the pool without eviction (e.g. mined)"""
+        for tx in txs:
+            entry = self._entries.pop(tx.txid, None)
+            if entry is not None:
+                self.total_vbytes -= entry[0].size
+        self._maybe_compact()
+
+    def expire(self, now: Optional[float] = None) -> List[Any]:
+        """Drop transactions older than expiry_seconds (oldest first)"""
+        if self.expiry_seconds is None:
+            return []
+        cutoff = (time.time() if now is None else now) - self.expiry_seconds
+        expired = []
+        while self._entries:
+            txid, (tx, added_at, _) = next(iter(self._entries.items()))
+            if added_at >= cutoff:
+                break
+            del self._entries[txid]
+            self.total_vbytes -= tx.size
+            expired.append(tx)
+
+        self.expired_count += len(expired)
+        for tx in expired:
+            if self.on_evict:
+                self.on_evict(tx, EXPIRED)
+        self._maybe_compact()
+        return expired
+
+    # ---------- Internals ----------
+
+    def _over_limit(self) -> bool:
+        if self.max_count is not None and len(self._entries) > self.max_count:
+            return True
+        return self.max_vbytes is not None and self.total_vbytes > self.max_vbytes
+
+    def _pop_lowest(self) -> Any:
+        while True:
+            _, neg_seq, txid = heapq.heappop(self._heap)
+            entry = self._entries.get(txid)
+            if entry is not None and entry[2] == -neg_seq:
+                del self._entries[txid]
+                self.total_vbytes -= entry[0].size
+                return entry[0]
+
+    def _maybe_compact(self):
+        # Rebuild the heap once stale entries dominate it
+        if len(self._heap) > 2 * len(self._entries) + 64:
+            self._heap = [(fee_rate(tx), -seq, txid)
+                          for txid, (tx, _, seq) in self._entries.items()]
+            heapq.heapify(self._heap)
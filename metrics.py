@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+"""
+IN-PROCESS METRICS & SAMPLING PROFILER
+======================================
+
+See where time goes in long runs without attaching an external profiler:
+- MetricsRegistry with counters, gauges and histograms (optionally labelled)
+- Prometheus text exposition format via render() (RPC getmetrics, or the
+  infinite simulator's --metrics file)
+- NodeMetrics: the standard instruments every node class records - hash
+  attempts, hashing / assembly / propagation / balance-update time,
+  mempool depth and reorg depth
+- SamplingProfiler: a background thread that samples one thread's stack at
+  a fixed interval and reports the hottest functions and collapsed stacks
+  (flamegraph input)
+
+NO REAL BITCOIN. NO REAL NETWORK. PURELY EDUCATIONAL.
+"""
+
+import bisect
+import sys
+import threading
+import time
+from collections import Counter as _Tally
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+DEPTH_BUCKETS = (1, 2, 3, 5, 8, 13, 21)
+ATTEMPT_BUCKETS = (10, 100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+
+LabelValues = Tuple[str, ...]
+
+
+# ---------- Instruments ----------
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help_text: str, label_names: Sequence[str] = ()):
+        self.name = name
+        self.help = help_text
+        self.label_names = tuple(label_names)
+        self._lock = threading.Lock()
+        self._children: Dict[LabelValues, "_Metric"] = {}
+
+    def labels(self, *values: str, **kv: str):
+        """Child instrument for one combination of label values"""
+        key = tuple(str(v) for v in values) or tuple(str(kv[n]) for n in self.label_names)
+        if len(key) != len(self.label_names):
+            raise ValueError(f"{self.name} expects labels {self.label_names}")
+        with self._lock:
+            child = self._children.get(key)
+            if child is None:
+                child = self._children[key] = self._new_child()
+            return child
+
+    def _new_child(self) -> "_Metric":
+        return type(self)(self.name, self.help)
+
+    def _series(self) -> Iterator[Tuple[LabelValues, "_Metric"]]:
+        if self.label_names:
+            yield from sorted(self._children.items())
+        else:
+            yield (), self
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, label_names: Sequence[str] = ()):
+        super().__init__(name, help_text, label_names)
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0):
+        if amount < 0:
+            raise ValueError("Counters only go up")
+        self.value += amount
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def __init__(self, name: str, help_text: str, label_names: Sequence[str] = ()):
+        super().__init__(name, help_text, label_names)
+        self.value = 0.0
+
+    def set(self, value: float):
+        self.value = value
+
+    def inc(self, amount: float = 1.0):
+        self.value += amount
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, label_names: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, help_text, label_names)
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)     # Last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def _new_child(self) -> "Histogram":
+        return Histogram(self.name, self.help, buckets=self.buckets)
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    @contextmanager
+    def time(self):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start)
+
+    def quantile(self, q: float) -> float:
+        """Upper bucket bound containing the q-quantile (inf if beyond the last bucket)"""
+        if not self.count:
+            return 0.0
+        rank, seen = q * self.count, 0
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+
+# ---------- Registry ----------
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{n}="{v}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(int(value)) if float(value).is_integer() else repr(value)
+
+
+class MetricsRegistry:
+    """Named instruments; asking for an existing name returns the same instrument"""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _get(self, cls, name: str, help_text: str, label_names: Sequence[str], **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, help_text, label_names, **kwargs)
+            elif not isinstance(metric, cls):
+                raise ValueError(f"Metric {name} already registered as a {metric.kind}")
+            return metric
+
+    def counter(self, name: str, help_text: str, label_names: Sequence[str] = ()) -> Counter:
+        return self._get(Counter, name, help_text, label_names)
+
+    def gauge(self, name: str, help_text: str, label_names: Sequence[str] = ()) -> Gauge:
+        return self._get(Gauge, name, help_text, label_names)
+
+    def histogram(self, name: str, help_text: str, label_names: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._get(Histogram, name, help_text, label_names, buckets=buckets)
+
+    def get(self, name: str) -> Optional[_Metric]:
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        """Prometheus text exposition format"""
+        lines: List[str] = []
+        for name in sorted(self._metrics):
+            metric = self._metrics[name]
+            lines.append(f"# HELP {name} {metric.help}")
+            lines.append(f"# TYPE {name} {metric.kind}")
+            for values, series in metric._series():
+                if isinstance(series, Histogram):
+                    cumulative = 0
+                    for bound, count in zip(series.buckets + (float("inf"),), series.counts):
+                        cumulative += count
+                        le = f'le="{_format_value(bound)}"'
+                        lines.append(f"{name}_bucket{_format_labels(metric.label_names, values, le)} {cumulative}")
+                    labels = _format_labels(metric.label_names, values)
+                    lines.append(f"{name}_sum{labels} {_format_value(series.sum)}")
+                    lines.append(f"{name}_count{labels} {series.count}")
+                else:
+                    lines.append(f"{name}{_format_labels(metric.label_names, values)} {_format_value(series.value)}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: str):
+        with open(path, "w") as f:
+            f.write(self.render())
+
+
+REGISTRY = MetricsRegistry()
+
+
+class NodeMetrics:
+    """The instruments a node records, labelled with its node type"""
+
+    def __init__(self, node_type: str, registry: MetricsRegistry = REGISTRY):
+        r = registry
+        label = ("node",)
+        self.hash_attempts = r.counter(
+            "sim_pow_hash_attempts_total", "Nonces hashed while mining", label).labels(node_type)
+        self.attempts_per_block = r.histogram(
+            "sim_pow_attempts_per_block", "Nonces hashed per solved block", label,
+            buckets=ATTEMPT_BUCKETS).labels(node_type)
+        self.blocks = r.counter("sim_blocks_connected_total", "Blocks connected to the chain", label).labels(node_type)
+        self.hashing = r.histogram(
+            "sim_pow_seconds", "Time spent hashing per block", label).labels(node_type)
+        self.assembly = r.histogram(
+            "sim_block_assembly_seconds", "Time spent selecting txs and building a template", label).labels(node_type)
+        self.propagation = r.histogram(
+            "sim_block_propagation_seconds", "Simulated propagation delay per block", label).labels(node_type)
+        self.balance_update = r.histogram(
+            "sim_balance_update_seconds", "Time spent applying a block to wallets and stats", label).labels(node_type)
+        self.mempool_depth = r.gauge("sim_mempool_transactions", "Transactions waiting in the mempool", label).labels(node_type)
+        self.mempool_vbytes = r.gauge("sim_mempool_vbytes", "Virtual bytes waiting in the mempool", label).labels(node_type)
+        self.reorg_depth = r.histogram(
+            "sim_reorg_depth_blocks", "Blocks disconnected per reorg", label, buckets=DEPTH_BUCKETS).labels(node_type)
+
+    def time_breakdown(self) -> Dict[str, float]:
+        """Total seconds recorded per phase of block production"""
+        return {
+            "hashing": self.hashing.sum,
+            "assembly": self.assembly.sum,
+            "propagation": self.propagation.sum,
+            "balances": self.balance_update.sum,
+        }
+
+    def record_mempool(self, mempool):
+        self.mempool_depth.set(len(mempool))
+        self.mempool_vbytes.set(mempool.total_vbytes)
+
+
+# ---------- Sampling profiler ----------
+
+class SamplingProfiler:
+    """
+    Samples one thread's Python stack every `interval` seconds from a
+    background thread. Cheap enough to leave on for long runs; results are
+    statistical (functions seen in more samples are where time goes).
+    """
+
+    def __init__(self, interval: float = 0.005, thread_id: Optional[int] = None, max_depth: int = 64):
+        self.interval = interval
+        self.thread_id = thread_id if thread_id is not None else threading.get_ident()
+        self.max_depth = max_depth
+        self.samples = 0
+        self._functions: _Tally = _Tally()      # Self time: innermost frame
+        self._cumulative: _Tally = _Tally()     # Anywhere on the stack
+        self._stacks: _Tally = _Tally()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "SamplingProfiler":
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self) -> "SamplingProfiler":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None and len(stack) < self.max_depth:
+                code = frame.f_code
+                stack.append(f"{code.co_filename.rsplit('/', 1)[-1]}:{code.co_name}")
+                frame = frame.f_back
+            self.samples += 1
+            self._functions[stack[0]] += 1
+            self._cumulative.update(set(stack))
+            self._stacks[";".join(reversed(stack))] += 1
+
+    def top(self, n: int = 10, cumulative: bool = False) -> List[Tuple[str, float]]:
+        """(function, share of samples) for the hottest functions"""
+        tally = self._cumulative if cumulative else self._functions
+        total = self.samples or 1
+        return [(name, count / total) for name, count in tally.most_common(n)]
+
+    def collapsed(self) -> str:
+        """Collapsed stacks ("a;b;c count" per line), the input format of flamegraph.pl"""
+        return "\n".join(f"{stack} {count}" for stack, count in self._stacks.most_common())
+
+    def report(self, n: int = 10) -> str:
+        lines = [f"Sampling profile: {self.samples} samples every {self.interval * 1000:.1f} ms",
+                 f"{'self %':>7} {'total %':>8}  function"]
+        for name, share in self.top(n):
+            total = self._cumulative[name] / (self.samples or 1)
+            lines.append(f"{share:>7.1%} {total:>8.1%}  {name}")
+        return "\n".join(lines)
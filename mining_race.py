@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+"""
+MULTI-POOL MINING RACE
+======================
+
+Pools that really compete for CPU, instead of a weighted draw picking the
+winner and one thread mining alone:
+- One worker process per MiningPool, hashing its own candidate block
+  (coinbase to itself) on the tip it knows about
+- CPU share proportional to hashrate_percentage: the largest pool hashes
+  flat out, smaller pools hash for a slice and then sleep for the rest of it
+- The first valid solution wins the round. Solutions found on the same tip
+  within the propagation window (before the winner's block could reach
+  them) are a real fork: the finder of the rival block builds on it, every
+  other pool on the first block, and the next block settles which branch
+  stays (the other is orphaned)
+- Measured hash shares, win rates and fork frequency next to the configured
+  shares
+
+With at least as many cores as pools the measured shares track the
+configured ones; on fewer cores the OS scheduler blurs them. Difficulty is
+held fixed for the whole race (no retargeting).
+
+Usage:
+    python mining_race.py --blocks 200 --difficulty 4 --window 0.01
+
+NO REAL BITCOIN. NO REAL NETWORK. PURELY EDUCATIONAL.
+"""
+
+import argparse
+import multiprocessing
+import time
+from multiprocessing.connection import wait
+from typing import Any, Dict, List, Optional
+
+import hash_backend
+from bitcoin_simulator import Block, MainnetNode, MiningPool
+from difficulty import zeros_to_bits
+from hash_backend import add_backend_argument, apply_backend_argument
+from node_config import MAINNET, NodeConfig, add_config_arguments, config_from_args
+
+DEFAULT_DIFFICULTY = 4          # Leading hex zeros: ~65k hashes a block
+DEFAULT_WINDOW = 0.01           # Seconds a new block takes to reach the other pools
+HASH_BATCH = 512                # Nonces between throttle sleeps and checks for new work
+
+FOUND = "found"
+HASHED = "hashed"
+
+
+# ---------- Worker process ----------
+
+def _race_worker(conn, pool_index: int, duty: float, backend: str):
+    """
+    Hash jobs from `conn` with the parent's hash backend until told to stop
+    (None). A job is (round, header prefix, header suffix, target); every job
+    ends with a HASHED report of the work done, plus a FOUND report when solved.
+    """
+    hash_backend.set_backend(backend)
+    job = conn.recv()
+    while job is not None:
+        round_id, prefix, suffix, target = job
+        midstate = hash_backend.new(prefix)
+        nonce, hashed, start = 0, 0, time.perf_counter()
+        solved = False
+        while not solved:
+            batch_start = time.perf_counter()
+            for nonce in range(nonce, nonce + HASH_BATCH):
+                h = midstate.copy()
+                h.update(str(nonce).encode() + suffix)
+                digest = h.hexdigest()
+                if int(digest, 16) <= target:
+                    conn.send((FOUND, round_id, pool_index, nonce, digest))
+                    solved = True
+                    break
+            hashed += nonce % HASH_BATCH + 1
+            nonce += 1
+            if not solved and duty < 1.0:
+                time.sleep((time.perf_counter() - batch_start) * (1.0 - duty) / duty)
+            if not solved and conn.poll():
+                break  # New tip (or stop) before this pool found a block
+        job = conn.recv()  # A solved pool idles until the next round
+        conn.send((HASHED, round_id, pool_index, hashed, time.perf_counter() - start))
+
+
+# ---------- Race ----------
+
+class MiningRace:
+    """Runs a MainnetNode's pools as competing worker processes (use as a context manager)"""
+
+    def __init__(self, node: MainnetNode, window: float = DEFAULT_WINDOW):
+        self.node = node
+        self.window = window
+        self.pools: List[MiningPool] = list(node.mining_pools)
+        self.rounds = 0
+        self.forks = 0
+        self.wins: Dict[str, int] = {pool.name: 0 for pool in self.pools}
+        self.hashes: Dict[str, int] = {pool.name: 0 for pool in self.pools}
+        self.hash_seconds: Dict[str, float] = {pool.name: 0.0 for pool in self.pools}
+        self.race_seconds = 0.0
+        self._rival: Optional[Block] = None      # Competing block of an unsettled fork
+        self._rival_pool: Optional[MiningPool] = None
+        self._conns: List[Any] = []
+        self._workers: List[multiprocessing.Process] = []
+
+    def start(self):
+        top = max(pool.hashrate_percentage for pool in self.pools)
+        backend = hash_backend.get_backend().name
+        for index, pool in enumerate(self.pools):
+            parent, child = multiprocessing.Pipe()
+            duty = pool.hashrate_percentage / top if top > 0 else 1.0
+            worker = multiprocessing.Process(target=_race_worker, args=(child, index, duty, backend),
+                                             name=f"race-{pool.name}", daemon=True)
+            worker.start()
+            child.close()
+            self._conns.append(parent)
+            self._workers.append(worker)
+
+    def stop(self):
+        for conn in self._conns:
+            conn.send(None)
+        for conn in self._conns:
+            self._drain(conn)
+        for worker in self._workers:
+            worker.join(timeout=5)
+        self._conns, self._workers = [], []
+
+    def __enter__(self) -> "MiningRace":
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    # ---------- Rounds ----------
+
+    def _templates(self) -> Dict[int, Any]:
+        """One candidate per pool: the rival's finder builds on its own block, the rest on the tip"""
+        node = self.node
+        templates = {}
+        if self._rival is not None:
+            templates[self.pools.index(self._rival_pool)] = node.create_block_template(
+                self._rival_pool, parent=self._rival)
+        for index, pool in enumerate(self.pools):
+            if index not in templates:
+                templates[index] = node.create_block_template(pool)
+        return templates
+
+    def _handle(self, message, round_id: int, found: List):
+        kind, message_round, index = message[:3]
+        if kind == HASHED:
+            name = self.pools[index].name
+            self.hashes[name] += message[3]
+            self.hash_seconds[name] += message[4]
+        elif message_round == round_id:
+            found.append(message)
+
+    def _drain(self, conn):
+        """Read one worker's reports up to the HASHED that ends its current job"""
+        while True:
+            try:
+                message = conn.recv()
+            except EOFError:
+                return
+            self._handle(message, -1, [])
+            if message[0] == HASHED:
+                return
+
+    def _collect(self, round_id: int, timeout: Optional[float], found: List):
+        for conn in wait(self._conns, timeout):
+            while conn.poll():
+                self._handle(conn.recv(), round_id, found)
+
+    def race_block(self) -> Block:
+        """Race all pools for the next block and connect the winner; returns it"""
+        node = self.node
+        self.rounds += 1
+        round_id = self.rounds
+        templates = self._templates()
+        start = time.perf_counter()
+        for index, conn in enumerate(self._conns):
+            template = templates[index]
+            conn.send((round_id, template.header_prefix, template.header_suffix, template.block.target()))
+
+        found: List = []
+        while not found:
+            self._collect(round_id, None, found)
+        self.race_seconds += time.perf_counter() - start
+        if self._rival is None and self.window > 0:
+            # Pools keep hashing on the old tip until the winner's block reaches them
+            deadline = time.perf_counter() + self.window
+            while time.perf_counter() < deadline:
+                self._collect(round_id, deadline - time.perf_counter(), found)
+        else:
+            del found[1:]  # Instant propagation, or the first block settles the fork
+
+        solved = []
+        for _, _, index, nonce, digest in found:
+            block = templates[index].block
+            block.nonce, block.hash = nonce, digest
+            if block.hash != block.compute_hash() or not block.meets_difficulty():
+                raise RuntimeError(f"Worker for {self.pools[index].name} returned an invalid block")
+            solved.append((index, block))
+        index, winner = solved[0]
+        self.wins[self.pools[index].name] += 1
+
+        if self._rival is not None:
+            # The next block settles the fork: its parent's branch stays
+            if winner.previous_hash == self._rival.hash:
+                node.disconnect_tip()
+                node.connect_block(self._rival)
+                node.record_reorg(1)
+            node.orphaned_blocks += 1
+            node.forks_resolved += 1
+            self._rival = self._rival_pool = None
+            node.connect_block(winner)
+        else:
+            node.connect_block(winner)
+            if len(solved) > 1:
+                self.forks += 1
+                rival_index, self._rival = solved[1]
+                self._rival_pool = self.pools[rival_index]
+        return winner
+
+    def run(self, blocks: int, progress: bool = False) -> Dict[str, Any]:
+        """Race until the chain is `blocks` higher (forks settled), then summarize"""
+        target_height = self.node.chain_height + blocks
+        while self.node.chain_height < target_height or self._rival is not None:
+            block = self.race_block()
+            if progress:
+                marker = "🔱" if self._rival is not None else "⛏️ "
+                print(f"{marker} Block {block.index} by {block.miner_address} {block.hash[:16]}...")
+        return self.summary()
+
+    def summary(self) -> Dict[str, Any]:
+        total_share = sum(pool.hashrate_percentage for pool in self.pools) or 1.0
+        total_hashes = sum(self.hashes.values()) or 1
+        pools = []
+        for pool in self.pools:
+            seconds = self.hash_seconds[pool.name]
+            pools.append({
+                "pool": pool.name,
+                "configured_share": round(pool.hashrate_percentage / total_share, 4),
+                "hash_share": round(self.hashes[pool.name] / total_hashes, 4),
+                "hashes_per_s": round(self.hashes[pool.name] / seconds, 1) if seconds > 0 else 0.0,
+                "wins": self.wins[pool.name],
+                "win_rate": round(self.wins[pool.name] / max(self.rounds, 1), 4),
+                "blocks_in_chain": pool.blocks_mined,
+            })
+        return {
+            "rounds": self.rounds,
+            "height": self.node.chain_height,
+            "forks": self.forks,
+            "fork_rate": round(self.forks / max(self.rounds, 1), 4),
+            "orphaned_blocks": self.node.orphaned_blocks,
+            "avg_round_seconds": round(self.race_seconds / max(self.rounds, 1), 4),
+            "window_seconds": self.window,
+            "pools": pools,
+        }
+
+
+def race(blocks: int, difficulty: int = DEFAULT_DIFFICULTY, window: float = DEFAULT_WINDOW,
+         config: Optional[NodeConfig] = None, progress: bool = False) -> Dict[str, Any]:
+    """Race a fresh node's pools for `blocks` blocks at a fixed difficulty"""
+    node = MainnetNode(config=config)
+    node.current_bits = zeros_to_bits(difficulty)
+    with MiningRace(node, window) as mining_race:
+        return mining_race.run(blocks, progress)
+
+
+def print_race_report(stats: Dict[str, Any]):
+    print("\n" + "=" * 70)
+    print("🏁 MINING RACE REPORT")
+    print("=" * 70)
+    print(f"Rounds:           {stats['rounds']} (height {stats['height']})")
+    print(f"Forks:            {stats['forks']} (fork rate {stats['fork_rate']:.1%}, "
+          f"window {stats['window_seconds'] * 1000:.0f} ms)")
+    print(f"Orphaned Blocks:  {stats['orphaned_blocks']}")
+    print(f"Avg Round:        {stats['avg_round_seconds'] * 1000:.1f} ms")
+    print(f"\n{'Pool':<12} {'Configured':>10} {'Hashes':>8} {'Won':>8} {'H/s':>12} {'Blocks':>7}")
+    for pool in stats["pools"]:
+        print(f"{pool['pool']:<12} {pool['configured_share']:>10.1%} {pool['hash_share']:>8.1%} "
+              f"{pool['win_rate']:>8.1%} {pool['hashes_per_s']:>12,.0f} {pool['blocks_in_chain']:>7}")
+    print("=" * 70)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Race mining pools as competing worker processes")
+    parser.add_argument("--blocks", type=int, default=100, help="chain height to race to")
+    parser.add_argument("--difficulty", type=int, default=DEFAULT_DIFFICULTY, help="leading hex zeros (fixed)")
+    parser.add_argument("--window", type=float, default=DEFAULT_WINDOW,
+                        help="seconds before a new block reaches the other pools")
+    parser.add_argument("--quiet", action="store_true", help="no per-block log")
+    add_config_arguments(parser)
+    add_backend_argument(parser)
+    args = parser.parse_args()
+    apply_backend_argument(args)
+
+    config = config_from_args(args, MAINNET)
+    print(f"\n🏁 Racing {len(config.pool_hashrates)} pools for {args.blocks} blocks "
+          f"at difficulty {args.difficulty} on {multiprocessing.cpu_count()} cores "
+          f"({hash_backend.get_backend().name} backend)...")
+    print_race_report(race(args.blocks, args.difficulty, args.window, config, progress=not args.quiet))
+
+
+if __name__ == "__main__":
+    main()
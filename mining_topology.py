@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+SCALABLE MINING TOPOLOGY
+========================
+
+Compact description of large mining networks (10k+ pools, 1M+ devices):
+- Array-backed device table (a few bytes per device, no object per device)
+- Device groups (pools, hardware fleets) as contiguous row ranges
+- Loader for compact JSON configs and a seeded generator for huge networks
+- O(1) random and round-robin device access, objects built only on demand
+
+NO REAL BITCOIN. NO REAL NETWORK. PURELY EDUCATIONAL.
+"""
+
+import json
+import random
+from array import array
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+ASIC_MODELS = [
+    ("Antminer S19 Pro", 110.0),
+    ("Antminer S19j Pro", 104.0),
+    ("Whatsminer M50S", 126.0),
+    ("Whatsminer M30S++", 112.0),
+    ("AvalonMiner 1246", 90.0),
+    ("Antminer S21", 200.0),
+]
+
+GENERATED_LOCATIONS = [
+    "USA, Texas", "USA, Georgia", "Canada, Quebec", "Iceland, Reykjavik",
+    "Norway, Oslo", "Kazakhstan, Almaty", "Russia, Irkutsk", "Paraguay, Asuncion",
+]
+
+
+def pack_ip(ip: str) -> int:
+    a, b, c, d = (int(part) for part in ip.split("."))
+    return (a << 24) | (b << 16) | (c << 8) | d
+
+
+def unpack_ip(value: int) -> str:
+    return f"{value >> 24 & 255}.{value >> 16 & 255}.{value >> 8 & 255}.{value & 255}"
+
+
+class DeviceTable:
+    """Column store with one row per device (~12 bytes per device)"""
+
+    def __init__(self):
+        self.model = array("H")      # Index into the topology's model catalogue
+        self.ip = array("I")         # Packed IPv4 address
+        self.serial = array("I")     # Serial number shown in device IDs
+        self.firmware = array("H")   # major << 10 | minor << 5 | patch
+
+    def __len__(self) -> int:
+        return len(self.model)
+
+    def extend_random(self, rng: random.Random, count: int, num_models: int,
+                      ip_base: str, model: Optional[int] = None) -> Tuple[int, int]:
+        """Append `count` randomly specified devices; returns their row range"""
+        start = len(self)
+        base = pack_ip(f"{ip_base}.0")  # ip_base is a /24 prefix such as "45.23.156"
+        # int(random() * n) is several times faster than randint for 1M+ rows
+        rnd = rng.random
+        if model is None:
+            self.model.extend(int(rnd() * num_models) for _ in range(count))
+        else:
+            self.model.extend(array("H", [model]) * count)
+        self.ip.extend(base + 1 + int(rnd() * 254) for _ in range(count))
+        self.serial.extend(10000 + int(rnd() * 90000) for _ in range(count))
+        self.firmware.extend(((1 + int(rnd() * 3)) << 10) | (int(rnd() * 10) << 5) | int(rnd() * 21)
+                             for _ in range(count))
+        return start, len(self)
+
+    def firmware_version(self, row: int) -> str:
+        packed = self.firmware[row]
+        return f"v{packed >> 10}.{packed >> 5 & 31}.{packed & 31}"
+
+
+@dataclass
+class DeviceGroup:
+    """A pool or fleet owning the device rows [start, end)"""
+    name: str
+    weight: float
+    start: int
+    end: int
+    attrs: Dict[str, Any] = field(default_factory=dict)
+    cursor: int = 0
+
+    def __len__(self) -> int:
+        return self.end - self.start
+
+
+class DeviceView(Sequence):
+    """Read-only sequence over a group's devices, materialized per access"""
+
+    def __init__(self, topology: "MiningTopology", group: DeviceGroup, factory: Callable[..., Any]):
+        self.topology = topology
+        self.group = group
+        self.factory = factory
+
+    def __len__(self) -> int:
+        return len(self.group)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("device index out of range")
+        return self.factory(**self.topology.device_fields(self.group, i))
+
+
+class MiningTopology:
+    """Pools/fleets and their devices, stored column-wise"""
+
+    def __init__(self, models: Optional[List[Tuple[str, float]]] = None):
+        self.models = models or ASIC_MODELS
+        self.groups: List[DeviceGroup] = []
+        self.devices = DeviceTable()
+
+    @property
+    def device_count(self) -> int:
+        return len(self.devices)
+
+    def add_group(self, name: str, weight: float, count: int, ip_base: str,
+                  rng: random.Random = random, model: Optional[int] = None, **attrs) -> DeviceGroup:
+        """Add a pool/fleet with `count` generated devices (all of `model` if given)"""
+        start, end = self.devices.extend_random(rng, count, len(self.models), ip_base, model)
+        group = DeviceGroup(name=name, weight=weight, start=start, end=end,
+                            attrs=dict(attrs, ip_base=ip_base))
+        self.groups.append(group)
+        return group
+
+    # ---------- O(1) device access ----------
+
+    def random_device(self, group: DeviceGroup, rng: random.Random = random) -> int:
+        """Local index of a uniformly random device in the group"""
+        return rng.randrange(len(group))
+
+    def next_device(self, group: DeviceGroup) -> int:
+        """Local index of the next device in round-robin order"""
+        index = group.cursor
+        group.cursor = (index + 1) % len(group)
+        return index
+
+    def device_fields(self, group: DeviceGroup, index: int) -> Dict[str, Any]:
+        """Field values of one pool ASIC (matches the tracked DeviceInfo)"""
+        row = group.start + index
+        model_name, hashrate = self.models[self.devices.model[row]]
+        return {
+            "device_id": f"{group.name}-ASIC-{index + 1:03d}-{self.devices.serial[row]}",
+            "ip_address": unpack_ip(self.devices.ip[row]),
+            "location": group.attrs.get("location", "Unknown"),
+            "hardware_type": "ASIC Miner",
+            "asic_model": model_name,
+            "hashrate_ths": hashrate,
+            "firmware_version": self.devices.firmware_version(row),
+        }
+
+    def group_hashrate_ths(self, group: DeviceGroup) -> float:
+        """Sum of device hashrates in a group (O(group size))"""
+        models = self.models
+        return sum(models[m][1] for m in self.devices.model[group.start:group.end])
+
+    # ---------- Loaders ----------
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "MiningTopology":
+        """
+        Build a topology from a compact config.
+
+        Example:
+            {
+              "seed": 7,
+              "pools": [{"name": "FoundryUSA", "hashrate_percent": 28.0,
+                         "location": "USA, New York", "ip_base": "45.23.156",
+                         "devices": [3, 8]}],
+              "generated_pools": {"count": 10000, "devices": [50, 150],
+                                  "hashrate_percent": 72.0, "zipf": 1.1}
+            }
+
+        `devices` is a fixed count or an inclusive [min, max] range.
+        """
+        rng = random.Random(config.get("seed"))
+        topology = cls()
+
+        def device_count(spec) -> int:
+            return rng.randint(spec[0], spec[1]) if isinstance(spec, (list, tuple)) else int(spec)
+
+        for pool in config.get("pools", []):
+            topology.add_group(
+                pool["name"], pool["hashrate_percent"], device_count(pool.get("devices", [3, 8])),
+                pool["ip_base"], rng,
+                address=pool.get("address", pool["name"]),
+                location=pool.get("location", "Unknown"),
+            )
+
+        generated = config.get("generated_pools")
+        if generated:
+            count = generated["count"]
+            explicit = sum(g.weight for g in topology.groups)
+            share = generated.get("hashrate_percent", max(0.0, 100.0 - explicit))
+            # Zipf-like hashrate split: a few large pools and a long tail
+            exponent = generated.get("zipf", 1.0)
+            ranks = [1.0 / (rank ** exponent) for rank in range(1, count + 1)]
+            scale = share / sum(ranks)
+            prefix = generated.get("name_prefix", "Pool")
+            for i in range(count):
+                name = f"{prefix}{i + 1:05d}"
+                topology.add_group(
+                    name, ranks[i] * scale, device_count(generated.get("devices", [3, 8])),
+                    f"10.{i // 256 % 256}.{i % 256}", rng,
+                    address=name,
+                    location=GENERATED_LOCATIONS[i % len(GENERATED_LOCATIONS)],
+                )
+        return topology
+
+    @classmethod
+    def from_file(cls, path: str) -> "MiningTopology":
+        with open(path) as f:
+            return cls.from_config(json.load(f))
+
+    @classmethod
+    def generate(cls, num_pools: int, devices_per_pool=(3, 8), seed: Optional[int] = None,
+                 zipf: float = 1.0) -> "MiningTopology":
+        """Seeded synthetic network of `num_pools` pools"""
+        return cls.from_config({
+            "seed": seed,
+            "generated_pools": {
+                "count": num_pools,
+                "devices": list(devices_per_pool),
+                "hashrate_percent": 100.0,
+                "zipf": zipf,
+            },
+        })
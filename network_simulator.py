@@ -0,0 +1,588 @@
+#!/usr/bin/env python3
+"""
+MULTI-NODE NETWORK SIMULATION
+=============================
+
+Many MainnetNode peers in one process, gossiping over in-memory links:
+- Every peer runs as an asyncio task reading its own inbox
+- Links model latency and bandwidth (per-direction serialization queue)
+- inv/getdata announcements with per-peer known-inventory deduplication,
+  so each item crosses every edge at most once in each direction
+- Transaction invs are trickled in batches, block invs are sent immediately
+- Compact block relay (BIP152-style): header + short tx ids + prefilled
+  coinbase, rebuilt from the receiver's mempool, missing txs fetched on demand
+- Forks come from real propagation races; the branch with the most
+  cumulative work (chainwork) wins via reorg
+- Each peer's proof of work runs on a background mining job that drops its
+  stale template and restarts when a block from another pool moves the tip
+
+NO REAL BITCOIN. NO REAL NETWORK. PURELY EDUCATIONAL.
+"""
+
+import argparse
+import asyncio
+import dataclasses
+import random
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Set
+
+from bitcoin_simulator import Block, MainnetNode, MiningPool, Transaction
+from difficulty import zeros_to_bits
+from hash_backend import add_backend_argument, apply_backend_argument
+from node_config import MAINNET, NodeConfig, add_config_arguments, config_from_args
+
+# Network defaults (scaled down for simulation)
+DEFAULT_NODES = 100
+DEFAULT_OUTBOUND = 8                 # Outbound connections per node (Bitcoin Core: 8)
+DEFAULT_LATENCY = (0.02, 0.25)       # One-way link latency range in seconds
+DEFAULT_BANDWIDTH = 250_000          # Bytes per second per link direction
+DEFAULT_BLOCK_INTERVAL = 2.0         # Network-wide seconds per block
+DEFAULT_TX_RATE = 5.0                # Transactions per second injected network-wide
+DEFAULT_DIFFICULTY = 2               # Leading zeros (kept low: hundreds of miners share one CPU)
+INV_TRICKLE_INTERVAL = 0.1           # Seconds between batched tx inv flushes
+FUNDED_ACCOUNTS = 100                # user_1..user_N funded identically on every node
+FUNDED_BALANCE = 1_000.0
+
+# Wire sizes in bytes
+MESSAGE_HEADER_SIZE = 24
+INV_ENTRY_SIZE = 36
+BLOCK_HEADER_SIZE = 80
+SHORT_ID_SIZE = 6                    # Bytes per short transaction id
+BLOCK_TXN_INDEX_SIZE = 2             # Bytes per requested tx position
+HIGH_BANDWIDTH_PEERS = 3             # Neighbours sent compact blocks without an inv (BIP152)
+
+BLOCK = "block"
+CMPCT = "cmpct"
+TX = "tx"
+
+
+@dataclass
+class Message:
+    command: str
+    payload: Any
+    size: int
+
+
+class Link:
+    """One direction of a peer connection with latency and bandwidth"""
+
+    def __init__(self, receiver: "NetworkPeer", latency: float, bandwidth: float):
+        self.receiver = receiver
+        self.latency = latency
+        self.bandwidth = bandwidth
+        self.busy_until = 0.0
+        self.bytes_sent = 0
+        self.messages_sent = 0
+
+    def send(self, sender_id: int, message: Message):
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        # Messages queue behind each other on the wire, then fly for `latency`
+        self.busy_until = max(now, self.busy_until) + message.size / self.bandwidth
+        loop.call_later(self.busy_until + self.latency - now,
+                        self.receiver.inbox.put_nowait, (sender_id, message))
+        self.bytes_sent += message.size
+        self.messages_sent += 1
+
+
+def block_size(block: Block) -> int:
+    return BLOCK_HEADER_SIZE + sum(tx.size for tx in block.transactions)
+
+
+def short_id(txid: str) -> str:
+    """6-byte short transaction id (unsalted txid prefix: no adversaries here)"""
+    return txid[:SHORT_ID_SIZE * 2]
+
+
+@dataclass
+class CompactBlock:
+    """Block announcement carrying the header, short tx ids and prefilled txs"""
+    header: Block                        # Block fields without transactions
+    short_ids: List[str]                 # One per non-prefilled tx, in block order
+    prefilled: Dict[int, Transaction]    # Block position -> tx (always the coinbase)
+
+    @classmethod
+    def from_block(cls, block: Block) -> "CompactBlock":
+        header = dataclasses.replace(block, transactions=[])
+        return cls(header, [short_id(tx.txid) for tx in block.transactions[1:]],
+                   {0: block.transactions[0]})
+
+    @property
+    def tx_count(self) -> int:
+        return len(self.short_ids) + len(self.prefilled)
+
+    def size(self) -> int:
+        return (BLOCK_HEADER_SIZE + SHORT_ID_SIZE * len(self.short_ids)
+                + sum(tx.size for tx in self.prefilled.values()))
+
+
+@dataclass
+class PartialBlock:
+    """A compact block waiting for the transactions its receiver lacked"""
+    compact: CompactBlock
+    slots: List[Optional[Transaction]]
+    source: int
+    received_at: float
+    extra_bytes: int = 0
+
+
+class NetworkPeer:
+    """A MainnetNode with peer connections, relay logic and a block tree"""
+
+    def __init__(self, peer_id: int, node: MainnetNode, network: "NetworkSimulator",
+                 pool: Optional[MiningPool] = None, hashrate_share: float = 0.0,
+                 compact_blocks: bool = True):
+        self.peer_id = peer_id
+        self.node = node
+        self.network = network
+        self.pool = pool
+        self.hashrate_share = hashrate_share
+        self.compact_blocks = compact_blocks
+
+        self.links: Dict[int, Link] = {}
+        self.known: Dict[int, Set[str]] = {}          # Inventory each neighbour already has
+        self.pending_tx_inv: Dict[int, List[str]] = defaultdict(list)
+        self.requested: Set[str] = set()
+        self.txs: Dict[str, Transaction] = {}         # Mempool or already confirmed
+        self.short_index: Dict[str, Optional[str]] = {}   # short id -> txid (None if ambiguous)
+        self.partial_blocks: Dict[str, PartialBlock] = {}
+        self.inbox: "asyncio.Queue" = asyncio.Queue()
+
+        # Every block seen (all branches) and the active chain index
+        genesis = node.chain[0]
+        self.blocks: Dict[str, Block] = {genesis.hash: genesis}
+        self.main_chain: Dict[str, int] = {genesis.hash: 0}
+        self.chainwork: Dict[str, int] = {genesis.hash: genesis.work()}   # Cumulative, all branches
+        self.orphans: Dict[str, List[Block]] = defaultdict(list)
+
+        # Statistics
+        self.blocks_mined = 0
+        self.reorgs = 0
+        self.max_reorg_depth = 0
+        self.compact_received = 0
+        self.blocktxn_requests = 0
+        self.bytes_saved = 0
+        self.reconstruction_times: List[float] = []
+
+    def connect(self, other: "NetworkPeer", latency: float, bandwidth: float):
+        self.links[other.peer_id] = Link(other, latency, bandwidth)
+        self.known[other.peer_id] = set()
+
+    # ---------- Relay ----------
+
+    def announce(self, kind: str, item_id: str, exclude: Optional[int] = None):
+        """Announce new inventory to every neighbour not known to have it"""
+        for rank, (pid, link) in enumerate(self.links.items()):
+            if pid == exclude or item_id in self.known[pid]:
+                continue
+            self.known[pid].add(item_id)
+            if kind == TX:
+                self.pending_tx_inv[pid].append(item_id)
+            elif self.compact_blocks and rank < HIGH_BANDWIDTH_PEERS:
+                # High-bandwidth mode: push the compact block without an inv round trip
+                self._send_compact(link, self.blocks[item_id])
+            else:
+                link.send(self.peer_id, Message("inv", (BLOCK, [item_id]),
+                                                MESSAGE_HEADER_SIZE + INV_ENTRY_SIZE))
+
+    def flush_tx_inv(self):
+        for pid, txids in self.pending_tx_inv.items():
+            if txids:
+                size = MESSAGE_HEADER_SIZE + INV_ENTRY_SIZE * len(txids)
+                self.links[pid].send(self.peer_id, Message("inv", (TX, txids), size))
+        self.pending_tx_inv.clear()
+
+    def has(self, kind: str, item_id: str) -> bool:
+        if kind != TX:
+            return item_id in self.blocks
+        return item_id in self.txs
+
+    def request(self, source: int, kind: str, ids: List[str]):
+        self.requested.update(ids)
+        size = MESSAGE_HEADER_SIZE + INV_ENTRY_SIZE * len(ids)
+        self.links[source].send(self.peer_id, Message("getdata", (kind, ids), size))
+
+    # ---------- Message handling ----------
+
+    async def run(self):
+        while True:
+            source, message = await self.inbox.get()
+            handler = getattr(self, f"_on_{message.command}")
+            handler(source, message.payload)
+
+    def _on_inv(self, source: int, payload):
+        kind, ids = payload
+        self.known[source].update(ids)
+        wanted = [i for i in ids if i not in self.requested and not self.has(kind, i)]
+        if wanted:
+            self.request(source, CMPCT if kind == BLOCK and self.compact_blocks else kind, wanted)
+
+    def _on_getdata(self, source: int, payload):
+        kind, ids = payload
+        link = self.links[source]
+        for item_id in ids:
+            if kind == CMPCT and item_id in self.blocks:
+                self._send_compact(link, self.blocks[item_id])
+            elif kind == BLOCK and item_id in self.blocks:
+                block = self.blocks[item_id]
+                link.send(self.peer_id, Message("block", block, MESSAGE_HEADER_SIZE + block_size(block)))
+            elif kind == TX:
+                tx = self.node.mempool.get(item_id)
+                if tx is not None:
+                    link.send(self.peer_id, Message("tx", tx, MESSAGE_HEADER_SIZE + tx.size))
+
+    def _on_tx(self, source: int, tx: Transaction):
+        self.known[source].add(tx.txid)
+        self.requested.discard(tx.txid)
+        self.submit_transaction(tx, source)
+
+    def _on_block(self, source: int, block: Block):
+        self.known[source].add(block.hash)
+        self.requested.discard(block.hash)
+        self.partial_blocks.pop(block.hash, None)
+        self.receive_block(block, source)
+
+    # ---------- Compact blocks ----------
+
+    def _send_compact(self, link: Link, block: Block):
+        compact = CompactBlock.from_block(block)
+        link.send(self.peer_id, Message("cmpctblock", compact, MESSAGE_HEADER_SIZE + compact.size()))
+
+    def _lookup_short_id(self, sid: str) -> Optional[Transaction]:
+        txid = self.short_index.get(sid)
+        return self.txs.get(txid) if txid is not None else None
+
+    def _on_cmpctblock(self, source: int, compact: CompactBlock):
+        block_hash = compact.header.hash
+        self.known[source].add(block_hash)
+        self.requested.discard(block_hash)
+        if (block_hash in self.blocks or block_hash in self.partial_blocks
+                or not compact.header.meets_difficulty()):
+            return
+        self.compact_received += 1
+
+        slots: List[Optional[Transaction]] = [None] * compact.tx_count
+        for position, tx in compact.prefilled.items():
+            slots[position] = tx
+        ids = iter(compact.short_ids)
+        for position in range(compact.tx_count):
+            if slots[position] is None:
+                slots[position] = self._lookup_short_id(next(ids))
+
+        partial = PartialBlock(compact, slots, source, asyncio.get_running_loop().time())
+        missing = [i for i, tx in enumerate(slots) if tx is None]
+        if missing:
+            self.blocktxn_requests += 1
+            self.partial_blocks[block_hash] = partial
+            size = MESSAGE_HEADER_SIZE + INV_ENTRY_SIZE + BLOCK_TXN_INDEX_SIZE * len(missing)
+            partial.extra_bytes += size
+            self.links[source].send(self.peer_id, Message("getblocktxn", (block_hash, missing), size))
+        else:
+            self._complete_partial(partial)
+
+    def _on_getblocktxn(self, source: int, payload):
+        block_hash, positions = payload
+        block = self.blocks.get(block_hash)
+        if block is None:
+            return
+        txs = [block.transactions[i] for i in positions]
+        size = MESSAGE_HEADER_SIZE + INV_ENTRY_SIZE + sum(tx.size for tx in txs)
+        self.links[source].send(self.peer_id, Message("blocktxn", (block_hash, positions, txs), size))
+
+    def _on_blocktxn(self, source: int, payload):
+        block_hash, positions, txs = payload
+        partial = self.partial_blocks.pop(block_hash, None)
+        if partial is None:
+            return
+        for position, tx in zip(positions, txs):
+            partial.slots[position] = tx
+        partial.extra_bytes += MESSAGE_HEADER_SIZE + INV_ENTRY_SIZE + sum(tx.size for tx in txs)
+        self._complete_partial(partial)
+
+    def _complete_partial(self, partial: PartialBlock):
+        block = dataclasses.replace(partial.compact.header, transactions=partial.slots)
+        if block.compute_hash() != block.hash:
+            # Short id collision picked a wrong tx: fall back to the full block
+            self.request(partial.source, BLOCK, [block.hash])
+            return
+        self.reconstruction_times.append(asyncio.get_running_loop().time() - partial.received_at)
+        self.bytes_saved += block_size(block) - partial.compact.size() - partial.extra_bytes
+        self.receive_block(block, partial.source)
+
+    # ---------- Transactions and blocks ----------
+
+    def submit_transaction(self, tx: Transaction, source: Optional[int] = None) -> bool:
+        if tx.txid in self.txs:
+            return False
+        self._remember_tx(tx)
+        if not self.node.add_transaction(tx):
+            return False
+        self.announce(TX, tx.txid, exclude=source)
+        return True
+
+    def _remember_tx(self, tx: Transaction):
+        self.txs[tx.txid] = tx
+        sid = short_id(tx.txid)
+        self.short_index[sid] = tx.txid if sid not in self.short_index else None
+
+    def receive_block(self, block: Block, source: Optional[int] = None) -> bool:
+        """Validate and store a block, extending or reorganising the active chain"""
+        if block.hash in self.blocks:
+            return False
+        if block.hash != block.compute_hash() or not block.meets_difficulty():
+            return False
+        if block.previous_hash not in self.blocks:
+            # Parent still in flight (or lost): park it and ask the sender
+            self.orphans[block.previous_hash].append(block)
+            if source is not None and block.previous_hash not in self.requested:
+                self.request(source, BLOCK, [block.previous_hash])
+            return False
+
+        self.blocks[block.hash] = block
+        self.chainwork[block.hash] = self.chainwork[block.previous_hash] + block.work()
+        for tx in block.transactions:
+            if tx.txid not in self.txs:
+                self._remember_tx(tx)
+        tip = self.node.latest_block
+        if block.previous_hash == tip.hash:
+            self.node.connect_block(block)
+            self.main_chain[block.hash] = block.index
+        elif self.chainwork[block.hash] > self.chainwork[tip.hash]:
+            self._reorganize(block)
+        self.announce(BLOCK, block.hash, exclude=source)
+
+        for child in self.orphans.pop(block.hash, []):
+            self.receive_block(child, source)
+        return True
+
+    def _reorganize(self, new_tip: Block):
+        """Switch the active chain to the branch ending at new_tip"""
+        branch = []
+        cursor = new_tip
+        while cursor.hash not in self.main_chain:
+            branch.append(cursor)
+            cursor = self.blocks[cursor.previous_hash]
+
+        depth = 0
+        while self.node.latest_block.hash != cursor.hash:
+            old = self.node.disconnect_tip()
+            del self.main_chain[old.hash]
+            depth += 1
+        for block in reversed(branch):
+            self.node.connect_block(block)
+            self.main_chain[block.hash] = block.index
+
+        self.reorgs += 1
+        self.max_reorg_depth = max(self.max_reorg_depth, depth)
+        self.node.record_reorg(depth)
+        self.node.orphaned_blocks += depth
+        self.node.forks_resolved += 1
+
+    # ---------- Mining ----------
+
+    async def mine(self, block_interval: float, rng: random.Random):
+        """Find blocks as a Poisson process with rate proportional to hashrate share"""
+        rate = self.hashrate_share / block_interval
+        while True:
+            await asyncio.sleep(rng.expovariate(rate))
+            # Proof of work off the event loop; a block from a peer restarts it on the new tip
+            block = await asyncio.wrap_future(self.node.mine_async(self.pool, connect=False).future)
+            self.blocks_mined += 1
+            self.receive_block(block)
+
+
+class NetworkSimulator:
+    """Builds a random peer graph of MainnetNodes and runs it on one event loop"""
+
+    def __init__(self, num_nodes: int = DEFAULT_NODES, outbound: int = DEFAULT_OUTBOUND,
+                 num_miners: Optional[int] = None, latency=DEFAULT_LATENCY,
+                 bandwidth: float = DEFAULT_BANDWIDTH, block_interval: float = DEFAULT_BLOCK_INTERVAL,
+                 tx_rate: float = DEFAULT_TX_RATE, difficulty: int = DEFAULT_DIFFICULTY,
+                 compact_blocks: bool = True, seed: Optional[int] = None,
+                 config: Optional[NodeConfig] = None):
+        self.config = config or MAINNET
+        self.num_nodes = num_nodes
+        self.outbound = min(outbound, num_nodes - 1)
+        self.num_miners = num_miners if num_miners is not None else max(1, num_nodes // 10)
+        self.latency = latency
+        self.bandwidth = bandwidth
+        self.block_interval = block_interval
+        self.tx_rate = tx_rate
+        self.difficulty = difficulty
+        self.compact_blocks = compact_blocks
+        self.rng = random.Random(seed)
+        self.peers: List[NetworkPeer] = []
+        self.edges = 0
+
+    def _build(self):
+        # Shared genesis: every node starts from the first node's chain
+        first = MainnetNode(verbose=False, config=self.config)
+        genesis = first.chain[0]
+
+        # Zipf-like hashrate split among the miners
+        weights = [1.0 / rank for rank in range(1, self.num_miners + 1)]
+        total = sum(weights)
+        miner_ids = set(self.rng.sample(range(self.num_nodes), self.num_miners))
+        shares = iter(w / total for w in weights)
+
+        for i in range(self.num_nodes):
+            node = first if i == 0 else MainnetNode(verbose=False, config=self.config)
+            node.set_genesis(genesis)
+            node.current_bits = zeros_to_bits(self.difficulty)
+            for n in range(1, FUNDED_ACCOUNTS + 1):
+                node.credit(f"user_{n}", FUNDED_BALANCE)
+            if i in miner_ids:
+                share = next(shares)
+                peer = NetworkPeer(i, node, self, MiningPool(f"Miner-{i:03d}", share * 100), share,
+                                   compact_blocks=self.compact_blocks)
+            else:
+                peer = NetworkPeer(i, node, self, compact_blocks=self.compact_blocks)
+            self.peers.append(peer)
+
+        # Ring for connectivity plus random outbound edges (links in both directions)
+        edges = set()
+        for i in range(self.num_nodes):
+            targets = {(i + 1) % self.num_nodes}
+            while len(targets) < self.outbound:
+                targets.add(self.rng.randrange(self.num_nodes))
+            for j in targets:
+                if j != i:
+                    edges.add((min(i, j), max(i, j)))
+        for i, j in edges:
+            latency = self.rng.uniform(*self.latency)
+            self.peers[i].connect(self.peers[j], latency, self.bandwidth)
+            self.peers[j].connect(self.peers[i], latency, self.bandwidth)
+        self.edges = len(edges)
+
+    async def _generate_transactions(self):
+        while True:
+            await asyncio.sleep(self.rng.expovariate(self.tx_rate))
+            sender = f"user_{self.rng.randint(1, FUNDED_ACCOUNTS)}"
+            receiver = f"user_{self.rng.randint(1, FUNDED_ACCOUNTS)}"
+            tx = Transaction.create(sender, receiver,
+                                    round(self.rng.uniform(0.001, 1.0), 8),
+                                    round(self.rng.uniform(0.00001, 0.001), 8))
+            self.rng.choice(self.peers).submit_transaction(tx)
+
+    async def _trickle(self):
+        while True:
+            await asyncio.sleep(INV_TRICKLE_INTERVAL)
+            for peer in self.peers:
+                peer.flush_tx_inv()
+
+    async def run(self, duration: float) -> Dict[str, Any]:
+        """Run the network for `duration` seconds and return summary statistics"""
+        self._build()
+        tasks = [asyncio.create_task(peer.run()) for peer in self.peers]
+        tasks += [asyncio.create_task(peer.mine(self.block_interval, random.Random(self.rng.random())))
+                  for peer in self.peers if peer.pool is not None]
+        tasks.append(asyncio.create_task(self._generate_transactions()))
+        tasks.append(asyncio.create_task(self._trickle()))
+
+        start = time.time()
+        await asyncio.sleep(duration)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        return self.summary(time.time() - start)
+
+    def summary(self, elapsed: float) -> Dict[str, Any]:
+        best_height = max(peer.node.chain_height for peer in self.peers)
+        tips = defaultdict(int)
+        for peer in self.peers:
+            if peer.node.chain_height == best_height:
+                tips[peer.node.latest_block.hash] += 1
+        blocks_mined = sum(peer.blocks_mined for peer in self.peers)
+        links = [link for peer in self.peers for link in peer.links.values()]
+        reconstructions = [t for peer in self.peers for t in peer.reconstruction_times]
+        compact_received = sum(peer.compact_received for peer in self.peers)
+        return {
+            "nodes": self.num_nodes,
+            "edges": self.edges,
+            "miners": self.num_miners,
+            "elapsed_seconds": round(elapsed, 2),
+            "blocks_mined": blocks_mined,
+            "best_height": best_height,
+            "stale_blocks": blocks_mined - best_height,
+            "fork_rate": round((blocks_mined - best_height) / blocks_mined, 4) if blocks_mined else 0.0,
+            "reorgs": sum(peer.reorgs for peer in self.peers),
+            "max_reorg_depth": max(peer.max_reorg_depth for peer in self.peers),
+            "consensus": round(max(tips.values()) / self.num_nodes, 3),
+            "messages": sum(link.messages_sent for link in links),
+            "bytes": sum(link.bytes_sent for link in links),
+            "messages_per_edge": round(sum(link.messages_sent for link in links) / max(1, self.edges), 1),
+            "compact_blocks": self.compact_blocks,
+            "compact_received": compact_received,
+            "blocktxn_requests": sum(peer.blocktxn_requests for peer in self.peers),
+            "bytes_saved": sum(peer.bytes_saved for peer in self.peers),
+            "bytes_saved_per_block": round(sum(peer.bytes_saved for peer in self.peers) / max(1, compact_received)),
+            "avg_reconstruction_ms": round(1000 * sum(reconstructions) / len(reconstructions), 1) if reconstructions else 0.0,
+        }
+
+
+def simulate_network(duration: float = 30.0, **kwargs) -> Dict[str, Any]:
+    """Build and run a network simulation synchronously"""
+    return asyncio.run(NetworkSimulator(**kwargs).run(duration))
+
+
+def print_network_summary(stats: Dict[str, Any]):
+    print("\n" + "=" * 70)
+    print("🌐 NETWORK SIMULATION SUMMARY")
+    print("=" * 70)
+    print(f"Nodes / Edges:    {stats['nodes']} / {stats['edges']} ({stats['miners']} miners)")
+    print(f"Elapsed:          {stats['elapsed_seconds']}s")
+    print(f"Blocks Mined:     {stats['blocks_mined']}")
+    print(f"Best Height:      {stats['best_height']}")
+    print(f"Stale Blocks:     {stats['stale_blocks']} (fork rate {stats['fork_rate']:.1%})")
+    print(f"Reorgs:           {stats['reorgs']} (max depth {stats['max_reorg_depth']})")
+    print(f"Consensus:        {stats['consensus']:.1%} of nodes on the best tip")
+    print(f"Messages:         {stats['messages']:,} ({stats['messages_per_edge']} per edge)")
+    print(f"Bytes Relayed:    {stats['bytes']:,}")
+    if stats["compact_blocks"]:
+        print(f"Compact Blocks:   {stats['compact_received']:,} received, "
+              f"{stats['blocktxn_requests']:,} needed missing txs")
+        print(f"Bytes Saved:      {stats['bytes_saved']:,} ({stats['bytes_saved_per_block']:,} per block)")
+        print(f"Reconstruction:   {stats['avg_reconstruction_ms']} ms average")
+    print("=" * 70)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Multi-node gossip network simulation")
+    parser.add_argument("--nodes", type=int, default=DEFAULT_NODES)
+    parser.add_argument("--outbound", type=int, default=DEFAULT_OUTBOUND)
+    parser.add_argument("--miners", type=int, default=None)
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds to run")
+    parser.add_argument("--block-interval", type=float, default=DEFAULT_BLOCK_INTERVAL)
+    parser.add_argument("--tx-rate", type=float, default=DEFAULT_TX_RATE)
+    parser.add_argument("--latency", type=float, nargs=2, default=DEFAULT_LATENCY, metavar=("MIN", "MAX"))
+    parser.add_argument("--bandwidth", type=float, default=DEFAULT_BANDWIDTH, help="Bytes/s per link")
+    parser.add_argument("--difficulty", type=int, default=DEFAULT_DIFFICULTY)
+    parser.add_argument("--no-compact", action="store_true", help="Relay full blocks instead of compact blocks")
+    parser.add_argument("--seed", type=int, default=None)
+    add_backend_argument(parser)
+    add_config_arguments(parser)
+    args = parser.parse_args()
+    apply_backend_argument(args)
+
+    print(f"\n🌐 Simulating {args.nodes} nodes for {args.duration}s...")
+    stats = simulate_network(
+        duration=args.duration,
+        num_nodes=args.nodes,
+        outbound=args.outbound,
+        num_miners=args.miners,
+        latency=tuple(args.latency),
+        bandwidth=args.bandwidth,
+        block_interval=args.block_interval,
+        tx_rate=args.tx_rate,
+        difficulty=args.difficulty,
+        compact_blocks=not args.no_compact,
+        seed=args.seed,
+        config=config_from_args(args, MAINNET),
+    )
+    print_network_summary(stats)
+
+
+if __name__ == "__main__":
+    main()
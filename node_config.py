@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+NODE & VALIDATOR CONFIGURATION
+==============================
+
+Per-instance settings instead of module-level constants, so differently
+configured nodes can run side by side in one process or worker pool:
+- NodeConfig: consensus, mempool and simulation settings read by
+  MainnetNode, TrackedMainnetNode and QuantumMiningNode
+- Presets: MAINNET (also the tracked simulator) and QUANTUM
+- ValidatorConfig: settings read by BlockchainValidator and
+  RewardConsolidator
+- load_config(): preset <- JSON file <- environment <- keyword overrides
+- --config PATH / --set FIELD=VALUE flags for command-line entry points
+
+Config file (JSON, both sections optional):
+    {"node": {"fork_probability": 0.3, "pool_hashrates": {"A": 60, "B": 40}},
+     "validator": {"pow_zeros": 3}}
+
+Environment: SIM_CONFIG names a config file; SIM_<FIELD> overrides a node
+field (SIM_TARGET_BLOCK_TIME=5) and SIM_VALIDATOR_<FIELD> a validator field.
+
+NO REAL BITCOIN. NO REAL NETWORK. PURELY EDUCATIONAL.
+"""
+
+import argparse
+import dataclasses
+import json
+import os
+import typing
+from dataclasses import dataclass, field
+from typing import Any, ClassVar, Dict, Mapping, Optional, Sequence, TypeVar
+
+CONFIG_ENV_VAR = "SIM_CONFIG"
+
+C = TypeVar("C")
+
+
+class ConfigError(ValueError):
+    """Unknown setting or a value of the wrong type"""
+
+
+@dataclass(frozen=True)
+class NodeConfig:
+    """Settings for one node (defaults: the scaled-down mainnet simulation)"""
+
+    SECTION: ClassVar[str] = "node"
+    ENV_PREFIX: ClassVar[str] = "SIM_"
+
+    initial_difficulty: int = 3             # Starting target, as leading hex zeros
+    max_difficulty: int = 6                 # Hardest target, as leading hex zeros
+    difficulty_adjustment_interval: int = 10  # Blocks between retargets (Bitcoin: 2016)
+    target_block_time: float = 10           # Seconds per block (Bitcoin: 600)
+    block_reward: float = 6.25              # Simulated BTC (current Bitcoin reward)
+    halving_interval: int = 210_000         # Blocks between halvings (same as Bitcoin)
+    propagation_delay: float = 1.5          # Max seconds of simulated propagation (MainnetNode)
+    fork_probability: float = 0.15          # Chance per round of a two-block fork (MainnetNode)
+    max_block_weight: int = 12_000          # Weight units per block (Bitcoin: 4,000,000)
+    max_mempool_txs: int = 5_000
+    max_mempool_vbytes: int = 1_000_000     # Bitcoin: 300 MB
+    mempool_expiry: float = 3600            # Seconds before unconfirmed txs expire (Bitcoin: 2 weeks)
+    # Pool name -> % of network hashrate (MainnetNode)
+    pool_hashrates: Dict[str, float] = field(default_factory=lambda: {
+        "FoundryUSA": 28.0,
+        "AntPool": 18.0,
+        "F2Pool": 15.0,
+        "ViaBTC": 12.0,
+        "Binance": 10.0,
+        "Others": 17.0,
+    })
+    # Simulated network hashes per second (MainnetNode). When set, the node
+    # keeps a virtual clock: each block advances it by attempts / hashrate and
+    # propagation delay is added instead of slept, so runs are fast and
+    # reproducible from a random seed.
+    simulated_hashrate: Optional[float] = None
+
+    def replace(self, **changes) -> "NodeConfig":
+        return _build(type(self), {**dataclasses.asdict(self), **changes})
+
+
+@dataclass(frozen=True)
+class ValidatorConfig:
+    """Settings for the blockchain validator and reward consolidator"""
+
+    SECTION: ClassVar[str] = "validator"
+    ENV_PREFIX: ClassVar[str] = "SIM_VALIDATOR_"
+
+    pow_zeros: int = 4                      # Leading hex zeros a block hash must have
+    confirmations_required: int = 6         # Confirmations before a block counts as settled
+    validation_delay: float = 0.1           # Simulated seconds per block check
+    broadcast_delay: float = 0.5            # Simulated seconds to broadcast a transfer
+    consolidation_fee: float = 0.0001
+    min_relay_fee: float = 0.00001
+    history_page_size: int = 10
+    # Sample ledger used when no live node is available
+    sample_block_reward: float = 6.25
+    sample_direct_transfer: float = 10.0    # Earlier transfer into wallet 1
+    sample_wallet2_existing: float = 25.0   # Already held at the target address
+
+    def replace(self, **changes) -> "ValidatorConfig":
+        return _build(type(self), {**dataclasses.asdict(self), **changes})
+
+
+MAINNET = NodeConfig()
+QUANTUM = NodeConfig(
+    initial_difficulty=4,
+    max_difficulty=8,
+    target_block_time=1,            # Quantum systems mine much faster
+    max_block_weight=60_000,        # Quantum blocks carry ~5x more transactions
+    max_mempool_txs=25_000,
+    max_mempool_vbytes=5_000_000,
+)
+VALIDATOR = ValidatorConfig()
+
+
+# ---------- Parsing ----------
+
+def _coerce(cls, name: str, value: Any) -> Any:
+    """`value` (from JSON, env or kwargs) as the type of field `name`"""
+    kind = typing.get_type_hints(cls)[name]
+    optional = type(None) in typing.get_args(kind)
+    if optional:
+        kind = next(arg for arg in typing.get_args(kind) if arg is not type(None))
+    try:
+        if isinstance(value, str):
+            if optional and value.strip().lower() in ("", "none", "null"):
+                return None
+            if kind is not str:
+                value = json.loads(value)
+        if value is None and optional:
+            return None
+        if typing.get_origin(kind) is dict:
+            if not isinstance(value, dict):
+                raise TypeError
+            return {str(k): float(v) for k, v in value.items()}
+        if kind is int:
+            if isinstance(value, bool) or float(value) != int(value):
+                raise TypeError
+            return int(value)
+        if kind is float:
+            if isinstance(value, bool):
+                raise TypeError
+            return float(value)
+        return kind(value)
+    except (TypeError, ValueError):
+        raise ConfigError(f"{cls.__name__}.{name}: expected {getattr(kind, '__name__', kind)}, "
+                          f"got {value!r}") from None
+
+
+def _build(cls, values: Mapping[str, Any]):
+    names = {f.name for f in dataclasses.fields(cls)}
+    unknown = set(values) - names
+    if unknown:
+        raise ConfigError(f"Unknown {cls.__name__} settings: {', '.join(sorted(unknown))}")
+    return cls(**{name: _coerce(cls, name, value) for name, value in values.items()})
+
+
+def load_config(base: C, path: Optional[str] = None, environ: Optional[Mapping[str, str]] = None,
+                **overrides) -> C:
+    """
+    `base` (a preset) overlaid with the file's section for its type, then
+    environment variables, then `overrides`. The file defaults to $SIM_CONFIG.
+    """
+    cls = type(base)
+    environ = os.environ if environ is None else environ
+    values: Dict[str, Any] = dataclasses.asdict(base)
+
+    path = path or environ.get(CONFIG_ENV_VAR)
+    if path:
+        with open(path) as f:
+            data = json.load(f)
+        unknown_sections = set(data) - {NodeConfig.SECTION, ValidatorConfig.SECTION}
+        if unknown_sections:
+            raise ConfigError(f"{path}: unknown sections {', '.join(sorted(unknown_sections))}")
+        values.update(data.get(cls.SECTION, {}))
+
+    for f in dataclasses.fields(cls):
+        key = cls.ENV_PREFIX + f.name.upper()
+        if key in environ:
+            values[f.name] = environ[key]
+    values.update(overrides)
+    return _build(cls, values)
+
+
+# ---------- Command line ----------
+
+def add_config_arguments(parser: argparse.ArgumentParser):
+    """Standard --config / --set flags for command-line entry points"""
+    parser.add_argument("--config", metavar="PATH",
+                        help=f"JSON config file (default: ${CONFIG_ENV_VAR})")
+    parser.add_argument("--set", action="append", default=[], metavar="FIELD=VALUE",
+                        help="override one setting (repeatable)")
+
+
+def parse_assignments(assignments: Sequence[str]) -> Dict[str, str]:
+    values = {}
+    for assignment in assignments:
+        name, sep, value = assignment.partition("=")
+        if not sep:
+            raise ConfigError(f"Expected FIELD=VALUE, got '{assignment}'")
+        values[name.strip()] = value
+    return values
+
+
+def config_from_args(args: argparse.Namespace, base: C) -> C:
+    """`base` with the file, environment and --set values of parsed arguments"""
+    return load_config(base, getattr(args, "config", None),
+                       **parse_assignments(getattr(args, "set", [])))
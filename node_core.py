@@ -0,0 +1,658 @@
+#!/usr/bin/env python3
+"""
+NODE CORE
+=========
+
+The one node implementation behind MainnetNode, TrackedMainnetNode and
+QuantumMiningNode, so every optimization lands in all three at once:
+- Transaction and Block (header hashing, targets, work, difficulty check)
+- In-memory chain with block/tx and address indexes, chain validation
+- Wallet ledger, bounded mempool with refunds, incremental block template
+  with midstate proof of work
+- Difficulty retargeting, halving, wall or virtual clock, metrics and
+  rolling stats
+
+Who mines the next block is a MinerPolicy plugged in on top: mining pools
+drawn by hashrate (MainnetNode), pools with per-device reward audit
+(TrackedMainnetNode) or quantum devices paying one wallet
+(QuantumMiningNode).
+
+NO REAL BITCOIN. NO REAL NETWORK. PURELY EDUCATIONAL.
+"""
+
+import functools
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from address_index import AddressIndex
+from block_assembly import COINBASE_SIZE, MIN_TX_SIZE, MAX_TX_SIZE, WITNESS_SCALE_FACTOR
+from block_template import BlockTemplate, BlockTemplateManager
+from chain_index import ChainIndex
+from difficulty import bits_to_difficulty, bits_to_target, block_work, retarget, retarget_timespans, zeros_to_bits
+from hash_backend import sha256_hex, sha256d_hex
+from headers import HEADERS_PER_MESSAGE, BlockHeader
+from mempool import Mempool
+from metrics import NodeMetrics
+from node_config import MAINNET, NodeConfig
+from rolling_stats import ChainStats
+
+SIM_EPOCH = 1231006505.0        # Virtual clock start (Bitcoin's genesis timestamp)
+GENESIS_TIMESTAMP = SIM_EPOCH   # Fixed, so every run of a config starts from the same chain
+GENESIS_MINER = "SATOSHI_NAKAMOTO"
+STOP_CHECK_INTERVAL = 1024      # Nonces between checks for a new tip or a cancelled mining job
+
+
+@dataclass
+class Transaction:
+    txid: str
+    from_addr: str
+    to_addr: str
+    amount: float
+    fee: float
+    timestamp: float
+    size: int = COINBASE_SIZE  # Virtual bytes
+
+    @staticmethod
+    def create(from_addr: str, to_addr: str, amount: float, fee: float = 0.0001,
+               size: Optional[int] = None, timestamp: Optional[float] = None) -> "Transaction":
+        now = time.time() if timestamp is None else timestamp
+        raw = f"{from_addr}{to_addr}{amount}{fee}{now}{random.random()}"
+        txid = sha256d_hex(raw.encode())
+        return Transaction(
+            txid=txid,
+            from_addr=from_addr,
+            to_addr=to_addr,
+            amount=amount,
+            fee=fee,
+            timestamp=now,
+            size=size if size is not None else random.randint(MIN_TX_SIZE, MAX_TX_SIZE),
+        )
+
+
+@dataclass
+class Block:
+    index: int
+    previous_hash: str
+    timestamp: float
+    nonce: int
+    bits: int                   # Compact target (nBits)
+    miner_address: str
+    transactions: List[Transaction] = field(default_factory=list)
+    hash: str = ""
+
+    def tx_root(self) -> str:
+        return sha256_hex("".join(tx.txid for tx in self.transactions).encode())
+
+    def weight(self) -> int:
+        return sum(tx.size for tx in self.transactions) * WITNESS_SCALE_FACTOR
+
+    def header(self) -> str:
+        tx_root = self.tx_root()
+        return f"{self.index}{self.previous_hash}{self.timestamp}{self.nonce}{self.bits}{self.miner_address}{tx_root}"
+
+    def compute_hash(self) -> str:
+        return sha256_hex(self.header().encode())
+
+    def target(self) -> int:
+        return bits_to_target(self.bits)
+
+    def work(self) -> int:
+        return block_work(self.bits)
+
+    def meets_difficulty(self) -> bool:
+        return int(self.hash, 16) <= self.target()
+
+
+def genesis_block(initial_difficulty: int) -> Block:
+    """The genesis block for a starting difficulty: identical in every run and process"""
+    genesis = Block(
+        index=0,
+        previous_hash="0" * 64,
+        timestamp=GENESIS_TIMESTAMP,
+        nonce=0,
+        bits=zeros_to_bits(initial_difficulty),
+        miner_address=GENESIS_MINER,
+        transactions=[],
+    )
+    genesis.hash = genesis.compute_hash()
+    return genesis
+
+
+# ---------- Miner policies ----------
+
+class MinerPolicy:
+    """Chooses who mines each block and what is logged about it; subclasses override what they track"""
+
+    def select(self) -> Any:
+        """The miner of the next block (a pool, a device, ...)"""
+        raise NotImplementedError
+
+    def address(self, miner: Any) -> str:
+        """Coinbase recipient, also stored as Block.miner_address"""
+        return miner.name
+
+    def label(self, miner: Any) -> str:
+        return miner.name
+
+    def describe(self, miner: Any) -> List[str]:
+        """Extra log lines before proof of work starts"""
+        return []
+
+    def block_mined(self, block: Block, template: BlockTemplate, miner: Any, seconds: float) -> List[str]:
+        """A block this node mined was connected; returns extra log lines"""
+        return []
+
+    def block_connected(self, block: Block):
+        """Any block (mined or relayed) was connected to the tip"""
+
+    def block_disconnected(self, block: Block):
+        """The tip block was rolled back"""
+
+
+# ---------- Background mining ----------
+
+def _synchronized(method):
+    """Run a node method under the node's lock, so background mining can share the node"""
+    @functools.wraps(method)
+    def locked(self, *args, **kwargs):
+        with self.lock:
+            return method(self, *args, **kwargs)
+    return locked
+
+
+class MiningJob:
+    """
+    Proof of work on a background thread (NodeCore.mine_async).
+
+    `future` (a concurrent.futures.Future) resolves to the mined block. While
+    the job hashes, the node keeps taking transactions and answering queries;
+    when the chain tip changes under it, the stale template is dropped and
+    mining restarts on the new tip. cancel() abandons the job.
+    """
+
+    def __init__(self, node: "NodeCore", miner: Any = None, connect: bool = True):
+        from concurrent.futures import Future  # Not needed by nodes that never mine in the background
+
+        self.node = node
+        self.miner = miner              # None: the policy picks a miner for every attempt
+        self.connect = connect          # False: hand the block back instead of connecting it
+        self.future = Future()
+        self.restarts = 0               # Templates abandoned because the tip moved
+        self._thread = threading.Thread(target=self._run, name=f"{node.NODE_TYPE}-miner", daemon=True)
+        self._thread.start()
+
+    def cancel(self) -> bool:
+        """Stop mining; False if the block was already found (cancelling `future` does the same)"""
+        with self.node.lock:
+            return self.future.cancel()
+
+    def cancelled(self) -> bool:
+        return self.future.cancelled()
+
+    def done(self) -> bool:
+        return self.future.done()
+
+    def result(self, timeout: Optional[float] = None) -> Block:
+        return self.future.result(timeout)
+
+    def _run(self):
+        node = self.node
+        try:
+            while not self.future.cancelled():
+                with node.lock:
+                    miner = self.miner if self.miner is not None else node.policy.select()
+                    template = node.create_block_template(miner)
+                tip = template.block.previous_hash
+                start = time.time()
+                attempts = node.solve_block(
+                    template, stop=lambda: self.future.cancelled() or node.latest_block.hash != tip)
+                with node.lock:
+                    if self.future.cancelled():
+                        return
+                    block = template.block
+                    if (attempts is None or node.latest_block.hash != tip
+                            or any(tx not in node.mempool for tx in block.transactions[1:])):
+                        self.restarts += 1  # Tip or mempool moved while solving: start over
+                        continue
+                    if self.connect:
+                        node.connect_block(block)
+                        node.policy.block_mined(block, template, miner, time.time() - start)
+                        node.adjust_difficulty()
+                    self.future.set_result(block)
+                    return
+        except Exception as e:
+            with node.lock:
+                if not self.future.done():
+                    self.future.set_exception(e)
+
+
+# ---------- Node ----------
+
+class NodeCore:
+    """Chain, ledger, mempool, template and proof of work shared by every node"""
+
+    NODE_TYPE = "core"              # Metrics label
+    DEFAULT_CONFIG = MAINNET
+
+    def __init__(self, policy: MinerPolicy, config: Optional[NodeConfig] = None, verbose: bool = False):
+        self.policy = policy
+        self.verbose = verbose
+        self.lock = threading.RLock()        # Held for changes to the chain, mempool and template
+        self.config = config = config or self.DEFAULT_CONFIG
+        self._sim_time = SIM_EPOCH           # Virtual clock (config.simulated_hashrate)
+        self._chain: Optional[List[Block]] = None  # Genesis is created on first use
+        self.mempool = Mempool(
+            max_count=config.max_mempool_txs,
+            max_vbytes=config.max_mempool_vbytes,
+            expiry_seconds=config.mempool_expiry,
+            on_evict=self._on_mempool_evict,
+        )
+        self.block_template = BlockTemplateManager(Block, Transaction, max_weight=config.max_block_weight)
+        self.wallets: Dict[str, float] = {}
+        self.address_index = AddressIndex()  # Confirmed per-address history
+        self._chain_index = ChainIndex()     # Block hash / txid lookups
+        self.current_bits = zeros_to_bits(config.initial_difficulty)
+        self.metrics = NodeMetrics(self.NODE_TYPE)
+        self.stats = ChainStats()            # Rolling figures for status reports
+
+        # Statistics
+        self.total_fees_collected = 0.0
+        self.total_txs_mined = 0
+        self.total_weight_mined = 0
+        self.total_vsize_mined = 0
+        self.orphaned_blocks = 0
+        self.forks_resolved = 0
+
+        if verbose:
+            self._create_genesis_block()  # Interactive runs show the banner up front
+
+    # ---------- Blockchain basics ----------
+
+    @property
+    def chain(self) -> List[Block]:
+        if self._chain is None:
+            self._create_genesis_block()
+        return self._chain
+
+    @chain.setter
+    def chain(self, chain: List[Block]):
+        self._chain = chain
+
+    @property
+    def chain_index(self) -> ChainIndex:
+        if self._chain is None:
+            self._create_genesis_block()
+        return self._chain_index
+
+    def _create_genesis_block(self):
+        """Create the genesis block (block 0); runs on first use of the chain, so idle nodes stay cheap"""
+        genesis = genesis_block(self.config.initial_difficulty)
+        self._chain = [genesis]
+        self._chain_index.connect_block(genesis)
+        if self.verbose:
+            self.print_banner()
+
+    def print_banner(self):
+        """Startup message (after the genesis block exists)"""
+
+    def set_genesis(self, genesis: Block):
+        """Start the chain (and its indexes) over from `genesis`"""
+        self._chain = [genesis]
+        self.address_index = AddressIndex()
+        self._chain_index = ChainIndex()
+        self._chain_index.connect_block(genesis)
+        self.stats = ChainStats()
+
+    def now(self) -> float:
+        """Wall-clock time, or the virtual clock when config.simulated_hashrate is set"""
+        return self._sim_time if self.config.simulated_hashrate else time.time()
+
+    def _advance_clock(self, seconds: float):
+        """Let `seconds` pass: virtual time moves on, otherwise really wait"""
+        if self.config.simulated_hashrate:
+            with self.lock:
+                self._sim_time += seconds
+        else:
+            time.sleep(seconds)
+
+    @property
+    def latest_block(self) -> Block:
+        return self.chain[-1]
+
+    @property
+    def chain_height(self) -> int:
+        return len(self.chain) - 1
+
+    @property
+    def current_difficulty(self) -> float:
+        return bits_to_difficulty(self.current_bits)
+
+    @property
+    def chainwork(self) -> int:
+        """Cumulative expected hashes behind the tip"""
+        return self.chain_index.tip_work
+
+    def is_chain_valid(self) -> bool:
+        """Validate the entire blockchain"""
+        for i in range(1, len(self.chain)):
+            curr = self.chain[i]
+            prev = self.chain[i - 1]
+
+            # Check hash is correct
+            if curr.hash != curr.compute_hash():
+                return False
+
+            # Check meets difficulty
+            if not curr.meets_difficulty():
+                return False
+
+            # Check links to previous block
+            if curr.previous_hash != prev.hash:
+                return False
+        return True
+
+    # ---------- Lookups ----------
+
+    def get_block_by_hash(self, block_hash: str) -> Optional[Block]:
+        return self.chain_index.get_block(block_hash)
+
+    def get_transaction(self, txid: str) -> Optional[Transaction]:
+        """Confirmed or mempool transaction by txid"""
+        found = self.chain_index.get_transaction(txid)
+        return found[0] if found is not None else self.mempool.get(txid)
+
+    def get_confirmations(self, hash_or_txid: str) -> int:
+        """Confirmations of a block hash or txid (0 while unconfirmed)"""
+        if hash_or_txid in self.chain_index:
+            return self.chain_index.confirmations(hash_or_txid)
+        return self.chain_index.tx_confirmations(hash_or_txid)
+
+    def get_headers(self, start_height: int, count: int = HEADERS_PER_MESSAGE) -> List[BlockHeader]:
+        """Headers of the active chain from `start_height` (for headers-first sync)"""
+        return [BlockHeader.from_block(b) for b in self.chain[start_height:start_height + count]]
+
+    # ---------- Difficulty adjustment ----------
+
+    def adjust_difficulty(self):
+        """Adjust difficulty based on recent block times (like Bitcoin)"""
+        # Actual vs expected time for the last `interval` blocks (shared with header verification)
+        timespans = retarget_timespans(self.chain_height, self.config.difficulty_adjustment_interval,
+                                       self.config.target_block_time, lambda h: self.chain[h].timestamp)
+        if timespans is None:
+            return
+        actual_time, expected_time = timespans
+
+        old_difficulty = self.current_difficulty
+
+        # Scale the target by actual / expected time (clamped to 4x either way)
+        self.current_bits = retarget(self.current_bits, actual_time, expected_time,
+                                     min_target=bits_to_target(zeros_to_bits(self.config.max_difficulty)))
+        if self.current_difficulty > old_difficulty:
+            print(f"\n⚡ DIFFICULTY INCREASED: {old_difficulty:,.2f} → {self.current_difficulty:,.2f}")
+            print(f"   Blocks were mined {expected_time/max(actual_time, 1e-9):.2f}x too fast")
+        elif self.current_difficulty < old_difficulty:
+            print(f"\n🐌 DIFFICULTY DECREASED: {old_difficulty:,.2f} → {self.current_difficulty:,.2f}")
+            print(f"   Blocks were mined {actual_time/expected_time:.2f}x too slow")
+
+    # ---------- Wallet / mempool ----------
+
+    def get_balance(self, address: str) -> float:
+        return self.wallets.get(address, 0.0)
+
+    def credit(self, address: str, amount: float):
+        self.wallets[address] = self.get_balance(address) + amount
+
+    def debit(self, address: str, amount: float) -> bool:
+        if self.get_balance(address) >= amount:
+            self.wallets[address] -= amount
+            return True
+        return False
+
+    @_synchronized
+    def add_transaction(self, tx: Transaction) -> bool:
+        """Add transaction to mempool with validation"""
+        if tx.amount <= 0 or tx.fee < 0:
+            return False
+
+        if tx.from_addr != "COINBASE":
+            total_needed = tx.amount + tx.fee
+            if not self.debit(tx.from_addr, total_needed):
+                return False
+
+        if not self.mempool.add(tx, now=self.now()):
+            # Mempool full and this tx has the lowest fee rate
+            if tx.from_addr != "COINBASE":
+                self.credit(tx.from_addr, tx.amount + tx.fee)
+            return False
+
+        self.block_template.add_transaction(tx)
+        return True
+
+    def _on_mempool_evict(self, tx: Transaction, reason: str):
+        """Refund the sender debited in add_transaction when a tx is evicted or expires"""
+        if tx.from_addr != "COINBASE":
+            self.credit(tx.from_addr, tx.amount + tx.fee)
+        self.block_template.remove_transactions([tx])
+
+    def _remove_from_mempool(self, txs: List[Transaction]):
+        """Drop mined transactions from the mempool and the block template"""
+        self.mempool.remove(txs)
+        self.block_template.remove_transactions(txs)
+
+    def get_current_block_reward(self) -> float:
+        """Calculate current block reward (includes halving)"""
+        halvings = self.chain_height // self.config.halving_interval
+        return self.config.block_reward / (2 ** halvings)
+
+    # ---------- Mining ----------
+
+    @_synchronized
+    def create_block_template(self, miner: Any, parent: Optional[Block] = None) -> BlockTemplate:
+        """
+        Candidate block on the current tip, from the template kept up to date
+        by add_transaction. `parent` builds on a competing block at the tip's
+        height instead (a fork's other branch), leaving the active chain as is
+        """
+        tip = self.latest_block
+        if parent is not None and parent.index != tip.index:
+            raise ValueError(f"Parent at height {parent.index} does not compete with the tip at {tip.index}")
+        parent = parent or tip
+        with self.metrics.assembly.time():
+            now = self.now()
+            self.mempool.expire(now)
+            return self.block_template.build(
+                index=parent.index + 1,
+                previous_hash=parent.hash,
+                timestamp=now,
+                bits=self.current_bits,
+                miner_address=self.policy.address(miner),
+                reward=self.get_current_block_reward(),
+                exclude=parent.transactions[1:] if parent is not tip else (),
+            )
+
+    def solve_block(self, template: BlockTemplate, stop: Optional[Callable[[], bool]] = None) -> Optional[int]:
+        """
+        Proof of work on a template; returns the number of attempts, or None
+        when `stop` (polled every STOP_CHECK_INTERVAL nonces) asks to give up
+        """
+        candidate = template.block
+        attempts = 0
+        target = candidate.target()
+        start = time.perf_counter()
+        while True:
+            candidate_hash = template.hash_for_nonce(candidate.nonce)
+            if int(candidate_hash, 16) <= target:
+                candidate.hash = candidate_hash
+                elapsed = time.perf_counter() - start
+                # Hashing runs unlocked; the shared clock, stats and metrics do not
+                with self.lock:
+                    self.stats.record_solve(candidate.miner_address, attempts + 1, elapsed)
+                    self.metrics.hashing.observe(elapsed)
+                    if self.config.simulated_hashrate:
+                        self._sim_time += (attempts + 1) / self.config.simulated_hashrate
+                    self.metrics.hash_attempts.inc(attempts + 1)
+                    self.metrics.attempts_per_block.observe(attempts)
+                return attempts
+            candidate.nonce += 1
+            attempts += 1
+            if stop is not None and attempts % STOP_CHECK_INTERVAL == 0 and stop():
+                with self.lock:
+                    self.metrics.hash_attempts.inc(attempts)
+                return None
+
+    @_synchronized
+    def connect_block(self, block: Block):
+        """Append a solved block to the tip and apply it to mempool, wallets and stats"""
+        self.chain.append(block)
+        self.address_index.connect_block(block)
+        self.chain_index.connect_block(block)
+        self.stats.connect(block, self.chain[-2])
+        coinbase, txs = block.transactions[0], block.transactions[1:]
+        start = time.perf_counter()
+
+        # Senders of txs we already hold were debited in add_transaction;
+        # txs we never saw (relayed blocks) are debited now
+        in_mempool = []
+        for tx in txs:
+            if tx in self.mempool:
+                in_mempool.append(tx)
+            else:
+                self.wallets[tx.from_addr] = self.get_balance(tx.from_addr) - (tx.amount + tx.fee)
+        self._remove_from_mempool(in_mempool)
+
+        # Credit the miner (coinbase) and recipients of all transactions in the block
+        self.credit(coinbase.to_addr, coinbase.amount)
+        for tx in txs:
+            self.credit(tx.to_addr, tx.amount)
+
+        # Update statistics
+        self.policy.block_connected(block)
+        self.total_fees_collected += sum(tx.fee for tx in txs)
+        self.total_txs_mined += len(txs)
+        self.total_weight_mined += block.weight()
+        self.total_vsize_mined += sum(tx.size for tx in txs)
+        self.metrics.balance_update.observe(time.perf_counter() - start)
+        self.metrics.blocks.inc()
+        self.metrics.record_mempool(self.mempool)
+
+    @_synchronized
+    def disconnect_tip(self) -> Block:
+        """Undo the tip block (reorg) and return its transactions to the mempool"""
+        block = self.chain.pop()
+        self.address_index.disconnect_block(block)
+        self.chain_index.disconnect_block(block)
+        self.stats.disconnect(block)
+        coinbase, txs = block.transactions[0], block.transactions[1:]
+
+        self.wallets[coinbase.to_addr] = self.get_balance(coinbase.to_addr) - coinbase.amount
+        for tx in txs:
+            self.wallets[tx.to_addr] = self.get_balance(tx.to_addr) - tx.amount
+
+        self.policy.block_disconnected(block)
+        self.total_fees_collected -= sum(tx.fee for tx in txs)
+        self.total_txs_mined -= len(txs)
+        self.total_weight_mined -= block.weight()
+        self.total_vsize_mined -= sum(tx.size for tx in txs)
+
+        # Senders stay debited while their txs wait in the mempool again
+        for tx in txs:
+            if self.mempool.add(tx, now=self.now()):
+                self.block_template.add_transaction(tx)
+            else:
+                self.credit(tx.from_addr, tx.amount + tx.fee)
+        self.metrics.record_mempool(self.mempool)
+        return block
+
+    def record_reorg(self, depth: int):
+        """Note a switch to another branch after disconnecting `depth` blocks"""
+        self.metrics.reorg_depth.observe(depth)
+        self.stats.record_reorg()
+
+    def generate_block(self, miner: Any = None) -> Block:
+        """Mine and connect one block silently, with no propagation delay or retarget"""
+        if miner is None:
+            miner = self.policy.select()
+        template = self.create_block_template(miner)
+        start = time.time()
+        self.solve_block(template)
+        self.connect_block(template.block)
+        self.policy.block_mined(template.block, template, miner, time.time() - start)
+        return template.block
+
+    def _propagate(self, block: Block):
+        """Network propagation of a freshly solved block (none for a single-site miner)"""
+
+    def mine_block(self, miner: Any = None) -> Block:
+        """Mine, log and connect a new block, then retarget if due"""
+        if miner is None:
+            miner = self.policy.select()
+
+        template = self.create_block_template(miner)
+        candidate = template.block
+        new_index = candidate.index
+        total_fees = template.total_fees
+
+        print(f"\n⛏️  [{self.policy.label(miner)}] Mining block {new_index}...")
+        for line in self.policy.describe(miner):
+            print(f"   {line}")
+        print(f"   Transactions: {len(candidate.transactions)} (fees: {total_fees:.8f} BTC)")
+        print(f"   Weight: {template.weight:,}/{self.config.max_block_weight:,} WU")
+        print(f"   Difficulty: {self.current_difficulty:,.2f} (bits {self.current_bits:#010x})")
+        start = time.time()
+
+        # Proof of work
+        attempts = self.solve_block(template)
+
+        elapsed = time.time() - start
+        self._propagate(candidate)
+
+        # Add to chain, credit the miner and recipients, update statistics
+        self.connect_block(candidate)
+
+        print(f"✅ Block {new_index} mined in {elapsed:.2f}s ({attempts:,} attempts)")
+        print(f"   Hash:   {candidate.hash}")
+        print(f"   Reward: {template.reward:.8f} BTC + {total_fees:.8f} fees")
+        for line in self.policy.block_mined(candidate, template, miner, elapsed):
+            print(f"   {line}")
+
+        # Check for difficulty adjustment
+        self.adjust_difficulty()
+
+        return candidate
+
+    def mine_async(self, miner: Any = None, connect: bool = True) -> MiningJob:
+        """
+        Mine the next block on a background thread and return its handle.
+
+        The block is connected silently, then the difficulty is retargeted if due.
+        With connect=False it is only handed back through the handle. Work that
+        a new tip makes stale is restarted on that tip.
+        """
+        return MiningJob(self, miner, connect)
+
+    # ---------- Status ----------
+
+    @_synchronized
+    def status(self) -> Dict[str, Any]:
+        """Current figures from running counters and rolling stats (no chain scans)"""
+        return {
+            "height": self.chain_height,
+            "hash": self.latest_block.hash,
+            "difficulty": self.current_difficulty,
+            "bits": self.current_bits,
+            "chainwork": self.chainwork,
+            "reward": self.get_current_block_reward(),
+            "mempool_txs": len(self.mempool),
+            "mempool_vbytes": self.mempool.total_vbytes,
+            "mempool_evicted": self.mempool.evicted_count,
+            "mempool_expired": self.mempool.expired_count,
+            "forks_resolved": self.forks_resolved,
+            "orphaned_blocks": self.orphaned_blocks,
+            "total_fees": self.total_fees_collected,
+            "block_fill": self.total_weight_mined / max(self.chain_height, 1) / self.config.max_block_weight,
+            **self.stats.snapshot(),
+            "time_breakdown": self.metrics.time_breakdown(),
+        }
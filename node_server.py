@@ -0,0 +1,446 @@
+#!/usr/bin/env python3
+"""
+LOCAL NODE SERVER (JSON-RPC)
+============================
+
+Long-running daemon that keeps a MainnetNode alive behind a localhost RPC port:
+- JSON-RPC 2.0, one request (or batch array) per line over TCP, many
+  concurrent clients (asyncio)
+- getbalance, sendtransaction, getblock, gettransaction, getchaininfo
+  (plus a test faucet), all O(1) through the node's hash-keyed indexes
+- getmetrics: the in-process metrics registry in Prometheus text format
+- Address index queries: getaddressinfo, getaddresshistory, getaddressbalance
+- getheaders for light clients: NodeClient.header_sync() verifies proof of
+  work across the chain from headers alone and fetches bodies on demand
+- Optional background miner (NodeCore.mine_async): proof of work runs off
+  the event loop, so RPC calls keep answering in milliseconds while a block
+  is being solved
+- NodeClient: thread-safe client with a pool of persistent connections,
+  used by bitcoin_transfer.py and blockchain_validator.py
+
+NO REAL BITCOIN. NO REAL NETWORK. PURELY EDUCATIONAL.
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import queue
+import socket
+from typing import Any, Dict, List, Optional, Tuple
+
+from bitcoin_simulator import Block, MainnetNode, Transaction
+from difficulty import bits_to_difficulty
+from hash_backend import add_backend_argument, apply_backend_argument
+from headers import HEADERS_PER_MESSAGE, BlockHeader, HeaderChain, HeaderSync
+from metrics import REGISTRY
+from node_config import MAINNET, NodeConfig, add_config_arguments, config_from_args
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 18443                 # Bitcoin Core's regtest RPC port
+DEFAULT_POOL_SIZE = 4                # Persistent connections per client
+DEFAULT_MINE_INTERVAL = 10.0         # Seconds between background blocks
+
+# JSON-RPC 2.0 error codes
+PARSE_ERROR = -32700
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+RPC_VERIFY_REJECTED = -26            # Bitcoin Core: transaction rejected
+
+
+class RPCError(Exception):
+    """Error returned by the node (or raised by a handler)"""
+
+    def __init__(self, code: int, message: str):
+        super().__init__(f"{message} (code {code})")
+        self.code = code
+        self.message = message
+
+
+def block_to_dict(block: Block, tip_height: int) -> Dict[str, Any]:
+    return {
+        "height": block.index,
+        "hash": block.hash,
+        "previousblockhash": block.previous_hash,
+        "time": block.timestamp,
+        "nonce": block.nonce,
+        "bits": f"{block.bits:08x}",
+        "difficulty": bits_to_difficulty(block.bits),
+        "miner": block.miner_address,
+        "confirmations": tip_height - block.index + 1,
+        "weight": block.weight(),
+        "tx": [
+            {"txid": tx.txid, "from": tx.from_addr, "to": tx.to_addr,
+             "amount": tx.amount, "fee": tx.fee, "size": tx.size, "time": tx.timestamp}
+            for tx in block.transactions
+        ],
+    }
+
+
+def block_from_dict(data: Dict[str, Any]) -> Block:
+    """Inverse of block_to_dict (the hash is kept as sent; check it against a header)"""
+    txs = [Transaction(tx["txid"], tx["from"], tx["to"], tx["amount"], tx["fee"], tx["time"], tx["size"])
+           for tx in data["tx"]]
+    return Block(data["height"], data["previousblockhash"], data["time"], data["nonce"],
+                 int(data["bits"], 16), data["miner"], txs, data["hash"])
+
+
+class NodeServer:
+    """Serves one MainnetNode to local RPC clients"""
+
+    def __init__(self, node: Optional[MainnetNode] = None, host: str = DEFAULT_HOST,
+                 port: int = DEFAULT_PORT, mine_interval: Optional[float] = None):
+        self.node = node or MainnetNode(verbose=False)
+        self.host = host
+        self.port = port
+        self.mine_interval = mine_interval
+        self.requests_served = 0
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._miner: Optional[asyncio.Task] = None
+
+    # ---------- RPC methods ----------
+
+    def rpc_getbalance(self, address: str) -> float:
+        return self.node.get_balance(address)
+
+    def rpc_sendtransaction(self, from_addr: str, to_addr: str, amount: float,
+                            fee: float = 0.0001) -> str:
+        tx = Transaction.create(from_addr, to_addr, float(amount), float(fee))
+        if not self.node.add_transaction(tx):
+            raise RPCError(RPC_VERIFY_REJECTED, "Transaction rejected (insufficient funds or mempool full)")
+        return tx.txid
+
+    def rpc_getblock(self, block_id) -> Dict[str, Any]:
+        """Block by height (int) or hash (str)"""
+        if isinstance(block_id, int):
+            if not 0 <= block_id <= self.node.chain_height:
+                raise RPCError(INVALID_PARAMS, f"Block height out of range: {block_id}")
+            block = self.node.chain[block_id]
+        else:
+            block = self.node.get_block_by_hash(block_id)
+            if block is None:
+                raise RPCError(INVALID_PARAMS, f"Block not found: {block_id}")
+        return block_to_dict(block, self.node.chain_height)
+
+    def rpc_getheaders(self, start_height: int, count: int = HEADERS_PER_MESSAGE) -> List[Dict[str, Any]]:
+        """Up to `count` headers of the active chain from `start_height`"""
+        count = max(0, min(int(count), HEADERS_PER_MESSAGE))
+        return [h.to_dict() for h in self.node.get_headers(int(start_height), count)]
+
+    def rpc_gettransaction(self, txid: str) -> Dict[str, Any]:
+        """Confirmed or mempool transaction with its block and confirmations"""
+        node = self.node
+        found = node.chain_index.get_transaction(txid)
+        if found is not None:
+            tx, block = found
+            blockhash = block.hash
+        else:
+            tx, blockhash = node.mempool.get(txid), None
+            if tx is None:
+                raise RPCError(INVALID_PARAMS, f"Transaction not found: {txid}")
+        return {"txid": tx.txid, "from": tx.from_addr, "to": tx.to_addr, "amount": tx.amount,
+                "fee": tx.fee, "size": tx.size, "blockhash": blockhash,
+                "confirmations": node.get_confirmations(txid)}
+
+    def rpc_getchaininfo(self) -> Dict[str, Any]:
+        node = self.node
+        return {
+            "blocks": node.chain_height,
+            "bestblockhash": node.latest_block.hash,
+            "difficulty": node.current_difficulty,
+            "bits": f"{node.current_bits:08x}",
+            "chainwork": f"{node.chainwork:x}",
+            "networkhashps": node.stats.network_hashrate(),
+            "reward": node.get_current_block_reward(),
+            "mempool_txs": len(node.mempool),
+            "mempool_vbytes": node.mempool.total_vbytes,
+            "total_fees": node.total_fees_collected,
+        }
+
+    def rpc_getaddressinfo(self, address: str) -> Dict[str, Any]:
+        """Confirmed balance, received/sent totals and tx count"""
+        return self.node.address_index.summary(address)
+
+    def rpc_getaddresshistory(self, address: str, page: int = 0, page_size: int = 50) -> List[Dict[str, Any]]:
+        """One page of confirmed history, newest first"""
+        return [entry._asdict() for entry in self.node.address_index.history(address, page, page_size)]
+
+    def rpc_getaddressbalance(self, address: str, height: Optional[int] = None) -> float:
+        """Confirmed balance at the tip or after block `height`"""
+        index = self.node.address_index
+        return index.balance(address) if height is None else index.balance_at(address, height)
+
+    def rpc_getmetrics(self) -> str:
+        """Node metrics (hashing, assembly, mempool depth, reorgs...) in Prometheus text format"""
+        self.node.metrics.record_mempool(self.node.mempool)
+        return REGISTRY.render()
+
+    def rpc_faucet(self, address: str, amount: float) -> float:
+        """Credit test funds (simulation only) and return the new balance"""
+        self.node.credit(address, float(amount))
+        return self.node.get_balance(address)
+
+    def dispatch(self, method: str, params) -> Any:
+        handler = getattr(self, f"rpc_{method}", None)
+        if handler is None:
+            raise RPCError(METHOD_NOT_FOUND, f"Method not found: {method}")
+        try:
+            with self.node.lock:  # Background mining updates the same chain, stats and metrics
+                return handler(**params) if isinstance(params, dict) else handler(*params)
+        except TypeError as e:
+            raise RPCError(INVALID_PARAMS, str(e))
+
+    # ---------- Transport ----------
+
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                writer.write(self._handle_line(line))
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    def _handle_line(self, line: bytes) -> bytes:
+        try:
+            request = json.loads(line)
+        except ValueError as e:
+            response = {"jsonrpc": "2.0", "id": None,
+                        "error": {"code": PARSE_ERROR, "message": f"Invalid request: {e}"}}
+            return json.dumps(response).encode() + b"\n"
+        if isinstance(request, list):
+            # Batch: one round trip for many calls, answered in order
+            return json.dumps([self._handle_request(r) for r in request]).encode() + b"\n"
+        return json.dumps(self._handle_request(request)).encode() + b"\n"
+
+    def _handle_request(self, request) -> Dict[str, Any]:
+        request_id = None
+        try:
+            request_id = request.get("id")
+            result = self.dispatch(request["method"], request.get("params", []))
+            response = {"jsonrpc": "2.0", "id": request_id, "result": result}
+        except RPCError as e:
+            response = {"jsonrpc": "2.0", "id": request_id,
+                        "error": {"code": e.code, "message": e.message}}
+        except (ValueError, KeyError, AttributeError) as e:
+            response = {"jsonrpc": "2.0", "id": request_id,
+                        "error": {"code": PARSE_ERROR, "message": f"Invalid request: {e}"}}
+        self.requests_served += 1
+        return response
+
+    # ---------- Background mining ----------
+
+    async def _mine_forever(self):
+        while True:
+            await asyncio.sleep(self.mine_interval)
+            # Proof of work on the node's miner thread (restarted if the tip moves);
+            # stopping the server cancels the job through the wrapped future
+            block = await asyncio.wrap_future(self.node.mine_async().future)
+            print(f"⛏️  Block {block.index} by {block.miner_address} "
+                  f"({len(block.transactions) - 1} txs) {block.hash[:16]}...")
+
+    # ---------- Lifecycle ----------
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle_client, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]  # Resolves port 0
+        if self.mine_interval:
+            self._miner = asyncio.create_task(self._mine_forever())
+
+    async def stop(self):
+        if self._miner is not None:
+            self._miner.cancel()
+            await asyncio.gather(self._miner, return_exceptions=True)
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def serve_forever(self):
+        await self.start()
+        print(f"🌐 Node RPC listening on {self.host}:{self.port}")
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.stop()
+
+
+def parse_address(address: str) -> Tuple[str, int]:
+    host, _, port = address.rpartition(":")
+    return host or DEFAULT_HOST, int(port)
+
+
+class NodeClient:
+    """Blocking JSON-RPC client with a pool of persistent connections"""
+
+    def __init__(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT,
+                 pool_size: int = DEFAULT_POOL_SIZE, timeout: float = 30.0,
+                 config: Optional[NodeConfig] = None):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.config = config or MAINNET     # Consensus rules the node's header chain must follow
+        self._idle: "queue.LifoQueue" = queue.LifoQueue()
+        self._slots = queue.Queue()
+        for _ in range(pool_size):
+            self._slots.put(None)
+        self._ids = itertools.count(1)
+
+    @classmethod
+    def from_address(cls, address: str, **kwargs) -> "NodeClient":
+        host, port = parse_address(address)
+        return cls(host, port, **kwargs)
+
+    def _acquire(self):
+        self._slots.get()  # Bounds concurrent connections to pool_size
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            try:
+                sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+            except OSError:
+                self._slots.put(None)
+                raise
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            return sock, sock.makefile("rb")
+
+    def _release(self, conn, reusable: bool):
+        if reusable:
+            self._idle.put(conn)
+        else:
+            conn[1].close()
+            conn[0].close()
+        self._slots.put(None)
+
+    def _roundtrip(self, request) -> Any:
+        conn = self._acquire()
+        ok = False
+        try:
+            conn[0].sendall(json.dumps(request).encode() + b"\n")
+            line = conn[1].readline()
+            if not line:
+                raise ConnectionError("Node closed the connection")
+            ok = True
+        finally:
+            self._release(conn, ok)
+        return json.loads(line)
+
+    def call(self, method: str, *params) -> Any:
+        request = {"jsonrpc": "2.0", "id": next(self._ids), "method": method, "params": list(params)}
+        response = self._roundtrip(request)
+        if response.get("error"):
+            raise RPCError(response["error"]["code"], response["error"]["message"])
+        return response["result"]
+
+    def call_batch(self, calls: List[Tuple[str, list]]) -> List[Any]:
+        """Send many (method, params) calls in one round trip.
+
+        Results come back in call order; failed calls yield an RPCError
+        instance in place of their result instead of raising.
+        """
+        if not calls:
+            return []
+        requests = [{"jsonrpc": "2.0", "id": next(self._ids), "method": method, "params": list(params)}
+                    for method, params in calls]
+        by_id = {r["id"]: r for r in self._roundtrip(requests)}
+        results = []
+        for request in requests:
+            response = by_id[request["id"]]
+            error = response.get("error")
+            results.append(RPCError(error["code"], error["message"]) if error else response["result"])
+        return results
+
+    def close(self):
+        while True:
+            try:
+                sock, reader = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            reader.close()
+            sock.close()
+
+    def __enter__(self) -> "NodeClient":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ---------- Convenience wrappers ----------
+
+    def getbalance(self, address: str) -> float:
+        return self.call("getbalance", address)
+
+    def sendtransaction(self, from_addr: str, to_addr: str, amount: float, fee: float = 0.0001) -> str:
+        return self.call("sendtransaction", from_addr, to_addr, amount, fee)
+
+    def getblock(self, block_id) -> Dict[str, Any]:
+        return self.call("getblock", block_id)
+
+    def gettransaction(self, txid: str) -> Dict[str, Any]:
+        return self.call("gettransaction", txid)
+
+    def getheaders(self, start_height: int, count: int = HEADERS_PER_MESSAGE) -> List[BlockHeader]:
+        return [BlockHeader.from_dict(h) for h in self.call("getheaders", start_height, count)]
+
+    def getblockbyhash(self, block_hash: str) -> Optional[Block]:
+        """Full block object (None if the node does not have it)"""
+        try:
+            return block_from_dict(self.getblock(block_hash))
+        except RPCError:
+            return None
+
+    def header_sync(self, workers: int = DEFAULT_POOL_SIZE, config: Optional[NodeConfig] = None) -> HeaderSync:
+        """
+        Light-client view of the node: verified header chain, bodies fetched on
+        demand. Header bits must follow the difficulty retargeting of `config`
+        (default: the client's config, MAINNET unless given)
+        """
+        genesis = self.getheaders(0, 1)[0]
+        sync = HeaderSync(HeaderChain(genesis, config or self.config), self.getheaders,
+                          self.getblockbyhash, workers)
+        sync.sync_headers()
+        return sync
+
+    def getchaininfo(self) -> Dict[str, Any]:
+        return self.call("getchaininfo")
+
+    def getaddressinfo(self, address: str) -> Dict[str, Any]:
+        return self.call("getaddressinfo", address)
+
+    def getaddresshistory(self, address: str, page: int = 0, page_size: int = 50) -> List[Dict[str, Any]]:
+        return self.call("getaddresshistory", address, page, page_size)
+
+    def getaddressbalance(self, address: str, height: Optional[int] = None) -> float:
+        return self.call("getaddressbalance", address, height)
+
+    def getmetrics(self) -> str:
+        return self.call("getmetrics")
+
+    def faucet(self, address: str, amount: float) -> float:
+        return self.call("faucet", address, amount)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a simulated node behind a local JSON-RPC port")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--mine-interval", type=float, default=DEFAULT_MINE_INTERVAL,
+                        help="Seconds between background blocks (0 disables mining)")
+    add_backend_argument(parser)
+    add_config_arguments(parser)
+    args = parser.parse_args()
+    apply_backend_argument(args)
+
+    node = MainnetNode(verbose=True, config=config_from_args(args, MAINNET))
+    server = NodeServer(node, args.host, args.port, mine_interval=args.mine_interval or None)
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        print(f"\n🛑 Node stopped after {server.requests_served:,} requests")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+PARAMETER SWEEP ENGINE
+======================
+
+Tune node settings by running many independent simulations at once:
+- Grid over any NodeConfig field (difficulty_adjustment_interval,
+  target_block_time, fork_probability, pool_hashrates, ...), crossed with
+  a number of random seeds
+- Every run builds its own MainnetNode from a NodeConfig (no module globals
+  are touched) on a virtual clock, so a run takes as long as its proof of
+  work, not its simulated block times, and is reproducible from its seed
+- Runs are spread over CPU cores with a process pool
+- Results are averaged over seeds into one table (printed, or --output CSV)
+
+Usage:
+    python parameter_sweep.py --grid difficulty_adjustment_interval=5,10,20 \\
+        fork_probability=0,0.15,0.3 --seeds 5 --blocks 200
+    python parameter_sweep.py --grid-file grid.json --output sweep.csv
+    python parameter_sweep.py --config node.json --set fork_probability=0 \
+        --grid target_block_time=5,10
+(--config / --set change the base settings every grid point starts from)
+
+grid.json maps field names to lists of values, e.g.
+    {"target_block_time": [5, 10],
+     "pool_hashrates": [{"A": 50, "B": 50}, {"A": 90, "B": 10}]}
+
+NO REAL BITCOIN. NO REAL NETWORK. PURELY EDUCATIONAL.
+"""
+
+import argparse
+import contextlib
+import csv
+import dataclasses
+import itertools
+import json
+import os
+import random
+import statistics
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from bitcoin_simulator import MainnetNode
+from node_config import MAINNET, NodeConfig, add_config_arguments, config_from_args
+
+DEFAULT_BLOCKS = 100
+DEFAULT_SEEDS = 3
+# Sweeps keep proof of work cheap: at most 4 leading zeros (65,536 hashes a
+# block) and a virtual network fast enough for the default 3-zero target to
+# land on target_block_time
+SWEEP_BASE = MAINNET.replace(max_difficulty=4, simulated_hashrate=16 ** 3 / 10)
+
+RESULT_COLUMNS = [
+    "height", "sim_seconds", "avg_interval", "interval_error", "final_difficulty",
+    "forks", "orphan_rate", "pool_share_error", "txs_per_block", "fees", "wall_seconds",
+]
+
+_CONFIG_FIELDS = {f.name: f for f in dataclasses.fields(NodeConfig)}
+
+
+# ---------- Grid ----------
+
+def parse_grid_arg(spec: str) -> Dict[str, List[Any]]:
+    """'field=v1,v2,...' -> {field: [values]} with values parsed as JSON where possible"""
+    name, sep, values = spec.partition("=")
+    if not sep or name not in _CONFIG_FIELDS:
+        raise ValueError(f"Expected <NodeConfig field>=v1,v2,... (got '{spec}')")
+    parsed = []
+    for raw in values.split(","):
+        try:
+            parsed.append(json.loads(raw))
+        except ValueError:
+            parsed.append(raw)
+    return {name: parsed}
+
+
+def expand_grid(grid: Dict[str, Sequence[Any]], seeds: int = DEFAULT_SEEDS,
+                blocks: int = DEFAULT_BLOCKS, base: NodeConfig = SWEEP_BASE) -> List[Dict[str, Any]]:
+    """One run spec per combination of grid values and seed, on top of `base`"""
+    unknown = set(grid) - set(_CONFIG_FIELDS)
+    if unknown:
+        raise ValueError(f"Not NodeConfig fields: {', '.join(sorted(unknown))}")
+    names = sorted(grid)
+    runs = []
+    for values in itertools.product(*(grid[name] for name in names)):
+        for seed in range(seeds):
+            runs.append({"params": dict(zip(names, values)), "seed": seed, "blocks": blocks,
+                         "base": base})
+    return runs
+
+
+# ---------- One run ----------
+
+def run_one(spec: Dict[str, Any]) -> Dict[str, Any]:
+    """Run one seeded simulation to `blocks` height and measure it"""
+    random.seed(spec["seed"])
+    config = spec.get("base", SWEEP_BASE).replace(**spec["params"])
+    start = time.perf_counter()
+
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        node = MainnetNode(verbose=False, config=config)
+        genesis_time = node.latest_block.timestamp
+        while node.chain_height < spec["blocks"]:
+            node.generate_random_transactions()
+            if not node.simulate_fork():
+                node.mine_block()
+
+    height = node.chain_height
+    sim_seconds = node.latest_block.timestamp - genesis_time
+    avg_interval = sim_seconds / max(height, 1)
+    total_share = sum(config.pool_hashrates.values()) or 1
+    won = sum(pool.blocks_mined for pool in node.mining_pools) or 1
+    share_error = max(abs(pool.blocks_mined / won - pool.hashrate_percentage / total_share)
+                      for pool in node.mining_pools)
+    return {
+        "params": spec["params"],
+        "seed": spec["seed"],
+        "height": height,
+        "sim_seconds": sim_seconds,
+        "avg_interval": avg_interval,
+        "interval_error": (avg_interval - config.target_block_time) / config.target_block_time,
+        "final_difficulty": node.current_difficulty,
+        "forks": node.forks_resolved,
+        "orphan_rate": node.orphaned_blocks / max(height, 1),
+        "pool_share_error": share_error,
+        "txs_per_block": node.total_txs_mined / max(height, 1),
+        "fees": node.total_fees_collected,
+        "wall_seconds": time.perf_counter() - start,
+    }
+
+
+# ---------- Sweep ----------
+
+def run_sweep(runs: List[Dict[str, Any]], workers: Optional[int] = None,
+              progress: bool = False) -> List[Dict[str, Any]]:
+    """Run every spec, in parallel when workers > 1; results come back in spec order"""
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(runs) == 1:
+        results_iter: Iterable[Dict[str, Any]] = map(run_one, runs)
+        pool = None
+    else:
+        pool = ProcessPoolExecutor(max_workers=workers)
+        chunksize = max(1, len(runs) // (workers * 4))
+        results_iter = pool.map(run_one, runs, chunksize=chunksize)
+    results = []
+    try:
+        for i, result in enumerate(results_iter, 1):
+            results.append(result)
+            if progress:
+                print(f"\r   {i}/{len(runs)} runs", end="", flush=True)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    if progress:
+        print()
+    return results
+
+
+def _param_key(params: Dict[str, Any]) -> str:
+    return json.dumps(params, sort_keys=True)
+
+
+def aggregate(results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """One row per configuration: metric means over seeds, plus the spread of the block interval"""
+    groups: Dict[str, List[Dict[str, Any]]] = {}
+    for result in results:
+        groups.setdefault(_param_key(result["params"]), []).append(result)
+    rows = []
+    for runs in groups.values():
+        row: Dict[str, Any] = dict(runs[0]["params"])
+        row["seeds"] = len(runs)
+        for column in RESULT_COLUMNS:
+            row[column] = statistics.fmean(r[column] for r in runs)
+        row["avg_interval_stdev"] = statistics.pstdev(r["avg_interval"] for r in runs)
+        rows.append(row)
+    return rows
+
+
+def _format_cell(value: Any) -> str:
+    if isinstance(value, float):
+        return f"{value:.4g}"
+    if isinstance(value, dict):
+        return "/".join(f"{k}:{v:g}" for k, v in value.items())
+    return str(value)
+
+
+def print_table(rows: List[Dict[str, Any]], sort_by: Optional[str] = None):
+    if not rows:
+        return
+    if sort_by:
+        rows = sorted(rows, key=lambda r: abs(r[sort_by]))
+    columns = list(rows[0])
+    cells = [[_format_cell(row[c]) for c in columns] for row in rows]
+    widths = [max(len(c), *(len(line[i]) for line in cells)) for i, c in enumerate(columns)]
+    print("  ".join(c.rjust(w) for c, w in zip(columns, widths)))
+    for line in cells:
+        print("  ".join(v.rjust(w) for v, w in zip(line, widths)))
+
+
+def write_csv(path: str, rows: List[Dict[str, Any]]):
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+        writer.writeheader()
+        for row in rows:
+            writer.writerow({k: json.dumps(v) if isinstance(v, dict) else v for k, v in row.items()})
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a grid of seeded simulations in parallel")
+    parser.add_argument("--grid", nargs="*", default=[], metavar="FIELD=V1,V2",
+                        help="NodeConfig field and the values to try")
+    parser.add_argument("--grid-file", metavar="PATH", help="JSON object of field -> list of values")
+    parser.add_argument("--seeds", type=int, default=DEFAULT_SEEDS, help="runs per configuration")
+    parser.add_argument("--blocks", type=int, default=DEFAULT_BLOCKS, help="chain height per run")
+    parser.add_argument("--workers", type=int, default=None, help="processes (default: all cores)")
+    parser.add_argument("--sort", default="interval_error", help="result column to sort by (abs)")
+    parser.add_argument("--output", metavar="PATH", help="also write the table as CSV")
+    add_config_arguments(parser)
+    args = parser.parse_args()
+
+    grid: Dict[str, List[Any]] = {}
+    if args.grid_file:
+        with open(args.grid_file) as f:
+            grid.update(json.load(f))
+    try:
+        for spec in args.grid:
+            grid.update(parse_grid_arg(spec))
+        runs = expand_grid(grid, args.seeds, args.blocks, config_from_args(args, SWEEP_BASE))
+    except ValueError as e:
+        parser.error(str(e))
+
+    configs = len(runs) // max(args.seeds, 1)
+    print(f"🧪 Sweeping {configs} configurations x {args.seeds} seeds "
+          f"({len(runs)} runs of {args.blocks} blocks)")
+    start = time.perf_counter()
+    rows = aggregate(run_sweep(runs, args.workers, progress=True))
+    print(f"✅ Done in {time.perf_counter() - start:.1f}s\n")
+    print_table(rows, sort_by=args.sort)
+    if args.output:
+        write_csv(args.output, rows)
+        print(f"\n💾 Table written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
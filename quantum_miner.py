@@ -10,27 +10,23 @@ Simulates Bitcoin mining using quantum computing hardware:
 - D-Wave Advantage (5,000+ qubits)
 - Classical Supercomputers (exaflop scale)
 
-ALL REWARDS deposited to specified wallet address.
+ALL REWARDS deposited to specified wallet address. Device selection is the
+miner policy on the shared node core (node_core.py).
 
 NO REAL BITCOIN. NO REAL QUANTUM COMPUTING. PURELY EDUCATIONAL.
 """
 
-import hashlib
 import random
-import time
 import json
-from dataclasses import dataclass
-from typing import List, Dict
-from collections import defaultdict
+from dataclasses import dataclass, replace
+from typing import Any, List, Dict, Optional
 from datetime import datetime
 
-
-INITIAL_DIFFICULTY = 4
-MAX_DIFFICULTY = 8
-DIFFICULTY_ADJUSTMENT_INTERVAL = 10
-TARGET_BLOCK_TIME = 1  # Quantum systems mine much faster
-BLOCK_REWARD = 6.25
-HALVING_INTERVAL = 210000
+from block_template import BlockTemplate
+from mining_topology import MiningTopology, unpack_ip
+from node_config import QUANTUM, NodeConfig, load_config
+from node_core import Block, MinerPolicy, NodeCore
+from weighted_sampler import WeightedSampler
 
 
 @dataclass
@@ -51,44 +47,6 @@ class QuantumDevice:
         return f"{self.device_type} ({self.qubit_count} qubits) - {self.hashrate_ehs} EH/s"
 
 
-@dataclass
-class Transaction:
-    txid: str
-    from_addr: str
-    to_addr: str
-    amount: float
-    fee: float
-    timestamp: float
-
-    @staticmethod
-    def create(from_addr: str, to_addr: str, amount: float, fee: float = 0.0001):
-        now = time.time()
-        raw = f"{from_addr}{to_addr}{amount}{fee}{now}{random.random()}"
-        txid = hashlib.sha256(raw.encode()).hexdigest()
-        return Transaction(
-            txid=txid,
-            from_addr=from_addr,
-            to_addr=to_addr,
-            amount=amount,
-            fee=fee,
-            timestamp=now
-        )
-
-
-@dataclass
-class Block:
-    index: int
-    timestamp: float
-    transactions: List[Transaction]
-    previous_hash: str
-    nonce: int
-    hash: str
-    difficulty: int
-    miner: str
-    reward: float
-    quantum_device: QuantumDevice
-
-
 @dataclass
 class RewardRecord:
     """Audit record for quantum mining rewards"""
@@ -126,34 +84,140 @@ class RewardRecord:
         }
 
 
-class QuantumMiningNode:
-    """Bitcoin mining node powered by quantum computers"""
+def build_quantum_fleet(catalogue: List[QuantumDevice], config: Dict[str, Any]) -> MiningTopology:
+    """
+    Build an array-backed fleet of catalogue devices from a compact config.
+
+    Example:
+        {"seed": 3, "fleet": [{"prototype": "GOOGLE-WILLOW-001", "count": 250000,
+                               "ip_base": "172.217.14"}]}
+    """
+    rng = random.Random(config.get("seed"))
+    index_by_id = {d.device_id: i for i, d in enumerate(catalogue)}
+    fleet = MiningTopology(models=[(d.device_type, d.hashrate_ehs) for d in catalogue])
+    for spec in config["fleet"]:
+        model = index_by_id[spec["prototype"]]
+        prototype = catalogue[model]
+        fleet.add_group(
+            spec.get("name", spec["prototype"]),
+            prototype.hashrate_ehs * spec["count"],
+            spec["count"],
+            spec.get("ip_base", prototype.ip_address.rsplit(".", 1)[0]),
+            rng,
+            model=model,
+            prototype=prototype.device_id,
+        )
+    return fleet
+
+
+class QuantumDevicePolicy(MinerPolicy):
+    """Quantum devices win blocks by hashrate and every reward goes to one wallet (audited per block)"""
 
-    def __init__(self, reward_address: str):
-        self.chain: List[Block] = []
-        self.mempool: List[Transaction] = []
-        self.balances = defaultdict(float)
-        self.difficulty = INITIAL_DIFFICULTY
+    def __init__(self, reward_address: str, devices: List[QuantumDevice],
+                 fleet: Optional[MiningTopology] = None):
         self.reward_address = reward_address
-        self.reward_audit_log: List[RewardRecord] = []
+        self.devices = devices
+        self.sampler = WeightedSampler(devices, [d.hashrate_ehs for d in devices])
+        self.fleet = fleet
+        if fleet is not None:
+            self.fleet_sampler = WeightedSampler(fleet.groups, [g.weight for g in fleet.groups])
+        self.audit_log: List[RewardRecord] = []
         self.total_rewards_paid = 0.0
 
+    @property
+    def total_hashrate_ehs(self) -> float:
+        if self.fleet is not None:
+            return self.fleet_sampler.total_weight
+        return self.sampler.total_weight
+
+    def select(self) -> QuantumDevice:
+        """Select quantum device based on hashrate"""
+        if self.fleet is not None:
+            # Fleets share a prototype, so pick a fleet by hashrate then a device uniformly
+            group = self.fleet_sampler.draw()
+            index = self.fleet.random_device(group)
+            row = group.start + index
+            prototype = self.devices[self.fleet.devices.model[row]]
+            return replace(
+                prototype,
+                device_id=f"{prototype.device_id}-{index + 1:07d}",
+                ip_address=unpack_ip(self.fleet.devices.ip[row]),
+            )
+        return self.sampler.draw()
+
+    def address(self, device: QuantumDevice) -> str:
+        return self.reward_address
+
+    def label(self, device: QuantumDevice) -> str:
+        return device.device_type
+
+    def describe(self, device: QuantumDevice) -> List[str]:
+        return [
+            f"Device: {device.device_id}",
+            f"Qubits: {device.qubit_count if device.qubit_count > 0 else 'N/A (Classical)'}",
+            f"Quantum Volume: {device.quantum_volume if device.quantum_volume > 0 else 'N/A'}",
+            f"Hashrate: {device.hashrate_ehs:.2f} EH/s ({device.hashrate_ehs * 1000000:.0f} TH/s)",
+            f"Location: {device.location}",
+            f"IP: {device.ip_address}",
+        ]
+
+    def block_mined(self, block: Block, template: BlockTemplate, device: QuantumDevice,
+                    seconds: float) -> List[str]:
+        if device.qubit_count > 0:
+            advantage = f"Quantum advantage: {device.qubit_count} qubits, {device.quantum_volume}x volume"
+        else:
+            advantage = f"Classical exascale performance"
+
+        total_reward = template.reward + template.total_fees
+        self.audit_log.append(RewardRecord(
+            timestamp=datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f"),
+            block_height=block.index,
+            block_hash=block.hash,
+            recipient_address=self.reward_address,
+            quantum_device=device,
+            reward_amount=template.reward,
+            fee_amount=template.total_fees,
+            total_amount=total_reward,
+            mining_time_seconds=seconds,
+            nonce=block.nonce,
+            quantum_advantage=advantage
+        ))
+        self.total_rewards_paid += total_reward
+        return [f"💰 DEPOSITED TO: {self.reward_address}", f"⚛️  {advantage}"]
+
+
+class QuantumMiningNode(NodeCore):
+    """Bitcoin mining node powered by quantum computers"""
+
+    NODE_TYPE = "quantum"
+    DEFAULT_CONFIG = QUANTUM
+
+    def __init__(self, reward_address: str, fleet: Optional[Dict[str, Any]] = None,
+                 config: Optional[NodeConfig] = None, verbose: bool = False):
+        self.reward_address = reward_address
+
         # Create quantum computing devices
         self.quantum_devices = self._initialize_quantum_hardware()
 
-        # Create genesis block
-        genesis_tx = Transaction.create("GENESIS", "GENESIS", 0, 0)
-        genesis_device = self.quantum_devices[0]
-        genesis_block = self._create_genesis_block(genesis_tx, genesis_device)
-        self.chain.append(genesis_block)
+        # Optional large fleet of catalogue devices (array-backed, see build_quantum_fleet)
+        self.fleet: Optional[MiningTopology] = None
+        if fleet is not None:
+            self.fleet = build_quantum_fleet(self.quantum_devices, fleet)
+
+        policy = QuantumDevicePolicy(reward_address, self.quantum_devices, self.fleet)
+        super().__init__(policy, config, verbose)
 
+    def print_banner(self):
         print("=" * 80)
         print("⚛️  QUANTUM SUPERCOMPUTER MINING SYSTEM INITIALIZED")
         print("=" * 80)
-        print(f"🎯 All rewards will be sent to: {reward_address}")
-        print(f"⚛️  Quantum devices: {len(self.quantum_devices)}")
-        print(f"🌱 Genesis block: {genesis_block.hash}")
-        print(f"💪 Total hashrate: {sum(d.hashrate_ehs for d in self.quantum_devices):.2f} EH/s")
+        print(f"🎯 All rewards will be sent to: {self.reward_address}")
+        if self.fleet is not None:
+            print(f"⚛️  Quantum devices: {self.fleet.device_count:,} ({len(self.fleet.groups)} fleets)")
+        else:
+            print(f"⚛️  Quantum devices: {len(self.quantum_devices)}")
+        print(f"🌱 Genesis block: {self.latest_block.hash}")
+        print(f"💪 Total hashrate: {self.total_hashrate_ehs:.2f} EH/s")
         print("=" * 80)
         print()
 
@@ -264,164 +328,33 @@ class QuantumMiningNode:
         ]
         return devices
 
-    def _create_genesis_block(self, tx: Transaction, device: QuantumDevice) -> Block:
-        """Create genesis block"""
-        genesis = Block(
-            index=0,
-            timestamp=time.time(),
-            transactions=[tx],
-            previous_hash="0" * 64,
-            nonce=0,
-            hash="",
-            difficulty=self.difficulty,
-            miner=self.reward_address,
-            reward=0,
-            quantum_device=device
-        )
-        genesis.hash = self._calculate_hash(genesis)
-        return genesis
+    @property
+    def total_hashrate_ehs(self) -> float:
+        return self.policy.total_hashrate_ehs
 
-    def _calculate_hash(self, block: Block) -> str:
-        """Calculate block hash"""
-        block_string = f"{block.index}{block.timestamp}{[tx.txid for tx in block.transactions]}{block.previous_hash}{block.nonce}"
-        return hashlib.sha256(block_string.encode()).hexdigest()
+    @property
+    def reward_audit_log(self) -> List[RewardRecord]:
+        return self.policy.audit_log
 
-    def _select_quantum_device(self) -> QuantumDevice:
-        """Select quantum device based on hashrate"""
-        total_hashrate = sum(d.hashrate_ehs for d in self.quantum_devices)
-        rand = random.random() * total_hashrate
-        cumulative = 0
-        for device in self.quantum_devices:
-            cumulative += device.hashrate_ehs
-            if rand <= cumulative:
-                return device
-        return self.quantum_devices[-1]
-
-    def mine_block(self) -> Block:
-        """Mine a block using quantum hardware"""
-        device = self._select_quantum_device()
-
-        # Select transactions from mempool
-        selected_txs = sorted(self.mempool, key=lambda tx: tx.fee, reverse=True)[:50]
-        total_fees = sum(tx.fee for tx in selected_txs)
-
-        # Calculate block reward
-        halvings = len(self.chain) // HALVING_INTERVAL
-        block_reward = BLOCK_REWARD / (2 ** halvings)
-        total_reward = block_reward + total_fees
-
-        # Create coinbase transaction (ALL rewards to user's wallet)
-        coinbase = Transaction.create("COINBASE", self.reward_address, total_reward, 0)
-        all_txs = [coinbase] + selected_txs
-
-        print(f"\n⚛️  [{device.device_type}] Mining block {len(self.chain)}...")
-        print(f"   Device: {device.device_id}")
-        print(f"   Qubits: {device.qubit_count if device.qubit_count > 0 else 'N/A (Classical)'}")
-        print(f"   Quantum Volume: {device.quantum_volume if device.quantum_volume > 0 else 'N/A'}")
-        print(f"   Hashrate: {device.hashrate_ehs:.2f} EH/s ({device.hashrate_ehs * 1000000:.0f} TH/s)")
-        print(f"   Location: {device.location}")
-        print(f"   IP: {device.ip_address}")
-        print(f"   Transactions: {len(selected_txs)} (fees: {total_fees:.8f} BTC)")
-        print(f"   Difficulty: {self.difficulty} leading zeros")
-
-        # Mine the block (quantum speedup simulation)
-        start_time = time.time()
-        new_block = Block(
-            index=len(self.chain),
-            timestamp=time.time(),
-            transactions=all_txs,
-            previous_hash=self.chain[-1].hash,
-            nonce=0,
-            hash="",
-            difficulty=self.difficulty,
-            miner=self.reward_address,
-            reward=total_reward,
-            quantum_device=device
-        )
+    @property
+    def total_rewards_paid(self) -> float:
+        return self.policy.total_rewards_paid
 
-        # Quantum computers can try exponentially more solutions
-        quantum_speedup = device.hashrate_ehs * 10
-        attempts = 0
-        while True:
-            new_block.nonce = attempts
-            new_block.hash = self._calculate_hash(new_block)
-            if new_block.hash[:self.difficulty] == "0" * self.difficulty:
+    def set_device_hashrate(self, device_id: str, hashrate_ehs: float):
+        """Change a device's hashrate and rebuild the samplers (fleets of that prototype scale with it)"""
+        for model, device in enumerate(self.quantum_devices):
+            if device.device_id == device_id:
+                device.hashrate_ehs = hashrate_ehs
                 break
-            attempts += 1
-
-        mining_time = time.time() - start_time
-
-        # Determine quantum advantage
-        if device.qubit_count > 0:
-            advantage = f"Quantum advantage: {device.qubit_count} qubits, {device.quantum_volume}x volume"
         else:
-            advantage = f"Classical exascale performance"
-
-        print(f"✅ Block {new_block.index} mined in {mining_time:.4f}s ({attempts:,} attempts)")
-        print(f"   Hash: {new_block.hash}")
-        print(f"   Reward: {block_reward:.8f} BTC + {total_fees:.8f} fees")
-        print(f"   💰 DEPOSITED TO: {self.reward_address}")
-        print(f"   ⚛️  {advantage}")
-
-        # Record reward in audit log
-        reward_record = RewardRecord(
-            timestamp=datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f"),
-            block_height=new_block.index,
-            block_hash=new_block.hash,
-            recipient_address=self.reward_address,
-            quantum_device=device,
-            reward_amount=block_reward,
-            fee_amount=total_fees,
-            total_amount=total_reward,
-            mining_time_seconds=mining_time,
-            nonce=new_block.nonce,
-            quantum_advantage=advantage
-        )
-        self.reward_audit_log.append(reward_record)
-        self.total_rewards_paid += total_reward
-
-        # Update balances
-        self.balances[self.reward_address] += total_reward
-
-        # Credit transaction recipients
-        for tx in selected_txs:
-            if tx.from_addr != "COINBASE":
-                self.balances[tx.to_addr] += tx.amount
-
-        # Remove mined transactions
-        for tx in selected_txs:
-            if tx in self.mempool:
-                self.mempool.remove(tx)
-
-        # Add to chain
-        self.chain.append(new_block)
-
-        # Adjust difficulty
-        if len(self.chain) % DIFFICULTY_ADJUSTMENT_INTERVAL == 0:
-            self.adjust_difficulty()
-
-        return new_block
-
-    def adjust_difficulty(self):
-        """Adjust mining difficulty"""
-        if len(self.chain) < DIFFICULTY_ADJUSTMENT_INTERVAL:
-            return
-
-        recent_blocks = self.chain[-DIFFICULTY_ADJUSTMENT_INTERVAL:]
-        time_taken = recent_blocks[-1].timestamp - recent_blocks[0].timestamp
-        expected_time = TARGET_BLOCK_TIME * DIFFICULTY_ADJUSTMENT_INTERVAL
-
-        ratio = expected_time / time_taken if time_taken > 0 else 1
-
-        old_difficulty = self.difficulty
-
-        if ratio < 0.5 and self.difficulty < MAX_DIFFICULTY:
-            self.difficulty += 1
-            print(f"\n⚡ DIFFICULTY INCREASED: {old_difficulty} → {self.difficulty}")
-            print(f"   Quantum systems mining {1/ratio:.2f}x too fast!")
-        elif ratio > 2.0 and self.difficulty > 1:
-            self.difficulty -= 1
-            print(f"\n📉 DIFFICULTY DECREASED: {old_difficulty} → {self.difficulty}")
+            raise KeyError(f"Unknown quantum device: {device_id}")
+        self.policy.sampler.rebuild([d.hashrate_ehs for d in self.quantum_devices])
+        if self.fleet is not None:
+            self.fleet.models[model] = (device.device_type, hashrate_ehs)
+            for group in self.fleet.groups:
+                if group.attrs.get("prototype") == device_id:
+                    group.weight = hashrate_ehs * len(group)
+            self.policy.fleet_sampler.rebuild([g.weight for g in self.fleet.groups])
 
     def print_status(self):
         """Print current status"""
@@ -430,9 +363,9 @@ class QuantumMiningNode:
         print("=" * 80)
         print(f"Block Height:      {len(self.chain) - 1}")
         print(f"Latest Hash:       {self.chain[-1].hash[:32]}...")
-        print(f"Difficulty:        {self.difficulty} leading zeros")
+        print(f"Difficulty:        {self.current_difficulty:,.2f} (bits {self.current_bits:#010x})")
         print(f"Total Rewards:     {self.total_rewards_paid:.8f} BTC")
-        print(f"Wallet Balance:    {self.balances[self.reward_address]:.8f} BTC")
+        print(f"Wallet Balance:    {self.get_balance(self.reward_address):.8f} BTC")
         print(f"Recipient:         {self.reward_address}")
         print(f"Blocks Mined:      {len(self.reward_audit_log)}")
         print("=" * 80)
@@ -444,7 +377,7 @@ class QuantumMiningNode:
             'total_rewards_paid': self.total_rewards_paid,
             'total_blocks_mined': len(self.chain) - 1,
             'total_audit_records': len(self.reward_audit_log),
-            'wallet_balance': self.balances[self.reward_address],
+            'wallet_balance': self.get_balance(self.reward_address),
             'export_timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
             'quantum_devices': [
                 {
@@ -456,6 +389,14 @@ class QuantumMiningNode:
             ],
             'records': [record.to_dict() for record in self.reward_audit_log]
         }
+        if self.fleet is not None:
+            audit_data['quantum_fleets'] = [
+                {
+                    'prototype': g.attrs['prototype'],
+                    'devices': len(g),
+                    'hashrate_ehs': g.weight
+                } for g in self.fleet.groups
+            ]
 
         with open(filename, 'w') as f:
             json.dump(audit_data, f, indent=2)
@@ -464,7 +405,8 @@ class QuantumMiningNode:
         print(f"   Total rewards paid to {self.reward_address}: {self.total_rewards_paid:.8f} BTC")
 
 
-if __name__ == "__main__":
+def main():
+    """Run the quantum mining simulation"""
     # Wallet address containing "78"
     WALLET = "bc1q8z6z78dy5squapjpkeruem98jcezsw37hnae6qjyhxma6jmxyn6qsmqxce"
 
@@ -476,7 +418,7 @@ if __name__ == "__main__":
     print("=" * 80)
     print()
 
-    node = QuantumMiningNode(reward_address=WALLET)
+    node = QuantumMiningNode(reward_address=WALLET, config=load_config(QUANTUM), verbose=True)
 
     # Mine 20 blocks
     for i in range(20):
@@ -489,4 +431,8 @@ if __name__ == "__main__":
     node.export_audit_log()
 
     print("\n✅ Quantum mining simulation complete!")
-    print(f"💰 Total BTC in wallet {WALLET}: {node.balances[WALLET]:.8f}")
+    print(f"💰 Total BTC in wallet {WALLET}: {node.get_balance(WALLET):.8f}")
+
+
+if __name__ == "__main__":
+    main()
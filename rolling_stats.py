@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+ROLLING CHAIN STATISTICS
+========================
+
+Status figures kept up to date as blocks are connected, so reading them is
+O(1) no matter how long the chain gets:
+- RollingWindow: fixed-size window with a running total (add, pop, mean)
+- ChainStats: per-pool observed hashrate (attempts / seconds of the pool's
+  own proof of work), network hashrate from block work over block
+  intervals (like getnetworkhashps), average block interval, fork rate,
+  fee rate and throughput over the last `window` blocks
+- Incremental validity: each connected block is checked against its parent
+  once, so "chain valid" never rescans the chain
+
+Disconnecting a block pops it from every window; windows that had already
+forgotten older blocks simply cover fewer blocks until refilled.
+
+NO REAL BITCOIN. NO REAL NETWORK. PURELY EDUCATIONAL.
+"""
+
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+
+from block_assembly import SATOSHIS_PER_BTC
+
+DEFAULT_WINDOW = 144        # A day of mainnet blocks
+
+
+class RollingWindow:
+    """Last `size` values with a running total"""
+
+    def __init__(self, size: int = DEFAULT_WINDOW):
+        self.size = size
+        self.values: Deque[float] = deque()
+        self.total = 0.0
+
+    def add(self, value: float):
+        if len(self.values) == self.size:
+            self.total -= self.values.popleft()
+        self.values.append(value)
+        self.total += value
+
+    def pop(self) -> float:
+        """Remove the newest value (undo the last add)"""
+        value = self.values.pop()
+        self.total -= value
+        return value
+
+    def mean(self) -> float:
+        return self.total / len(self.values) if self.values else 0.0
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+
+class ChainStats:
+    """Rolling statistics fed by a node's connect / disconnect / solve / reorg events"""
+
+    def __init__(self, window: int = DEFAULT_WINDOW):
+        self.window = window
+        self.intervals = RollingWindow(window)      # Seconds between consecutive blocks
+        self.work = RollingWindow(window)           # Expected hashes per block
+        self.fees = RollingWindow(window)           # BTC per block
+        self.vsize = RollingWindow(window)          # vbytes per block (non-coinbase)
+        self.txs = RollingWindow(window)
+        self.pool_attempts: Dict[str, RollingWindow] = {}
+        self.pool_seconds: Dict[str, RollingWindow] = {}
+        self.reorg_heights: Deque[int] = deque()
+        self.tip_height = 0
+        self.invalid_height: Optional[int] = None   # Lowest connected block that failed its check
+
+    @classmethod
+    def from_chain(cls, chain: List, window: int = DEFAULT_WINDOW) -> "ChainStats":
+        """Stats for an existing chain (replays only the last `window` blocks)"""
+        stats = cls(window)
+        start = max(1, len(chain) - window)
+        for prev, block in zip(chain[start - 1:], chain[start:]):
+            stats.connect(block, prev)
+        stats.tip_height = len(chain) - 1
+        return stats
+
+    # ---------- Events ----------
+
+    def record_solve(self, pool: str, attempts: int, seconds: float):
+        """Proof of work done locally by `pool` (attempts hashed in `seconds`)"""
+        if pool not in self.pool_attempts:
+            self.pool_attempts[pool] = RollingWindow(self.window)
+            self.pool_seconds[pool] = RollingWindow(self.window)
+        self.pool_attempts[pool].add(attempts)
+        self.pool_seconds[pool].add(seconds)
+
+    def connect(self, block, prev):
+        """`block` was connected on top of `prev`"""
+        txs = block.transactions[1:]
+        if prev.index > 0:  # The genesis timestamp is fixed, so it does not time block 1
+            self.intervals.add(max(block.timestamp - prev.timestamp, 0.0))
+            self.work.add(block.work())
+        self.fees.add(sum(tx.fee for tx in txs))
+        self.vsize.add(sum(tx.size for tx in txs))
+        self.txs.add(len(txs))
+        self.tip_height = block.index
+        if self.invalid_height is None and not (
+                block.previous_hash == prev.hash and block.meets_difficulty()
+                and block.hash == block.compute_hash()):
+            self.invalid_height = block.index
+
+    def disconnect(self, block):
+        timed = (self.intervals, self.work) if block.index > 1 else ()
+        for window in timed + (self.fees, self.vsize, self.txs):
+            if window:
+                window.pop()
+        self.tip_height = block.index - 1
+        if self.invalid_height == block.index:
+            self.invalid_height = None
+
+    def record_reorg(self):
+        """The active chain switched branches at the current tip"""
+        self.reorg_heights.append(self.tip_height)
+
+    # ---------- Figures ----------
+
+    @property
+    def chain_valid(self) -> bool:
+        return self.invalid_height is None
+
+    def avg_block_interval(self) -> float:
+        return self.intervals.mean()
+
+    def network_hashrate(self) -> float:
+        """Expected hashes per second behind the recent blocks"""
+        return self.work.total / self.intervals.total if self.intervals.total > 0 else 0.0
+
+    def pool_hashrate(self, pool: str) -> float:
+        """Observed hashes per second of `pool`'s own recent proof of work"""
+        seconds = self.pool_seconds.get(pool)
+        if seconds is None or seconds.total <= 0:
+            return 0.0
+        return self.pool_attempts[pool].total / seconds.total
+
+    def fork_rate(self) -> float:
+        """Reorgs per block over the window"""
+        while self.reorg_heights and self.reorg_heights[0] <= self.tip_height - self.window:
+            self.reorg_heights.popleft()
+        return len(self.reorg_heights) / max(min(self.tip_height, self.window), 1)
+
+    def fee_rate(self) -> float:
+        """Average sat/vB paid in the window"""
+        return self.fees.total * SATOSHIS_PER_BTC / self.vsize.total if self.vsize.total > 0 else 0.0
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "window_blocks": len(self.intervals),
+            "avg_block_interval": self.avg_block_interval(),
+            "network_hashrate": self.network_hashrate(),
+            "fork_rate": self.fork_rate(),
+            "fee_rate": self.fee_rate(),
+            "txs_per_block": self.txs.mean(),
+            "chain_valid": self.chain_valid,
+        }
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Tests for the per-address history index
+"""
+
+import sys
+
+from address_index import AddressIndex
+from bitcoin_simulator import MainnetNode, Transaction
+
+
+def test_history_pages_and_point_in_time_balances():
+    """Entries page newest first and balance_at answers for any height"""
+    index = AddressIndex()
+    for height in range(1, 101):
+        index.add_entry("alice", height, f"tx{height}", 1.0 if height % 4 else -2.0)
+
+    assert index.tx_count("alice") == 100 and index.balance("alice") == 75 * 1.0 - 25 * 2.0
+    assert index.balance_at("alice", 0) == 0.0 and index.balance_at("alice", 4) == 1.0
+    assert index.balance_at("alice", 10_000) == index.balance("alice")
+
+    page = index.history("alice", page=1, page_size=30)
+    assert [e.height for e in page] == list(range(70, 40, -1)), "Page 1 should hold entries 70..41"
+    assert [e.txid for e in index.history("alice", 0, 3, newest_first=False)] == ["tx1", "tx2", "tx3"]
+    assert index.history("alice", page=4, page_size=30) == []
+
+    summary = index.summary("alice")
+    assert summary["received"] == 75.0 and summary["sent"] == 50.0
+    print("✓ History pages and point-in-time balances")
+
+
+def test_node_index_follows_connect_and_disconnect():
+    """The node's index gains and loses entries as blocks connect and disconnect"""
+    node = MainnetNode(verbose=False)
+    node.credit("alice", 5.0)
+    tx = Transaction.create("alice", "bob", 2.0, 0.5)
+    assert node.add_transaction(tx)
+
+    block = node.generate_block()
+    index = node.address_index
+    assert [e.txid for e in index.history("bob")] == [tx.txid]
+    assert index.balance("alice") == -2.5, "Index tracks confirmed deltas only"
+    assert index.balance(block.miner_address) == block.transactions[0].amount
+
+    node.disconnect_tip()
+    assert "bob" not in index and index.balance(block.miner_address) == 0.0
+    node.connect_block(block)
+    assert index.balance_at("bob", block.index) == 2.0 and index.balance_at("bob", block.index - 1) == 0.0
+    print("✓ Node index follows connect and disconnect")
+
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([__file__, "-q"]))
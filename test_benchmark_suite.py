@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Tests for the benchmark suite: result shape and baseline comparison
+"""
+
+import copy
+import json
+import sys
+
+from benchmark_suite import compare, percentile, results_document, run_suite
+
+TINY_MATRIX = {"difficulty": [1], "chain_length": [5], "workers": [2], "blocks": 3}
+
+
+def test_suite_reports_machine_readable_metrics():
+    """Every benchmark yields its rates, latencies and peak RSS as JSON"""
+    results = run_suite(TINY_MATRIX, only=["pow_mainnet", "pow_quantum", "mempool", "chain_valid", "validator"],
+                        progress=lambda line: None)
+    by_name = {r.name: r for r in results}
+    assert set(by_name) == {"pow_mainnet", "pow_quantum", "mempool", "chain_valid", "validator"}
+    pow_metrics = by_name["pow_mainnet"].metrics
+    for metric in ("hashes_per_s", "blocks_per_s", "p50_ms", "p99_ms"):
+        assert pow_metrics[metric] > 0, f"pow_mainnet should report {metric}"
+    assert pow_metrics["p99_ms"] >= pow_metrics["p50_ms"]
+    assert by_name["validator"].params == {"workers": 2}
+    assert "peak_rss_kb" in pow_metrics
+
+    document = json.loads(json.dumps(results_document(results, TINY_MATRIX)))
+    assert document["meta"]["hash_backend"] == "hashlib" and len(document["results"]) == 5
+    assert percentile([5, 1, 4, 2, 3], 50) == 3 and percentile([5, 1, 4, 2, 3], 99) == 5
+    print("✓ Suite reports machine-readable metrics")
+
+
+def test_baseline_comparison_flags_regressions():
+    """Slower rates or higher gated latencies beyond the tolerance are regressions"""
+    results = run_suite(TINY_MATRIX, only=["pow_mainnet", "validator"], progress=lambda line: None)
+    baseline = results_document(results, TINY_MATRIX)
+    assert compare(results, baseline) == [], "A run never regresses against itself"
+
+    faster = copy.deepcopy(baseline)
+    faster["results"][0]["metrics"]["hashes_per_s"] *= 3
+    faster["results"][1]["metrics"]["p99_ms"] /= 3
+    faster["results"][1]["metrics"]["p50_ms"] /= 3  # Reported only, not gated
+    regressions = compare(results, faster, tolerance=0.5)
+    assert {(r["benchmark"], r["metric"]) for r in regressions} == {
+        ("pow_mainnet difficulty=1", "hashes_per_s"), ("validator workers=2", "p99_ms")}
+    assert all(r["slowdown"] > 0.5 for r in regressions)
+    print("✓ Baseline comparison flags regressions")
+
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Tests for batch transfers through a single node
+"""
+
+import json
+import math
+import random
+import sys
+
+from block_assembly import COINBASE_SIZE, WITNESS_SCALE_FACTOR
+from bitcoin_simulator import MainnetNode
+from bitcoin_transfer import TransferResult, batch_transfer, load_transfers
+from node_config import MAINNET
+
+
+def test_csv_batch_confirms_in_few_blocks(tmp_path):
+    """Valid rows are confirmed by one node in as few blocks as the weight limit allows"""
+    path = tmp_path / "payouts.csv"
+    rows = ["from,to,amount,fee"] + [f"Payer{i % 3},miner_{i},0.01," for i in range(300)]
+    rows += ["Payer0,,1", "Payer1,x,abc", "Payer2,y,-1"]
+    path.write_text("\n".join(rows) + "\n")
+
+    node = MainnetNode(verbose=False)
+    results = batch_transfer(load_transfers(str(path)), node=node)
+
+    confirmed = [r for r in results if r.status == "confirmed"]
+    assert len(confirmed) == 300 and [r.line for r in results if r.status == "invalid"] == [302, 303, 304]
+    assert node.get_balance("miner_7") == 0.01 and len(node.mempool) == 0
+
+    # Greedy filling may leave a gap smaller than one tx per block
+    blocks = {r.block for r in confirmed}
+    tx_weight = sum(tx.size * WITNESS_SCALE_FACTOR for b in node.chain[1:] for tx in b.transactions[1:])
+    needed = math.ceil(tx_weight / (node.config.max_block_weight - COINBASE_SIZE * WITNESS_SCALE_FACTOR))
+    assert len(blocks) <= needed * 1.2 + 1, f"{len(blocks)} blocks used, weight needs about {needed}"
+    print("✓ CSV batch confirms in few blocks")
+
+
+def test_jsonl_batch_reports_rejections(tmp_path):
+    """Without funding, overdrawn transfers are rejected per row"""
+    path = tmp_path / "payouts.jsonl"
+    path.write_text("\n".join(json.dumps({"from": "alice", "to": f"u{i}", "amount": 4.0, "fee": 0.0})
+                              for i in range(3)) + "\n")
+    node = MainnetNode(verbose=False)
+    node.credit("alice", 10.0)
+
+    results = batch_transfer(load_transfers(str(path)), node=node, fund_missing=False)
+    assert [r.status for r in results] == ["confirmed", "confirmed", "rejected"]
+    assert results[2].error == "insufficient funds" and node.get_balance("alice") == 2.0
+    print("✓ JSON-lines batch reports rejections")
+
+
+
+def test_batch_larger_than_the_mempool_confirms_everything():
+    """Transfers beyond the mempool cap wait for a block instead of evicting accepted ones"""
+    rng = random.Random(4)
+    node = MainnetNode(config=MAINNET.replace(initial_difficulty=1, max_mempool_vbytes=40_000,
+                                              max_mempool_txs=250))
+    transfers = [TransferResult(i, f"payer_{i % 7}", f"payee_{i}", 0.01, rng.randint(1, 500) * 1e-6)
+                 for i in range(1, 1201)]
+    results = batch_transfer(transfers, node=node)
+    assert all(r.status == "confirmed" for r in results), \
+        f"{sum(r.status != 'confirmed' for r in results)} funded transfers not confirmed"
+    assert len(node.mempool) == 0 and node.get_balance("payee_1200") == 0.01
+    print("✓ Batch larger than the mempool confirms everything")
+
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Tests for the incremental block template used by MainnetNode.mine_block
+"""
+
+import sys
+
+import pytest
+
+from bitcoin_simulator import MainnetNode, Transaction
+from block_assembly import fee_rate, select_transactions, tx_weight
+from node_config import MAINNET
+
+MAX_BLOCK_WEIGHT = MAINNET.max_block_weight
+
+
+def test_template_tracks_highest_fee_rate_transactions():
+    """Template selection matches a full fee-rate assembly of the mempool"""
+    node = MainnetNode()
+    for i in range(40):
+        node.credit(f"user_{i}", 10.0)
+        node.add_transaction(Transaction.create(f"user_{i}", "sink", 1.0, fee=0.0001 * ((i * 7) % 13 + 1)))
+
+    expected, _ = select_transactions(node.mempool, MAX_BLOCK_WEIGHT)
+    assert node.block_template.selected_transactions() == expected, "Template should match block assembly"
+    print("✓ Template selection matches fee-rate assembly")
+
+
+def test_assembly_respects_weight_limit():
+    """Greedy fill stays within the weight budget and prefers high fee rates"""
+    txs = [Transaction.create("a", "b", 1.0, fee=0.00001 * (i + 1), size=140 + 25 * (i % 11))
+           for i in range(200)]
+    selected, weight = select_transactions(txs, MAX_BLOCK_WEIGHT)
+
+    assert weight <= MAX_BLOCK_WEIGHT, "Block weight should not exceed the limit"
+    assert weight >= sum(tx_weight(tx) for tx in selected), "Weight should cover selected transactions"
+    lowest_selected = min(fee_rate(tx) for tx in selected)
+    for tx in txs:
+        if tx not in selected and fee_rate(tx) > lowest_selected:
+            assert weight + tx_weight(tx) > MAX_BLOCK_WEIGHT, "Skipped higher-rate tx should not fit"
+    print("✓ Block assembly respects weight limit")
+
+
+def test_mined_block_hash_matches_full_header():
+    """Midstate hashing produces the same hash as Block.compute_hash"""
+    node = MainnetNode(config=MAINNET.replace(propagation_delay=0))
+    for i in range(15):
+        node.credit(f"user_{i}", 10.0)
+        node.add_transaction(Transaction.create(f"user_{i}", "sink", 1.0, fee=0.0001 * (i + 1)))
+
+    block = node.mine_block()
+    mined = len(block.transactions) - 1
+    assert block.hash == block.compute_hash(), "Template hash should match full header hash"
+    template = node.create_block_template(node.mining_pools[0])
+    template.block.nonce = 7
+    assert template.header_prefix + b"7" + template.header_suffix == template.block.header().encode(), \
+        "Prefix + nonce + suffix should be the full header"
+    assert 0 < mined < 15, "Block should hold a weight-limited subset of the mempool"
+    assert len(node.mempool) == 15 - mined and len(node.block_template) == 15 - mined, \
+        "Mined txs should leave mempool and template"
+    assert node.is_chain_valid(), "Chain should be valid"
+    print("✓ Mined block hash matches full header hash")
+
+
+
+def test_template_on_a_competing_parent():
+    """A template on a fork's other branch skips that branch's txs and leaves the active chain alone"""
+    node = MainnetNode(config=MAINNET.replace(initial_difficulty=1, propagation_delay=0))
+    genesis = node.latest_block
+    tip = node.generate_block()
+    node.credit("alice", 10.0)
+    tx = Transaction.create("alice", "bob", 1.0, fee=0.001)
+    node.add_transaction(tx)
+    rival = node.block_template.build(index=1, previous_hash=genesis.hash, timestamp=tip.timestamp,
+                                      bits=tip.bits, miner_address="rival", reward=6.25).block
+    rival.hash = rival.compute_hash()
+    assert tx in rival.transactions
+
+    template = node.create_block_template(node.mining_pools[0], parent=rival)
+    assert template.block.index == 2 and template.block.previous_hash == rival.hash
+    assert tx not in template.block.transactions, "The rival already confirmed it"
+    assert tx in node.create_block_template(node.mining_pools[0]).block.transactions, "Still pending on the tip"
+    assert node.latest_block is tip and tx in node.mempool, "Active chain untouched"
+    with pytest.raises(ValueError):
+        node.create_block_template(node.mining_pools[0], parent=genesis)
+    print("✓ Template on a competing parent")
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Tests for the fixed genesis block and deterministic chain fixtures
+"""
+
+import os
+import random
+import sys
+
+import pytest
+
+from bitcoin_simulator import MainnetNode
+from bitcoin_simulator_tracked import TrackedMainnetNode
+from chain_fixtures import FIXTURE_WALLET, build_chain, default_fixture_dir, fixture_path, load_fixture
+from node_config import MAINNET, QUANTUM
+from node_core import GENESIS_TIMESTAMP, genesis_block
+from quantum_miner import QuantumMiningNode
+
+
+def test_genesis_is_fixed_per_initial_difficulty():
+    """Every node and every run of a config starts from the same genesis block"""
+    mainnet, tracked = MainnetNode(), TrackedMainnetNode()
+    quantum = QuantumMiningNode("wallet", config=QUANTUM.replace(initial_difficulty=MAINNET.initial_difficulty))
+    assert mainnet.chain[0].hash == tracked.chain[0].hash == quantum.chain[0].hash
+    assert mainnet.chain[0] == genesis_block(MAINNET.initial_difficulty)
+    assert mainnet.chain[0].timestamp == GENESIS_TIMESTAMP
+    assert QuantumMiningNode("wallet").chain[0].hash != mainnet.chain[0].hash, "Own target, own genesis"
+
+    state = random.getstate()
+    first, second = build_chain(12, 1, txs_per_block=3), build_chain(12, 1, txs_per_block=3)
+    assert random.getstate() == state, "Fixtures leave the caller's random state alone"
+    assert [b.hash for b in first.chain] == [b.hash for b in second.chain], "Same seed, same chain"
+    assert build_chain(12, 1, seed=1).latest_block.hash != first.latest_block.hash
+    assert all(len(b.transactions) == 4 for b in first.chain[1:])
+    print("✓ Genesis is fixed per initial difficulty")
+
+
+def test_fixtures_are_cached_and_loaded(tmp_path, monkeypatch):
+    """load_fixture mines a missing fixture once into the user cache, then restores it from disk"""
+    monkeypatch.delenv("SIM_FIXTURE_DIR", raising=False)
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    assert default_fixture_dir() == str(tmp_path / "cache" / "bitcoin-simulator" / "fixtures")
+    monkeypatch.setenv("SIM_FIXTURE_DIR", str(tmp_path))
+    assert default_fixture_dir() == str(tmp_path), "The environment overrides the cache"
+
+    path = fixture_path(30, 2)
+    assert not os.path.exists(path) and path.startswith(str(tmp_path))
+    mined = load_fixture(30, 2)
+    assert os.path.exists(path)
+    os.utime(path, (0, 0))
+    loaded = load_fixture(30, 2, directory=str(tmp_path))
+    assert os.path.getmtime(path) == 0, "Second load reads the cached file"
+
+    assert [b.hash for b in loaded.chain] == [b.hash for b in mined.chain]
+    assert loaded.chain_height == 30 and loaded.is_chain_valid()
+    assert all(b.hash.startswith("00") for b in loaded.chain[1:])
+    assert loaded.get_balance(FIXTURE_WALLET) == pytest.approx(mined.get_balance(FIXTURE_WALLET))
+
+    tip = loaded.latest_block
+    block = loaded.generate_block()
+    assert block.previous_hash == tip.hash and block.timestamp >= tip.timestamp, "Virtual clock resumes at the tip"
+    print("✓ Fixtures are cached and loaded")
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Tests for hash-keyed block/transaction lookups and confirmations
+"""
+
+import sys
+
+from bitcoin_simulator import MainnetNode, Transaction
+from blockchain_validator import BlockchainValidator
+
+
+def test_lookups_and_confirmations_follow_the_tip():
+    """Blocks and txs are found by hash; confirmations are tip - height + 1"""
+    node = MainnetNode(verbose=False)
+    node.credit("alice", 5.0)
+    tx = Transaction.create("alice", "bob", 1.0)
+    node.add_transaction(tx)
+    assert node.get_transaction(tx.txid) is tx and node.get_confirmations(tx.txid) == 0
+
+    first = node.generate_block()
+    node.generate_block()
+    node.generate_block()
+    assert node.get_block_by_hash(first.hash) is first
+    assert node.get_confirmations(first.hash) == 3 and node.get_confirmations(tx.txid) == 3
+
+    node.disconnect_tip()
+    assert node.get_confirmations(first.hash) == 2
+    for _ in range(2):
+        node.disconnect_tip()
+    assert node.get_block_by_hash(first.hash) is None and node.get_confirmations(tx.txid) == 0
+    assert node.get_transaction(tx.txid) is tx, "Disconnected txs are found in the mempool again"
+    print("✓ Lookups and confirmations follow the tip")
+
+
+def test_validator_reports_real_confirmations():
+    """The validator reads confirmations from the chain instead of guessing"""
+    node = MainnetNode(verbose=False)
+    blocks = [node.generate_block() for _ in range(7)]
+    validator = BlockchainValidator(chain_index=node.chain_index)
+    assert validator.simulate_network_consensus(blocks[0].hash)[0] == 7
+    confirmations, status = validator.simulate_network_consensus(blocks[-1].hash)
+    assert confirmations == 1 and status.startswith("PENDING")
+
+    audit = BlockchainValidator(tip_height=20)
+    assert audit.simulate_network_consensus("unknown", 15)[0] == 6
+    print("✓ Validator reports real confirmations")
+
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([__file__, "-q"]))
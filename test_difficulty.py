@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Tests for compact targets, proportional retargeting and chainwork
+"""
+
+import sys
+
+import pytest
+
+from bitcoin_simulator import MainnetNode
+from difficulty import (
+    POW_LIMIT, bits_to_difficulty, bits_to_target, bits_to_zeros, block_work, retarget,
+    target_to_bits, zeros_to_bits,
+)
+from headers import HeaderChain
+
+
+def test_compact_bits_and_retarget():
+    """nBits round-trips, matches the leading-zero rule and retargets in proportion"""
+    for zeros in range(1, 8):
+        bits = zeros_to_bits(zeros)
+        assert bits_to_target(bits) == 16 ** (64 - zeros), f"{zeros} zeros should be exact"
+        assert bits_to_zeros(bits) == pytest.approx(zeros)
+    assert bits_to_difficulty(zeros_to_bits(3)) == pytest.approx(256.0)
+    assert target_to_bits(0x00ffff << 208) == 0x1d00ffff, "Bitcoin's difficulty-1 target"
+    assert block_work(zeros_to_bits(4)) > block_work(zeros_to_bits(3))
+
+    bits = zeros_to_bits(3)
+    assert bits_to_difficulty(retarget(bits, 50, 100)) == pytest.approx(512.0, rel=1e-4)
+    assert bits_to_difficulty(retarget(bits, 130, 100)) == pytest.approx(256 / 1.3, rel=1e-4)
+    assert bits_to_difficulty(retarget(bits, 1, 100)) == pytest.approx(1024.0, rel=1e-4), "Clamped to 4x"
+    assert bits_to_difficulty(retarget(bits, 10_000, 100)) == pytest.approx(64.0, rel=1e-4)
+    assert bits_to_target(retarget(zeros_to_bits(1), 10_000, 100)) == POW_LIMIT
+    assert retarget(bits, 1e-7, 2e-7) == retarget(bits, 50, 100), "Sub-microsecond timespans scale too"
+    for expected in (0, -1.0):
+        with pytest.raises(ValueError):
+            retarget(bits, 10, expected)
+    print("✓ Compact bits and retarget")
+
+
+def test_node_retargets_and_chainwork_picks_branch():
+    """Nodes move difficulty smoothly; the branch with more work wins, not the longer one"""
+    node = MainnetNode(verbose=False)
+    start = node.current_difficulty
+    for _ in range(10):
+        node.generate_block()
+    node.adjust_difficulty()
+    assert node.current_difficulty == pytest.approx(start * 4, rel=1e-4), "Fast blocks: one 4x step"
+
+    work = node.chainwork
+    block = node.generate_block()
+    assert node.chainwork == work + block.work()
+    node.disconnect_tip()
+    assert node.chainwork == work and node.chain_index.chainwork(block.hash) == 0
+
+    easy = MainnetNode(verbose=False)
+    hard = MainnetNode(verbose=False)
+    hard.set_genesis(easy.chain[0])
+    hard.current_bits = zeros_to_bits(4)
+    for _ in range(5):
+        easy.generate_block()
+    for _ in range(2):
+        hard.generate_block()
+    chain = HeaderChain.from_blocks(easy.chain)
+    assert chain.add_headers(hard.get_headers(1)) == 2, "Two 16x blocks outweigh five"
+    assert chain.tip.hash == hard.latest_block.hash and chain.chainwork == hard.chainwork
+    print("✓ Node retargets and chainwork picks branch")
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Tests for the pluggable hash backends
+"""
+
+import hashlib
+import sys
+
+import pytest
+
+import hash_backend
+from bitcoin_simulator import MainnetNode
+from hash_backend import HashBackend, HashBackendError, ParallelBackend, self_test, set_backend
+from headers import HeaderChain
+
+
+class _BrokenBackend(HashBackend):
+    name = "broken"
+
+    def sha256d_hex(self, data: bytes) -> str:
+        return hashlib.sha256(data).hexdigest()  # Forgets the second round
+
+
+def test_backends_match_reference_and_bad_ones_are_refused(monkeypatch):
+    """Self-test passes for real backends and blocks a wrong one from being selected"""
+    reference = HashBackend()
+    assert reference.sha256d_hex(b"") == "5df6e0e2761359d30a8275058e299fcc0381534545f55cf43e41983f5d4c9456"
+    self_test(reference)
+
+    parallel = ParallelBackend(workers=2)
+    monkeypatch.setattr(hash_backend, "PARALLEL_MIN_BATCH", 8)
+    try:
+        self_test(parallel)
+        items = [str(i).encode() for i in range(100)]
+        assert parallel.sha256d_many(items) == reference.sha256d_many(items)
+    finally:
+        parallel.close()
+
+    hash_backend.register_backend("broken", _BrokenBackend)
+    try:
+        with pytest.raises(HashBackendError, match="sha256d"):
+            set_backend("broken")
+        with pytest.raises(HashBackendError, match="Unknown"):
+            set_backend("missing")
+    finally:
+        del hash_backend._factories["broken"]
+    print("✓ Backends match the reference; bad ones are refused")
+
+
+def test_chain_hashing_goes_through_active_backend(monkeypatch):
+    """Block hashes, PoW and header verification all use the selected backend"""
+    calls = {"single": 0, "batch": 0}
+
+    class CountingBackend(HashBackend):
+        name = "counting"
+
+        def sha256_hex(self, data):
+            calls["single"] += 1
+            return super().sha256_hex(data)
+
+        def sha256_many(self, items):
+            calls["batch"] += 1
+            return super().sha256_many(items)
+
+    monkeypatch.setattr(hash_backend, "_active", CountingBackend())
+    node = MainnetNode(verbose=False)
+    for _ in range(3):
+        node.generate_block()
+    assert node.is_chain_valid() and calls["single"] > 0
+    HeaderChain.from_blocks(node.chain)
+    assert calls["batch"] == 1, "Header verification should hash the whole batch in one call"
+    print("✓ Chain hashing goes through the active backend")
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Tests for header-only chains and headers-first sync
+"""
+
+import contextlib
+import dataclasses
+import io
+import sys
+
+import pytest
+
+from bitcoin_simulator import MainnetNode, Transaction
+from difficulty import zeros_to_bits
+from headers import BlockHeader, HeaderChain, HeaderError, HeaderSync, headers_first_sync
+from node_config import MAINNET
+
+
+def _node_with_blocks(count, genesis=None):
+    node = MainnetNode(verbose=False)
+    if genesis is not None:
+        node.set_genesis(genesis)
+    node.credit("alice", 20.0)
+    for _ in range(count):
+        node.add_transaction(Transaction.create("alice", "bob", 0.5))
+        node.generate_block()
+    return node
+
+
+def test_header_chain_verifies_pow_and_links():
+    """Bulk verification accepts a real chain and rejects tampered headers"""
+    node = _node_with_blocks(8)
+    chain = HeaderChain.from_blocks(node.chain)
+    assert chain.height == 8 and chain.tip.hash == node.latest_block.hash
+    assert chain.get(node.chain[3].hash).index == 3
+    assert all(h.matches(b) for h, b in zip(chain.headers, node.chain))
+
+    headers = node.get_headers(1)
+    forged = dataclasses.replace(headers[4], tx_root="f" * 64)
+    with pytest.raises(HeaderError, match="hash does not match"):
+        HeaderChain.verify_headers(headers[:4] + [forged], chain.headers[0])
+    cheap = dataclasses.replace(headers[0], bits=zeros_to_bits(1), nonce=0)
+    cheap = dataclasses.replace(cheap, hash=cheap.compute_hash())
+    with pytest.raises(HeaderError):
+        HeaderChain.verify_headers([cheap, headers[1]], chain.headers[0])
+
+    # A shorter competing branch is ignored, a longer one replaces the tail
+    fork = _node_with_blocks(10, genesis=node.chain[0])
+    assert chain.add_headers(fork.get_headers(1, 3)) == 0
+    assert chain.add_headers(fork.get_headers(1)) == 10
+    assert chain.tip.hash == fork.latest_block.hash and node.chain[5].hash not in chain
+    print("✓ Header chain verifies PoW and links")
+
+
+def test_headers_first_sync_reorgs_and_fetches_bodies():
+    """A diverged node syncs headers, rewinds to the fork and downloads bodies in parallel"""
+    peer = _node_with_blocks(12)
+    node = _node_with_blocks(3, genesis=peer.chain[0])
+    sync = headers_first_sync(node, peer, workers=4)
+    assert [b.hash for b in node.chain] == [b.hash for b in peer.chain]
+    assert node.get_balance("bob") == pytest.approx(peer.get_balance("bob"))
+    assert sync.bodies_downloaded == 12
+
+    # Lazy bodies: only the requested block is fetched
+    light = HeaderSync(HeaderChain(BlockHeader.from_block(peer.chain[0])),
+                       peer.get_headers, peer.get_block_by_hash)
+    assert light.sync_headers(batch=5) == 12
+    assert light.body(7) is peer.chain[7] and light.bodies_downloaded == 1
+    light.body(7)
+    assert light.bodies_downloaded == 1, "Cached body should not be fetched again"
+    print("✓ Headers-first sync reorgs and fetches bodies")
+
+
+def test_header_bits_must_follow_retargeting():
+    """Given the consensus config, a header chain that skips a retarget is rejected"""
+    config = MAINNET.replace(initial_difficulty=1, max_difficulty=2, difficulty_adjustment_interval=3,
+                             propagation_delay=0)
+    honest = MainnetNode(config=config)
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(7):
+            honest.mine_block()
+    assert honest.chain[4].bits != honest.chain[3].bits, "Fast blocks retarget after block 3"
+    chain = HeaderChain.from_blocks(honest.chain, config)
+    assert chain.height == 7 and chain.tip.hash == honest.latest_block.hash
+
+    cheap = MainnetNode(config=config)
+    cheap.set_genesis(honest.chain[0])
+    for _ in range(7):
+        cheap.generate_block()  # Never retargets: stays at minimum difficulty
+    with pytest.raises(HeaderError, match="retargeting"):
+        HeaderChain(chain.headers[0], config).add_headers(cheap.get_headers(1))
+    assert HeaderChain(chain.headers[0]).add_headers(cheap.get_headers(1)) == 7, "Without rules, PoW only"
+    print("✓ Header bits must follow retargeting")
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Tests for the bounded mempool (caps, fee-rate eviction, expiry and refunds)
+"""
+
+import sys
+
+from bitcoin_simulator import MainnetNode, Transaction
+from mempool import Mempool
+from node_config import MAINNET
+
+
+def test_lowest_fee_rate_is_evicted_and_refunded():
+    """A full mempool evicts the lowest fee rate and refunds its sender"""
+    node = MainnetNode(config=MAINNET.replace(max_mempool_txs=3))
+    for name in ("alice", "bob", "carol", "dave"):
+        node.credit(name, 1.0)
+
+    cheap = Transaction.create("alice", "x", 0.5, fee=0.00001, size=200)
+    assert node.add_transaction(cheap)
+    for name in ("bob", "carol", "dave"):
+        assert node.add_transaction(Transaction.create(name, "x", 0.5, fee=0.001, size=200))
+
+    assert len(node.mempool) == 3, "Mempool should stay at its cap"
+    assert cheap not in node.mempool, "Lowest fee-rate tx should be evicted"
+    assert node.get_balance("alice") == 1.0, "Evicted sender should be refunded"
+    assert cheap not in node.block_template.selected_transactions(), "Evicted tx should leave the template"
+
+    # A new tx below every fee rate in a full pool is rejected and refunded
+    node.credit("erin", 1.0)
+    assert not node.add_transaction(Transaction.create("erin", "x", 0.5, fee=0.000001, size=200))
+    assert node.get_balance("erin") == 1.0, "Rejected sender should keep their balance"
+    print("✓ Lowest fee-rate eviction refunds the sender")
+
+
+def test_expiry_and_byte_cap():
+    """Old transactions expire in arrival order and the byte cap is enforced"""
+    dropped = []
+    pool = Mempool(max_vbytes=1000, expiry_seconds=60,
+                   on_evict=lambda tx, reason: dropped.append((tx.txid, reason)))
+
+    old = Transaction.create("a", "b", 1.0, fee=0.001, size=300)
+    assert pool.add(old, now=0)
+    assert pool.add(Transaction.create("a", "b", 1.0, fee=0.002, size=300), now=30)
+    assert pool.add(Transaction.create("a", "b", 1.0, fee=0.003, size=300), now=61)
+
+    assert (old.txid, "expired") in dropped, "Oldest tx should expire after 60s"
+    assert len(pool) == 2 and pool.total_vbytes == 600
+
+    big = Transaction.create("a", "b", 1.0, fee=0.01, size=700)
+    assert pool.add(big, now=62)
+    assert pool.total_vbytes <= 1000, "Byte cap should be enforced"
+    assert big in pool and pool.evicted_count == 1, "Only the lowest fee rate should be evicted"
+    print("✓ Expiry and byte cap enforced")
+
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([__file__, "-q"]))
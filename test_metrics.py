@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Tests for the metrics registry, node instrumentation and sampling profiler
+"""
+
+import hashlib
+import sys
+import time
+
+import pytest
+
+from bitcoin_simulator import MainnetNode, Transaction
+from headers import headers_first_sync
+from metrics import REGISTRY, MetricsRegistry, SamplingProfiler
+from node_server import NodeServer
+
+
+def _busy_hashing(seconds):
+    deadline = time.perf_counter() + seconds
+    data = b"x"
+    while time.perf_counter() < deadline:
+        data = hashlib.sha256(data).digest()
+
+
+def test_registry_renders_prometheus_and_profiler_samples():
+    """Counters, gauges and histograms render in Prometheus text; the profiler finds hot code"""
+    registry = MetricsRegistry()
+    hits = registry.counter("hits_total", "Hits", ("route",))
+    hits.labels("a").inc()
+    hits.labels(route="a").inc(2)
+    registry.gauge("depth", "Depth").set(7)
+    latency = registry.histogram("latency_seconds", "Latency", buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 5.0):
+        latency.observe(value)
+    assert registry.counter("hits_total", "Hits", ("route",)) is hits, "Same name, same instrument"
+    with pytest.raises(ValueError):
+        registry.gauge("hits_total", "Hits")
+    with pytest.raises(ValueError):
+        hits.labels("a").inc(-1)
+
+    text = registry.render()
+    assert "# TYPE hits_total counter" in text and 'hits_total{route="a"} 3' in text
+    assert "depth 7" in text
+    assert 'latency_seconds_bucket{le="0.1"} 1' in text
+    assert 'latency_seconds_bucket{le="1"} 2' in text
+    assert 'latency_seconds_bucket{le="+Inf"} 3' in text and "latency_seconds_count 3" in text
+    assert latency.quantile(0.5) == 1.0
+
+    with SamplingProfiler(interval=0.002) as profiler:
+        _busy_hashing(0.3)
+    assert profiler.samples > 10
+    hottest = dict(profiler.top(5))
+    assert hottest.get("test_metrics.py:_busy_hashing", 0) > 0.5, profiler.report()
+    assert "_busy_hashing" in profiler.collapsed()
+    print("✓ Registry renders Prometheus text; profiler samples hot code")
+
+
+def test_nodes_record_block_production_metrics():
+    """Mining, balance updates, mempool depth and reorgs show up in the shared registry"""
+    peer = MainnetNode(verbose=False)
+    node = MainnetNode(verbose=False)
+    attempts = REGISTRY.get("sim_pow_hash_attempts_total").labels("mainnet")
+    reorgs = REGISTRY.get("sim_reorg_depth_blocks").labels("mainnet")
+    before_attempts, before_reorgs = attempts.value, reorgs.count
+
+    node.set_genesis(peer.chain[0])
+    node.credit("alice", 10.0)
+    for _ in range(4):
+        peer.generate_block()
+    for _ in range(2):
+        node.add_transaction(Transaction.create("alice", "bob", 0.5))
+        node.generate_block()
+    node.add_transaction(Transaction.create("alice", "bob", 0.5))
+
+    assert attempts.value >= before_attempts + 6, "Every solved block counts its hashes"
+    phases = node.metrics.time_breakdown()
+    assert phases["hashing"] > 0 and phases["assembly"] > 0 and phases["balances"] > 0
+
+    headers_first_sync(node, peer)
+    assert reorgs.count == before_reorgs + 1 and reorgs.sum >= 2, "The 2-block branch was rolled back"
+
+    text = NodeServer(node).dispatch("getmetrics", [])
+    assert 'sim_mempool_transactions{node="mainnet"} 3' in text, "Rolled-back txs wait in the mempool"
+    for name in ("sim_pow_seconds", "sim_block_assembly_seconds", "sim_balance_update_seconds"):
+        assert f'{name}_count{{node="mainnet"}}' in text
+    print("✓ Nodes record block production metrics")
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
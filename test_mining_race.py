@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Tests for the multi-process mining race
+"""
+
+import sys
+
+import pytest
+
+from bitcoin_simulator import MainnetNode
+from difficulty import zeros_to_bits
+from mining_race import MiningRace, race
+from node_config import MAINNET
+
+TWO_POOLS = MAINNET.replace(pool_hashrates={"Big": 75.0, "Small": 25.0}, propagation_delay=0)
+
+
+def test_pools_race_for_blocks_by_hashrate():
+    """Every pool hashes in its own process; the bigger pool does more of the work"""
+    stats = race(20, difficulty=3, window=0, config=TWO_POOLS)
+    assert stats["height"] == 20 and stats["rounds"] == 20
+    assert stats["forks"] == 0, "No propagation window, no ties"
+    big, small = stats["pools"]
+    assert big["wins"] + small["wins"] == 20
+    assert big["blocks_in_chain"] + small["blocks_in_chain"] == 20
+    assert big["hash_share"] > small["hash_share"] > 0, "CPU share follows hashrate_percentage"
+    assert big["configured_share"] == 0.75 and small["hashes_per_s"] > 0
+    print("✓ Pools race for blocks by hashrate")
+
+
+def test_ties_inside_the_window_fork_and_settle():
+    """Solutions on the same tip within the window fork the chain; the next block orphans one side"""
+    node = MainnetNode(config=TWO_POOLS)
+    node.current_bits = zeros_to_bits(1)
+    with MiningRace(node, window=0.05) as mining_race:
+        stats = mining_race.run(10)
+    assert stats["forks"] > 0, "Easy blocks and a wide window make ties"
+    assert node.orphaned_blocks == node.forks_resolved == stats["forks"], "Every fork is settled"
+    assert node.chain_height >= 10 and node.is_chain_valid()
+    assert sum(p.blocks_mined for p in node.mining_pools) == node.chain_height
+    print("✓ Ties inside the window fork and settle")
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
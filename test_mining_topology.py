@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Tests for the array-backed mining topology used by TrackedMainnetNode and quantum fleets
+"""
+
+import sys
+
+from bitcoin_simulator_tracked import DEFAULT_TOPOLOGY, TrackedMainnetNode
+from mining_topology import MiningTopology
+from quantum_miner import QuantumMiningNode
+
+
+def test_config_is_reproducible_and_compact():
+    """Seeded configs give identical devices and a few bytes per device"""
+    config = {"seed": 11, "generated_pools": {"count": 500, "devices": [40, 60]}}
+    a = MiningTopology.from_config(config)
+    b = MiningTopology.from_config(config)
+
+    assert a.device_count == b.device_count and 500 * 40 <= a.device_count <= 500 * 60
+    assert a.device_fields(a.groups[42], 7) == b.device_fields(b.groups[42], 7), "Seeded configs should match"
+    assert abs(sum(g.weight for g in a.groups) - 100.0) < 1e-6, "Generated hashrate should total 100%"
+
+    table = a.devices
+    bytes_per_device = sum(col.itemsize for col in (table.model, table.ip, table.serial, table.firmware))
+    assert bytes_per_device <= 12, "Device rows should stay array-backed"
+    print("✓ Topology configs are reproducible and compact")
+
+
+def test_tracked_node_uses_topology_devices():
+    """Pools expose O(1) random and round-robin access over topology rows"""
+    node = TrackedMainnetNode(topology=MiningTopology.from_config(dict(DEFAULT_TOPOLOGY, seed=5)))
+    pool = node.pools[0]
+
+    first = pool.get_next_device()
+    for _ in range(len(pool.devices) - 1):
+        pool.get_next_device()
+    assert pool.get_next_device() == first, "Round robin should wrap around"
+    assert pool.get_random_device().device_id.startswith(f"{pool.name}-ASIC-")
+
+    block = node.mine_block()
+    assert node.reward_audit_log[-1].block_hash == block.hash
+    print("✓ Tracked node mines with topology devices")
+
+
+def test_quantum_fleet_follows_device_hashrate():
+    """Changing a prototype's hashrate reweights its fleets for the next draws"""
+    fleet = {"seed": 2, "fleet": [{"prototype": "GOOGLE-WILLOW-001", "count": 1000},
+                                  {"prototype": "IONQ-ARIA-001", "count": 1000}]}
+    node = QuantumMiningNode("wallet", fleet=fleet)
+    node.set_device_hashrate("GOOGLE-WILLOW-001", 0.0)
+    assert node.policy.total_hashrate_ehs == node.fleet.groups[1].weight
+    picks = {node.policy.select().device_id.rsplit("-", 1)[0] for _ in range(200)}
+    assert picks == {"IONQ-ARIA-001"}, "A fleet at zero hashrate should never win"
+
+    node.set_device_hashrate("GOOGLE-WILLOW-001", 2.0)
+    assert node.fleet.groups[0].weight == 2000.0 and node.fleet.models[3][1] == 2.0
+    device = next(d for d in (node.policy.select() for _ in range(200)) if d.device_id.startswith("GOOGLE"))
+    assert device.hashrate_ehs == 2.0
+    print("✓ Quantum fleet follows device hashrate")
+
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Tests for the multi-node gossip network simulation
+"""
+
+import asyncio
+import sys
+
+from bitcoin_simulator import MainnetNode, MiningPool
+from network_simulator import NetworkPeer, simulate_network
+from node_config import MAINNET
+
+
+def _mine_on(node: MainnetNode, pool: MiningPool):
+    template = node.create_block_template(pool)
+    node.solve_block(template)
+    return template.block
+
+
+def test_longer_branch_triggers_reorg():
+    """A peer switches to a longer competing branch and unwinds its balances"""
+    config = MAINNET.replace(initial_difficulty=1)
+    a, b = MainnetNode(verbose=False, config=config), MainnetNode(verbose=False, config=config)
+    b.chain = [a.chain[0]]
+
+    async def scenario():
+        peer = NetworkPeer(0, a, network=None)
+        alice, bob = MiningPool("Alice", 50), MiningPool("Bob", 50)
+        assert peer.receive_block(_mine_on(a, alice))
+        for _ in range(2):
+            block = _mine_on(b, bob)
+            b.connect_block(block)
+            peer.receive_block(block)
+        return peer
+
+    peer = asyncio.run(scenario())
+    assert a.latest_block.hash == b.latest_block.hash, "Peer should follow the longer branch"
+    assert peer.reorgs == 1 and peer.max_reorg_depth == 1
+    assert a.get_balance("Alice") == 0 and a.get_balance("Bob") == 2 * a.get_current_block_reward()
+    print("✓ Longer branch triggers a reorg")
+
+
+def test_gossip_is_deduplicated():
+    """Block relay costs at most inv + getdata + block per edge direction"""
+    stats = simulate_network(duration=3.0, num_nodes=15, outbound=4, block_interval=0.5,
+                             tx_rate=0, latency=(0.005, 0.02), seed=3)
+    assert stats["blocks_mined"] > 0 and stats["best_height"] > 0
+    assert stats["messages"] <= 3 * 2 * stats["edges"] * stats["blocks_mined"], "Relay should be linear in edges"
+    print("✓ Gossip traffic is deduplicated")
+
+
+def test_compact_blocks_rebuild_from_mempool():
+    """Compact relay reconstructs blocks from mempools and saves bandwidth"""
+    stats = simulate_network(duration=3.0, num_nodes=10, outbound=3, block_interval=0.5,
+                             tx_rate=30, latency=(0.005, 0.02), seed=4)
+    assert stats["compact_received"] > 0, "Blocks should arrive as compact blocks"
+    assert stats["bytes_saved"] > 0, "Short ids should be cheaper than full transactions"
+    assert stats["stale_blocks"] >= 0 and stats["consensus"] > 0
+    print("✓ Compact blocks rebuild from mempools")
+
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Tests for per-instance node and validator configuration
+"""
+
+import json
+import sys
+
+import pytest
+
+from bitcoin_simulator import MainnetNode
+from bitcoin_simulator_tracked import TrackedMainnetNode
+from blockchain_validator import BlockchainValidator
+from node_config import MAINNET, QUANTUM, VALIDATOR, ConfigError, NodeConfig, ValidatorConfig, load_config
+from quantum_miner import QuantumMiningNode
+
+
+def test_config_layers_file_then_env_then_overrides(tmp_path):
+    """Preset < file section < SIM_* environment < keyword overrides, with type checks"""
+    path = tmp_path / "sim.json"
+    path.write_text(json.dumps({
+        "node": {"fork_probability": 0.3, "target_block_time": 5, "pool_hashrates": {"A": 60, "B": 40}},
+        "validator": {"pow_zeros": 2},
+    }))
+    environ = {"SIM_TARGET_BLOCK_TIME": "7", "SIM_VALIDATOR_CONFIRMATIONS_REQUIRED": "3"}
+
+    node = load_config(MAINNET, str(path), environ, max_mempool_txs="50")
+    assert node.fork_probability == 0.3 and node.pool_hashrates == {"A": 60.0, "B": 40.0}
+    assert node.target_block_time == 7.0, "Environment beats the file"
+    assert node.max_mempool_txs == 50, "Overrides beat everything and are coerced"
+    assert node.max_block_weight == MAINNET.max_block_weight, "Unset fields keep the preset"
+
+    validator = load_config(VALIDATOR, environ={"SIM_CONFIG": str(path),
+                                                "SIM_VALIDATOR_CONFIRMATIONS_REQUIRED": "3"})
+    assert validator == ValidatorConfig(pow_zeros=2, confirmations_required=3), "$SIM_CONFIG names the file"
+    assert load_config(QUANTUM, environ={}) == QUANTUM
+
+    with pytest.raises(ConfigError):
+        load_config(MAINNET, environ={}, max_block_wieght=1)
+    with pytest.raises(ConfigError):
+        load_config(MAINNET, environ={"SIM_MAX_MEMPOOL_TXS": "many"})
+    with pytest.raises(ConfigError):
+        MAINNET.replace(difficulty_adjustment_interval=2.5)
+    path.write_text(json.dumps({"nodes": {}}))
+    with pytest.raises(ConfigError):
+        load_config(MAINNET, str(path), {})
+    print("✓ Config layers file, environment and overrides")
+
+
+def test_differently_configured_nodes_share_a_process():
+    """Each node and validator reads its own config; nothing is shared through module state"""
+    small = NodeConfig(initial_difficulty=1, max_mempool_txs=2, propagation_delay=0,
+                       pool_hashrates={"Solo": 100.0})
+    mainnet = MainnetNode(verbose=False, config=small)
+    default = MainnetNode(verbose=False)
+    tracked = TrackedMainnetNode(config=MAINNET.replace(block_reward=50.0, max_mempool_txs=2))
+    quantum = QuantumMiningNode("quantum_rewards")
+    assert default.config is MAINNET and quantum.config is QUANTUM
+    assert mainnet.current_difficulty < default.current_difficulty
+    assert tracked.config.block_reward == 50.0 and default.get_current_block_reward() == 6.25
+    assert mainnet.mempool.max_count == 2 and tracked.mempool.max_count == 2
+    assert quantum.mempool.max_count == QUANTUM.max_mempool_txs
+
+    block = mainnet.mine_block()
+    assert block.hash.startswith("0") and mainnet.mining_pools[0].blocks_mined == 1
+    strict = BlockchainValidator(tip_height=block.index, config=VALIDATOR.replace(validation_delay=0))
+    loose = BlockchainValidator(tip_height=block.index,
+                                config=VALIDATOR.replace(pow_zeros=1, confirmations_required=1,
+                                                         validation_delay=0))
+    args = (block.index, "0" * 4 + block.hash[4:], "Solo", 6.25, 1, block.nonce, len(block.transactions))
+    assert loose.validate_block(*args).is_valid and strict.validate_block(*args).is_valid
+    args = (block.index, "0" + "f" * 63, "Solo", 6.25, 1, block.nonce, len(block.transactions))
+    loose_result, strict_result = loose.validate_block(*args), strict.validate_block(*args)
+    assert loose_result.is_valid and not strict_result.is_valid, "Only the strict validator wants 4 zeros"
+    assert loose_result.network_status.startswith("CONFIRMED")
+    assert strict_result.network_status.startswith("PENDING")
+    print("✓ Differently configured nodes share a process")
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Tests for the shared node core and its miner policies
+"""
+
+import contextlib
+import io
+import sys
+import time
+
+import pytest
+
+from bitcoin_simulator import MainnetNode
+from bitcoin_simulator_tracked import TrackedMainnetNode
+from difficulty import zeros_to_bits
+from node_config import MAINNET, QUANTUM
+from node_core import MinerPolicy, NodeCore, Transaction
+from quantum_miner import QuantumMiningNode
+
+FAST = MAINNET.replace(initial_difficulty=1, propagation_delay=0)
+
+
+class SoloPolicy(MinerPolicy):
+    """Every block goes to one named miner"""
+
+    def __init__(self, name):
+        self.name = name
+        self.mined = []
+
+    def select(self):
+        return self
+
+    def block_mined(self, block, template, miner, seconds):
+        self.mined.append(block.index)
+        return [f"Solo: {miner.name}"]
+
+
+def test_custom_policy_plugs_into_the_core():
+    """Any MinerPolicy drives the shared chain, ledger, mempool and proof of work"""
+    policy = SoloPolicy("solo")
+    node = NodeCore(policy, FAST, verbose=False)
+    node.credit("alice", 5.0)
+    tx = Transaction.create("alice", "bob", 1.0, fee=0.001)
+    assert node.add_transaction(tx) and node.get_balance("alice") == pytest.approx(3.999)
+
+    with contextlib.redirect_stdout(io.StringIO()) as out:
+        block = node.mine_block()
+    node.generate_block()
+    assert "[solo] Mining block 1" in out.getvalue() and "Solo: solo" in out.getvalue()
+    assert policy.mined == [1, 2], "Both mining paths report to the policy"
+    assert block.miner_address == "solo" and tx in block.transactions
+    assert node.get_balance("bob") == 1.0 and node.get_confirmations(tx.txid) == 2
+    assert node.get_balance("solo") == pytest.approx(2 * 6.25 + 0.001)
+    assert node.is_chain_valid() and all(b.meets_difficulty() for b in node.chain[1:])
+
+    node.disconnect_tip()
+    node.disconnect_tip()
+    assert tx in node.mempool and node.get_balance("bob") == 0, "Rolled-back txs wait again"
+    print("✓ Custom policy plugs into the core")
+
+
+def test_retarget_every_block_skips_the_first():
+    """With an adjustment interval of 1, block 1 has no interval to measure and later blocks retarget"""
+    node = NodeCore(SoloPolicy("solo"), FAST.replace(difficulty_adjustment_interval=1, max_difficulty=2))
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(4):
+            node.mine_block()
+    assert node.chain_height == 4 and node.is_chain_valid()
+    assert node.current_difficulty >= 1.0, "Retargets from block 2 on keep a valid target"
+    print("✓ Retarget every block skips the first")
+
+
+def test_all_three_nodes_share_the_core():
+    """Mainnet, tracked and quantum nodes mine through the same template, ledger and validation"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        nodes = [
+            MainnetNode(config=FAST),
+            TrackedMainnetNode(config=FAST.replace(block_reward=50.0)),
+            QuantumMiningNode("quantum_wallet", config=QUANTUM.replace(initial_difficulty=1)),
+        ]
+        for node in nodes:
+            assert isinstance(node, NodeCore)
+            node.credit("alice", 10.0)
+            tx = Transaction.create("alice", "bob", 2.0, fee=0.01)
+            assert node.add_transaction(tx)
+            block = node.mine_block()
+            assert tx in block.transactions and node.get_balance("bob") == 2.0
+            assert node.is_chain_valid() and node.get_block_by_hash(block.hash) is block
+
+    mainnet, tracked, quantum = nodes
+    assert sum(p.blocks_mined for p in mainnet.mining_pools) == 1
+    record = tracked.reward_audit_log[-1]
+    assert record.block_hash == tracked.latest_block.hash and record.reward_amount == 50.0
+    assert record.recipient_address == tracked.latest_block.miner_address
+    assert tracked.get_balance(record.recipient_address) == pytest.approx(50.01)
+    assert tracked.total_rewards_paid == pytest.approx(50.01)
+    assert quantum.latest_block.miner_address == "quantum_wallet"
+    assert quantum.get_balance("quantum_wallet") == pytest.approx(quantum.total_rewards_paid)
+    assert [n.NODE_TYPE for n in nodes] == ["mainnet", "tracked", "quantum"], "Metrics stay labelled per node"
+    print("✓ All three nodes share the core")
+
+
+def test_background_mining_serves_the_node_meanwhile():
+    """mine_async returns a handle at once; the node takes transactions while the block is solved"""
+    node = MainnetNode(config=FAST.replace(initial_difficulty=4))
+    node.credit("alice", 5.0)
+    job = node.mine_async()
+    assert node.add_transaction(Transaction.create("alice", "bob", 1.0)), "Accepted while mining"
+    assert node.get_balance("alice") == pytest.approx(3.9999)
+    block = job.result(timeout=60)
+    assert job.done() and node.latest_block is block and block.hash.startswith("0000")
+    assert sum(p.blocks_mined for p in node.mining_pools) == 1, "Policy hears about the block"
+
+    solo = NodeCore(SoloPolicy("solo"), FAST)
+    block = solo.mine_async(connect=False).result(timeout=60)
+    assert block.index == 1 and solo.chain_height == 0, "connect=False only hands the block back"
+    print("✓ Background mining serves the node meanwhile")
+
+
+def test_mining_job_restarts_on_new_tip_and_cancels():
+    """Another block on the tip makes the job drop its template; cancel() stops it for good"""
+    slow = FAST.replace(initial_difficulty=7, max_difficulty=7)
+    node, rival = NodeCore(SoloPolicy("us"), slow), NodeCore(SoloPolicy("them"), slow)
+    job = node.mine_async()
+
+    rival.current_bits = zeros_to_bits(1)
+    node.connect_block(rival.generate_block())
+    deadline = time.time() + 10
+    while job.restarts == 0 and time.time() < deadline:
+        time.sleep(0.01)
+    assert job.restarts == 1 and not job.done(), "Stale work restarted on the new tip"
+
+    assert job.cancel() and job.cancelled() and job.done()
+    job._thread.join(timeout=10)
+    assert not job._thread.is_alive() and node.chain_height == 1
+    assert node.latest_block.miner_address == "them"
+    print("✓ Mining job restarts on a new tip and cancels")
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
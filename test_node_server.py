@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Tests for the local JSON-RPC node server and its pooled client
+"""
+
+import asyncio
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from bitcoin_simulator import MainnetNode
+from bitcoin_transfer import TransferResult, batch_transfer, transfer_bitcoin
+from difficulty import zeros_to_bits
+from headers import HeaderError
+from node_server import INVALID_PARAMS, RPC_VERIFY_REJECTED, NodeClient, NodeServer, RPCError
+
+
+@pytest.fixture
+def server():
+    """NodeServer on an ephemeral port, running on a background event loop"""
+    loop = asyncio.new_event_loop()
+    node_server = NodeServer(MainnetNode(verbose=False), port=0)
+    loop.run_until_complete(node_server.start())
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    yield node_server
+    asyncio.run_coroutine_threadsafe(node_server.stop(), loop).result()
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join()
+    loop.close()
+
+
+def test_rpc_methods_against_live_state(server):
+    """Balances, transactions, blocks and chain info come from the daemon's node"""
+    with NodeClient(port=server.port) as client:
+        assert client.faucet("alice", 10.0) == 10.0
+        txid = client.sendtransaction("alice", "bob", 2.5, 0.001)
+        assert server.node.mempool.get(txid) is not None, "Transaction should reach the node mempool"
+        assert client.getbalance("alice") == pytest.approx(7.499)
+
+        info = client.getchaininfo()
+        assert info["blocks"] == 0 and info["mempool_txs"] == 1
+        genesis = client.getblock(0)
+        assert client.getblock(genesis["hash"]) == genesis and genesis["confirmations"] == 1
+
+        with pytest.raises(RPCError) as rejected:
+            client.sendtransaction("carol", "bob", 1.0)
+        assert rejected.value.code == RPC_VERIFY_REJECTED
+        with pytest.raises(RPCError) as missing:
+            client.getblock(5)
+        assert missing.value.code == INVALID_PARAMS
+    print("✓ RPC methods use live node state")
+
+
+def test_pooled_client_and_transfer_tool(server):
+    """Concurrent callers share a bounded pool; transfers reuse the running node"""
+    client = NodeClient(port=server.port, pool_size=3)
+    client.faucet("pool", 100.0)
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        txids = list(executor.map(lambda i: client.sendtransaction("pool", f"user_{i}", 1.0, 0.0), range(40)))
+    assert len(set(txids)) == 40 and len(server.node.mempool) == 40
+    assert client._idle.qsize() <= 3, "Pool should never open more than pool_size connections"
+
+    for _ in range(3):
+        server.node.generate_block()
+    sync = client.header_sync()
+    assert sync.chain.tip.hash == server.node.latest_block.hash, "Light client should see the node's tip"
+    assert sync.body(2).hash == server.node.chain[2].hash
+
+    txid = transfer_bitcoin("FoundryUSA", "MyWallet", 5.0, client=client)
+    assert server.node.mempool.get(txid).to_addr == "MyWallet"
+    client.close()
+    print("✓ Pooled client and transfer tool share the running node")
+
+
+def test_batch_transfers_use_rpc_batches(server):
+    """Batch payouts go out as JSON-RPC batches and wait in the daemon mempool"""
+    transfers = [TransferResult(i, "payer", f"miner_{i}", 0.5) for i in range(1, 1201)]
+    with NodeClient(port=server.port) as client:
+        served = server.requests_served
+        batch_transfer(transfers, client=client)
+    assert all(r.status == "pending" and r.txid for r in transfers)
+    assert len(server.node.mempool) == 1200 and server.node.get_balance("payer") >= 0
+    assert server.requests_served - served == 1200 + 2, "One call per transfer plus funding"
+    print("✓ Batch transfers use RPC batches")
+
+
+
+def test_light_client_rejects_too_easy_headers(server):
+    """header_sync checks bits against MAINNET retargeting unless told otherwise"""
+    server.node.current_bits = zeros_to_bits(1)  # A node serving a cheap chain
+    for _ in range(3):
+        server.node.generate_block()
+    with NodeClient(port=server.port) as client:
+        with pytest.raises(HeaderError, match="retargeting"):
+            client.header_sync()
+        assert transfer_bitcoin("FoundryUSA", "MyWallet", 1.0, client=client) is None, "No transfer to a bad chain"
+    print("✓ Light client rejects too-easy headers")
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
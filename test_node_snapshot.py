@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Tests for node snapshots: full round trip and incremental deltas across a reorg
+"""
+
+import sys
+
+from bitcoin_simulator import MainnetNode, Transaction
+from node_snapshot import NodeSnapshotter, load_snapshot, save_snapshot
+
+
+def _state(node):
+    return {
+        "chain": [b.hash for b in node.chain],
+        "wallets": dict(node.wallets),
+        "mempool": [(tx.txid, added_at) for tx, added_at in node.mempool.entries()],
+        "pools": [(p.name, p.blocks_mined, p.total_rewards) for p in node.mining_pools],
+        "bits": node.current_bits,
+        "fees": node.total_fees_collected,
+    }
+
+
+def _busy_node():
+    node = MainnetNode(verbose=False)
+    for name in ("alice", "bob", "carol"):
+        node.credit(name, 50.0)
+    for _ in range(5):
+        node.add_transaction(Transaction.create("alice", "bob", 1.0, fee=0.001))
+        node.add_transaction(Transaction.create("bob", "carol", 0.5, fee=0.002))
+        node.generate_block()
+    node.add_transaction(Transaction.create("carol", "alice", 2.0, fee=0.003))
+    return node
+
+
+def test_full_snapshot_round_trip(tmp_path):
+    """A restored node matches the original, indexes included"""
+    node = _busy_node()
+    path = str(tmp_path / "node.snap")
+    save_snapshot(node, path)
+
+    restored = load_snapshot(path)
+    assert _state(restored) == _state(node), "Restored state should match"
+    tip = node.chain[-1]
+    assert restored.get_block_by_hash(tip.hash).hash == tip.hash
+    assert restored.address_index.balance("bob") == node.address_index.balance("bob")
+    assert restored.get_transaction(next(node.mempool.entries())[0].txid) is not None
+
+    block = restored.generate_block()
+    assert block.previous_hash == tip.hash, "Restored node keeps mining on the same tip"
+    print("✓ Full snapshot round trip")
+
+
+def test_incremental_snapshots_survive_a_reorg(tmp_path):
+    """Deltas append only new data and rewind past disconnected blocks"""
+    node = _busy_node()
+    path = str(tmp_path / "node.snap")
+    snapshotter = NodeSnapshotter(node, path)
+    full_size = snapshotter.snapshot()
+
+    node.generate_block()
+    delta_size = snapshotter.snapshot()
+    assert delta_size < full_size, f"Delta ({delta_size}) should be smaller than full ({full_size})"
+
+    node.disconnect_tip()
+    node.disconnect_tip()
+    node.add_transaction(Transaction.create("alice", "carol", 3.0, fee=0.004))
+    node.generate_block()
+    snapshotter.snapshot()
+    assert snapshotter.records_written == 3
+    assert _state(load_snapshot(path)) == _state(node), "Deltas should replay to the current state"
+
+    snapshotter.compact()
+    assert snapshotter.records_written == 1
+    assert _state(load_snapshot(path)) == _state(node)
+    print("✓ Incremental snapshots survive a reorg")
+
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([__file__, "-q"]))
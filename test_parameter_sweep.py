@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Tests for the parameter sweep engine and per-node configuration
+"""
+
+import csv
+import sys
+
+import pytest
+
+from bitcoin_simulator import MainnetNode
+from node_config import MAINNET, NodeConfig
+from parameter_sweep import aggregate, expand_grid, parse_grid_arg, run_one, run_sweep, write_csv
+
+
+def _strip_timing(result):
+    return {k: v for k, v in result.items() if k != "wall_seconds"}
+
+
+def test_config_is_per_node_and_runs_are_reproducible():
+    """NodeConfig drives one node without touching module globals; a seed fixes the run"""
+    config = NodeConfig(difficulty_adjustment_interval=3, pool_hashrates={"Solo": 100.0},
+                        block_reward=50.0, simulated_hashrate=1000.0, propagation_delay=0)
+    node = MainnetNode(verbose=False, config=config)
+    default = MainnetNode(verbose=False)
+    assert [p.name for p in node.mining_pools] == ["Solo"] and len(default.mining_pools) == 6
+    assert node.get_current_block_reward() == 50.0 and default.get_current_block_reward() == 6.25
+    assert MAINNET.difficulty_adjustment_interval == 10 and default.config is MAINNET
+    start = node.now()
+    node.mine_block()
+    assert node.now() > start and node.chain[1].timestamp == start, "Virtual clock, no real sleep"
+    assert not node.simulate_fork(), "A single pool cannot fork"
+
+    assert parse_grid_arg("fork_probability=0,0.25") == {"fork_probability": [0, 0.25]}
+    with pytest.raises(ValueError):
+        parse_grid_arg("not_a_field=1")
+    runs = expand_grid({"fork_probability": [0, 0.3], "target_block_time": [5, 10, 20]}, seeds=2, blocks=12)
+    assert len(runs) == 12 and runs[0]["params"] == {"fork_probability": 0, "target_block_time": 5}
+
+    spec = {"params": {"fork_probability": 0.3}, "seed": 7, "blocks": 12}
+    assert _strip_timing(run_one(spec)) == _strip_timing(run_one(spec))
+    print("✓ Config is per node and runs are reproducible")
+
+
+def test_sweep_runs_in_parallel_and_aggregates(tmp_path):
+    """A process-pool sweep matches a serial one and folds seeds into one row per config"""
+    runs = expand_grid({"difficulty_adjustment_interval": [2, 5], "fork_probability": [0, 0.5]},
+                       seeds=2, blocks=12)
+    parallel = run_sweep(runs, workers=2)
+    serial = run_sweep(runs, workers=1)
+    assert [_strip_timing(r) for r in parallel] == [_strip_timing(r) for r in serial]
+
+    rows = aggregate(parallel)
+    assert len(rows) == 4 and all(row["seeds"] == 2 for row in rows)
+    no_forks = [row for row in rows if row["fork_probability"] == 0]
+    assert all(row["forks"] == 0 and row["orphan_rate"] == 0 for row in no_forks)
+    assert all(row["height"] >= 12 for row in rows)
+
+    path = tmp_path / "sweep.csv"
+    write_csv(str(path), rows)
+    with open(path) as f:
+        assert len(list(csv.DictReader(f))) == 4
+    print("✓ Sweep runs in parallel and aggregates")
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Tests for rolling chain statistics and the live dashboard
+"""
+
+import io
+import sys
+
+import pytest
+
+from bitcoin_simulator import MainnetNode, Transaction
+from dashboard import Dashboard, render
+from headers import headers_first_sync
+from rolling_stats import ChainStats, RollingWindow
+
+
+def test_rolling_stats_track_the_chain_incrementally():
+    """Windowed figures match a full recomputation, and validity follows connect/disconnect"""
+    window = RollingWindow(3)
+    for value in (1, 2, 3, 4):
+        window.add(value)
+    assert window.total == 9 and window.mean() == 3, "Oldest value evicted"
+    assert window.pop() == 4 and window.total == 5
+
+    node = MainnetNode(verbose=False)
+    node.stats = ChainStats(window=5)
+    node.credit("alice", 50.0)
+    for i in range(8):
+        node.add_transaction(Transaction.create("alice", "bob", 1.0, fee=0.0001 * (i + 1)))
+        node.generate_block()
+    recent = node.chain[-6:]
+    intervals = [b.timestamp - a.timestamp for a, b in zip(recent, recent[1:])]
+    txs = [tx for b in recent[1:] for tx in b.transactions[1:]]
+    assert node.stats.avg_block_interval() == pytest.approx(sum(intervals) / 5)
+    assert node.stats.fee_rate() == pytest.approx(sum(t.fee for t in txs) * 1e8 / sum(t.size for t in txs))
+    assert node.stats.network_hashrate() > 0 and node.stats.chain_valid
+    pool = node.latest_block.miner_address
+    assert node.stats.pool_hashrate(pool) > 0, "Observed from the pool's own attempts"
+
+    template = node.create_block_template(node.select_mining_pool())
+    node.solve_block(template)
+    template.block.nonce += 1  # Hash no longer matches the header
+    node.connect_block(template.block)
+    assert not node.status()["chain_valid"] and not node.is_chain_valid()
+    node.disconnect_tip()
+    assert node.status()["chain_valid"] and node.is_chain_valid()
+
+    rebuilt = ChainStats.from_chain(node.chain, window=5)
+    assert rebuilt.avg_block_interval() == pytest.approx(sum(intervals) / 5), "Replays the last window"
+    print("✓ Rolling stats track the chain incrementally")
+
+
+def test_status_is_cheap_and_dashboard_renders(monkeypatch):
+    """status() never rescans the chain; reorgs show in the fork rate and on the dashboard"""
+    peer = MainnetNode(verbose=False)
+    node = MainnetNode(verbose=False)
+    node.set_genesis(peer.chain[0])
+    for _ in range(4):
+        peer.generate_block()
+    node.generate_block()
+    headers_first_sync(node, peer)
+
+    monkeypatch.setattr(MainnetNode, "is_chain_valid", lambda self: pytest.fail("status rescanned the chain"))
+    status = node.status()
+    assert status["height"] == 4 and status["chain_valid"]
+    assert status["fork_rate"] == pytest.approx(1 / 4), "One reorg in four blocks"
+    assert len(status["pools"]) == len(node.mining_pools)
+    node.print_network_status()
+
+    frame = render(status)
+    assert "height 4" in frame and "25.0% of recent blocks" in frame
+    assert all(pool.name in frame for pool in node.mining_pools)
+    out = io.StringIO()
+    dashboard = Dashboard(node, stream=out)
+    dashboard.draw()
+    assert dashboard.frames == 1 and "LIVE MAINNET DASHBOARD" in out.getvalue()
+    print("✓ Status is cheap and the dashboard renders")
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
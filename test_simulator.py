@@ -4,7 +4,6 @@ Quick test of the Bitcoin Mainnet Simulator - runs 10 blocks then exits
 """
 
 import sys
-sys.path.insert(0, '/home/user/node')
 from bitcoin_simulator import MainnetNode
 
 def test_mainnet_simulation():
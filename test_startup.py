@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Tests for fast startup: lazy genesis and deferred imports of the entry points
+"""
+
+import contextlib
+import io
+import os
+import subprocess
+import sys
+
+import pytest
+
+from bitcoin_simulator import MainnetNode
+from bitcoin_simulator_tracked import TrackedMainnetNode
+from quantum_miner import QuantumMiningNode
+
+DEFERRED_MODULES = ["asyncio", "multiprocessing", "concurrent.futures.process", "node_server"]
+
+
+def test_nodes_start_silent_and_create_genesis_on_first_use():
+    """Constructing a node prints nothing and builds no chain until the chain is used"""
+    with contextlib.redirect_stdout(io.StringIO()) as out:
+        nodes = [MainnetNode(), TrackedMainnetNode(), QuantumMiningNode("wallet")]
+        node = nodes[0]
+        assert all(n._chain is None for n in nodes), "No genesis block yet"
+        node.credit("alice", 1.0)
+        assert node.get_balance("alice") == 1.0 and node._chain is None, "The ledger needs no chain"
+    assert out.getvalue() == "", "Quiet by default"
+
+    genesis_hash = node.latest_block.hash
+    assert node.chain_height == 0 and node.get_block_by_hash(genesis_hash) is node.chain[0]
+
+    with contextlib.redirect_stdout(io.StringIO()) as out:
+        loud = MainnetNode(verbose=True)
+        assert loud._chain is not None, "Interactive nodes show their genesis banner up front"
+        loud.latest_block
+    assert out.getvalue().count("BITCOIN MAINNET SIMULATION INITIALIZED") == 1
+    print("✓ Nodes start silent and create genesis on first use")
+
+
+def test_entry_points_defer_heavy_imports():
+    """Importing the tools does not pull in asyncio, multiprocessing or the RPC server"""
+    code = ("import sys, bitcoin_simulator, bitcoin_transfer, blockchain_validator, "
+            "bitcoin_simulator_tracked, quantum_miner; "
+            f"print(','.join(m for m in {DEFERRED_MODULES!r} if m in sys.modules))")
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True,
+                            cwd=os.path.dirname(os.path.abspath(__file__)))
+    assert result.stdout.strip() == "", f"Imported at startup: {result.stdout.strip()}"
+
+    from hash_backend import ParallelBackend
+    backend = ParallelBackend(workers=2)
+    assert backend._pool is None, "Worker processes start with the first large batch"
+    print("✓ Entry points defer heavy imports")
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""
+Tests for the alias-method weighted sampler used for pool/device selection
+"""
+
+import random
+import sys
+
+from weighted_sampler import WeightedSampler
+
+
+def test_draw_frequencies_follow_weights():
+    """Empirical draw frequencies match the configured hashrate shares"""
+    weights = [28.0, 18.0, 15.0, 12.0, 10.0, 17.0]
+    sampler = WeightedSampler(list(range(len(weights))), weights)
+    rng = random.Random(42)
+
+    draws = sampler.draw_many(200_000, rng)
+    for i, w in enumerate(weights):
+        share = draws.count(i) / len(draws)
+        assert abs(share - w / 100) < 0.005, f"Item {i} drawn {share:.3f}, expected {w / 100:.3f}"
+    print("✓ Draw frequencies follow weights")
+
+
+def test_rebuild_applies_new_weights():
+    """Rebuilding the table moves all probability to the reweighted item"""
+    sampler = WeightedSampler(["a", "b", "c"], [1.0, 1.0, 1.0])
+    sampler.rebuild([0.0, 5.0, 0.0])
+    rng = random.Random(7)
+    assert set(sampler.draw_many(1000, rng)) == {"b"}, "Zero-weight items should never be drawn"
+    assert sampler.total_weight == 5.0
+    print("✓ Rebuild applies new weights")
+
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+WEIGHTED SAMPLER (ALIAS METHOD)
+===============================
+
+O(1) weighted selection of mining pools and devices:
+- Vose's alias method, built once in O(n) whenever the weights change
+- One uniform draw per sample (column from the integer part, coin from the rest)
+- Batch draws for large-topology runs
+
+NO REAL BITCOIN. NO REAL NETWORK. PURELY EDUCATIONAL.
+"""
+
+import random
+from typing import Generic, List, Sequence, TypeVar
+
+T = TypeVar("T")
+
+
+class WeightedSampler(Generic[T]):
+    """Draws items with probability proportional to their weight"""
+
+    def __init__(self, items: Sequence[T], weights: Sequence[float]):
+        self.items: List[T] = list(items)
+        self._prob: List[float] = []
+        self._alias: List[int] = []
+        self.total_weight = 0.0
+        self.rebuild(weights)
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def rebuild(self, weights: Sequence[float]):
+        """Rebuild the alias table (call only when weights change)"""
+        n = len(self.items)
+        if n == 0 or len(weights) != n:
+            raise ValueError("Sampler needs one weight per item and at least one item")
+        total = float(sum(weights))
+        if total <= 0 or any(w < 0 for w in weights):
+            raise ValueError("Sampler weights must be non-negative with a positive total")
+
+        scaled = [w * n / total for w in weights]
+        prob = [0.0] * n
+        alias = list(range(n))
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+
+        while small and large:
+            s = small.pop()
+            l = large.pop()
+            prob[s] = scaled[s]
+            alias[s] = l
+            scaled[l] -= 1.0 - scaled[s]
+            (small if scaled[l] < 1.0 else large).append(l)
+
+        # Leftovers are 1.0 up to float rounding
+        for i in large + small:
+            prob[i] = 1.0
+
+        self._prob = prob
+        self._alias = alias
+        self.total_weight = total
+
+    def draw_index(self, rng: random.Random = random) -> int:
+        """Index of one weighted draw in O(1)"""
+        u = rng.random() * len(self._prob)
+        column = int(u)
+        return column if u - column < self._prob[column] else self._alias[column]
+
+    def draw(self, rng: random.Random = random) -> T:
+        """One weighted draw in O(1)"""
+        return self.items[self.draw_index(rng)]
+
+    def draw_many(self, k: int, rng: random.Random = random) -> List[T]:
+        """k independent weighted draws"""
+        n = len(self._prob)
+        prob, alias, items = self._prob, self._alias, self.items
+        uniform = rng.random
+        out = []
+        for _ in range(k):
+            u = uniform() * n
+            column = int(u)
+            out.append(items[column] if u - column < prob[column] else items[alias[column]])
+        return out